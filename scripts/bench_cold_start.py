@@ -0,0 +1,229 @@
+# Benchmark de cold start: interpretador, imports e primeiro render de cada página
+
+import argparse
+import json
+import os
+import platform
+import resource
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+
+PAGES = ["Brasil", "Análises Avançadas", "Comparação Mundial"]
+
+
+def _python(args, **kwargs):
+    """Roda um interpretador novo na raiz do projeto."""
+    return subprocess.run(
+        [sys.executable, *args],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        env={**os.environ, "PYTHONPATH": ROOT},
+        **kwargs,
+    )
+
+
+def _last_json(output):
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def _peak_rss_kb():
+    """Pico de memória residente do processo atual, em KB (ru_maxrss é em bytes no macOS)."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+
+def measure_interpreter(repeat):
+    """Tempo de parede de `python -c pass`."""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        _python(["-c", "pass"])
+        samples.append(time.perf_counter() - start)
+    return {"median_s": statistics.median(samples), "samples_s": samples}
+
+
+IMPORT_PROBE = """
+import json, resource, sys, time
+start = time.perf_counter()
+import {module}
+print(json.dumps({{"seconds": time.perf_counter() - start,
+                   "peak_rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss}}))
+"""
+
+
+def measure_import(module, repeat):
+    """Tempo de `import module` em interpretadores novos, com o pico de RSS."""
+    runs = []
+    for _ in range(repeat):
+        result = _python(["-c", IMPORT_PROBE.format(module=module)])
+        if result.returncode != 0:
+            raise RuntimeError(result.stderr.strip().splitlines()[-1])
+        runs.append(_last_json(result.stdout))
+    return {
+        "module": module,
+        "median_s": statistics.median(run["seconds"] for run in runs),
+        "peak_rss_kb": max(run["peak_rss_kb"] for run in runs),
+    }
+
+
+def import_profile(module, top):
+    """Custo de import por módulo, como em `python -X importtime` (microssegundos)."""
+    result = _python(["-X", "importtime", "-c", f"import {module}"])
+    modules = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        modules.append({
+            "module": name.strip(),
+            "depth": (len(name) - len(name.lstrip()) - 1) // 2,
+            "self_us": int(self_us),
+            "cumulative_us": int(cumulative_us),
+        })
+    modules.sort(key=lambda item: item["cumulative_us"], reverse=True)
+    return {"module": module, "total_modules": len(modules), "top": modules[:top]}
+
+
+def _stub_data_layer():
+    """Substitui as chamadas de rede do cliente por dados sintéticos determinísticos."""
+    from unittest.mock import patch
+
+    import pandas as pd
+
+    from src.data.synthetic import generate_countries, generate_states
+
+    series = generate_states(days=120, start="2021-11-28")
+    latest = series[series["is_last"]].reset_index(drop=True)
+    world = pd.DataFrame(generate_countries())
+    top = world[world["country"] != "Brazil"]
+
+    client = "src.data.api_client.COVID19APIClient"
+    return [
+        patch(f"{client}.get_brasil_data", lambda self: latest.copy()),
+        patch(f"{client}.get_brasil_historical_data", lambda self, limit=None: series.copy()),
+        patch(f"{client}.get_brasil_time_series", lambda self, state=None, days=30, **kw: series.copy()),
+        patch(f"{client}.get_world_top_countries", lambda self, limit=10: top.head(limit)),
+        patch(f"{client}.get_world_countries_data",
+              lambda self, countries: world[world["country"].isin(list(countries))].reset_index(drop=True)),
+    ]
+
+
+def render_page(page):
+    """(Processo filho) Primeiro render do app e da página pedida com a camada de dados simulada."""
+    from contextlib import ExitStack
+
+    from streamlit.testing.v1 import AppTest
+
+    with ExitStack() as stack:
+        for stub in _stub_data_layer():
+            stack.enter_context(stub)
+
+        start = time.perf_counter()
+        app = AppTest.from_file(os.path.join(ROOT, "streamlit_app.py"), default_timeout=120)
+        app.run()
+        first_run = time.perf_counter() - start
+
+        page_render = first_run
+        if page != PAGES[0]:
+            start = time.perf_counter()
+            app.sidebar.selectbox[0].select(page).run()
+            page_render = time.perf_counter() - start
+
+    print(json.dumps({
+        "page": page,
+        "first_run_s": first_run,
+        "page_render_s": page_render,
+        "charts": len(app.get("plotly_chart")),
+        "errors": [str(item.value) for item in list(app.exception) + list(app.error)],
+        "peak_rss_kb": _peak_rss_kb(),
+    }))
+
+
+def measure_pages(repeat):
+    """Primeiro render de cada página, cada execução em um interpretador novo."""
+    results = []
+    for page in PAGES:
+        runs = []
+        for _ in range(repeat):
+            result = _python([os.path.abspath(__file__), "--render-page", page])
+            if result.returncode != 0:
+                raise RuntimeError(result.stderr.strip().splitlines()[-1])
+            runs.append(_last_json(result.stdout))
+        results.append({
+            "page": page,
+            "first_run_s": statistics.median(run["first_run_s"] for run in runs),
+            "page_render_s": statistics.median(run["page_render_s"] for run in runs),
+            "charts": runs[-1]["charts"],
+            "errors": runs[-1]["errors"],
+            "peak_rss_kb": max(run["peak_rss_kb"] for run in runs),
+        })
+    return results
+
+
+def _git_commit():
+    result = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True)
+    return result.stdout.strip() or None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de cold start do Dashboard COVID-19")
+    parser.add_argument("--repeat", type=int, default=3, help="execuções por medida (mediana)")
+    parser.add_argument("--top", type=int, default=25, help="módulos listados no perfil de import")
+    parser.add_argument("--output", default="bench_cold_start.json", help="arquivo JSON de saída ('-' para stdout)")
+    parser.add_argument("--render-page", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.render_page:
+        render_page(args.render_page)
+        return
+
+    report = {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "commit": _git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "repeat": args.repeat,
+        },
+        "interpreter": measure_interpreter(args.repeat),
+        "imports": [measure_import(module, args.repeat) for module in ("src.data.api_client", "streamlit_app")],
+        "import_profile": import_profile("streamlit_app", args.top),
+        "pages": measure_pages(args.repeat),
+    }
+
+    if args.output == "-":
+        print(json.dumps(report, indent=2, ensure_ascii=False))
+        return
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+
+    print("=" * 72)
+    print(f"🧊 COLD START (mediana de {args.repeat} execuções) — {report['meta']['commit']}")
+    print("=" * 72)
+    print(f"{'Interpretador (python -c pass)':<40}{report['interpreter']['median_s'] * 1000:>10,.0f} ms")
+    for item in report["imports"]:
+        print(f"{'import ' + item['module']:<40}{item['median_s'] * 1000:>10,.0f} ms"
+              f"{item['peak_rss_kb'] / 1024:>10,.0f} MB")
+    print("-" * 72)
+    print(f"{'Página':<24}{'1º run (ms)':>14}{'Render (ms)':>14}{'Gráficos':>10}{'RSS (MB)':>10}")
+    for item in report["pages"]:
+        print(f"{item['page']:<24}{item['first_run_s'] * 1000:>14,.0f}{item['page_render_s'] * 1000:>14,.0f}"
+              f"{item['charts']:>10}{item['peak_rss_kb'] / 1024:>10,.0f}")
+        for error in item["errors"]:
+            print(f"   ⚠️ {error[:100]}")
+    print("-" * 72)
+    print("Módulos mais caros (cumulativo):")
+    for item in report["import_profile"]["top"][:10]:
+        print(f"   {item['cumulative_us'] / 1000:>8,.1f} ms  {item['module']}")
+    print(f"\n📄 Resultado completo em {args.output}")
+
+
+if __name__ == "__main__":
+    main()
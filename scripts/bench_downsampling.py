@@ -0,0 +1,80 @@
+# Benchmark da redução de pontos (LTTB) nos gráficos de séries temporais
+
+import os
+import sys
+import time
+
+# Adicionar o diretório pai ao path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go
+
+from src.utils.constants import ESTADOS_BRASIL
+from src.utils.downsampling import downsample_frame, downsample_xy, points_for_width
+
+
+def serie_estados(dias=1100, estados=ESTADOS_BRASIL, seed=42):
+    """Histórico diário sintético (a partir de 2020) para os estados informados."""
+    rng = np.random.default_rng(seed)
+    datas = pd.date_range("2020-02-25", periods=dias)
+    t = np.arange(dias)
+    frames = []
+    for i, uf in enumerate(estados):
+        ondas = 1000 * (1 + np.sin(t / 60 + i)) + 3000 * np.exp(-((t - 700 - i) ** 2) / 200)
+        frames.append(pd.DataFrame({
+            "state": uf,
+            "date": datas,
+            "new_confirmed": rng.poisson(ondas),
+        }))
+    return pd.concat(frames, ignore_index=True)
+
+
+def medir(build):
+    """Constrói a figura e serializa para JSON (o que vai para o navegador)."""
+    inicio = time.perf_counter()
+    fig = build()
+    payload = fig.to_json()
+    segundos = time.perf_counter() - inicio
+    pontos = sum(len(trace.x) for trace in fig.data)
+    return pontos, len(payload.encode("utf-8")), segundos
+
+
+def main():
+    n_out = points_for_width() or 500
+    df = serie_estados()
+    longa = serie_estados(dias=30000, estados=["SP"])  # Uma única série com 30 mil pontos
+    x_longa, y_longa = longa["date"].to_numpy(), longa["new_confirmed"].to_numpy()
+
+    casos = [
+        (
+            "px.line 27 estados × 1100 dias",
+            lambda: px.line(df, x="date", y="new_confirmed", color="state"),
+            lambda: px.line(downsample_frame(df, "date", "new_confirmed", n_out=n_out, group_col="state"),
+                            x="date", y="new_confirmed", color="state"),
+        ),
+        (
+            "go.Scatter 30 mil pontos",
+            lambda: go.Figure(go.Scatter(x=x_longa, y=y_longa)),
+            lambda: go.Figure(go.Scatter(dict(zip(("x", "y"), downsample_xy(x_longa, y_longa, n_out))))),
+        ),
+    ]
+
+    print("=" * 86)
+    print(f"📉 BENCHMARK LTTB (limite de {n_out} pontos por trace)")
+    print("=" * 86)
+    print(f"{'Gráfico':<34}{'Pontos':>16}{'Payload (KB)':>20}{'Tempo (ms)':>16}")
+    for nome, original, reduzido in casos:
+        antes, depois = medir(original), medir(reduzido)
+        print(
+            f"{nome:<34}"
+            f"{f'{antes[0]:,} → {depois[0]:,}':>16}"
+            f"{f'{antes[1] / 1024:,.0f} → {depois[1] / 1024:,.0f}':>20}"
+            f"{f'{antes[2] * 1000:,.0f} → {depois[2] * 1000:,.0f}':>16}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,270 @@
+# Teste de carga: sessões simultâneas do streamlit_app.py contra o servidor local de dados
+
+import argparse
+import json
+import os
+import random
+import resource
+import socket
+import subprocess
+import sys
+import threading
+import time
+import urllib.request
+from datetime import datetime, timezone
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+
+PAGES = ["Brasil", "Análises Avançadas", "Comparação Mundial"]
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_stub(args):
+    """Sobe o servidor local em outro processo (CPU e memória dele ficam fora da medida)."""
+    port = _free_port()
+    process = subprocess.Popen(
+        [sys.executable, os.path.join(ROOT, "scripts", "run_stub_server.py"), "--port", str(port),
+         "--days", str(args.days), "--latency", str(args.latency), "--jitter", str(args.jitter),
+         "--rate-limit-rate", str(args.rate_limit_rate), "--timeout-rate", str(args.timeout_rate)],
+        cwd=ROOT,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    base = f"http://127.0.0.1:{port}"
+    deadline = time.monotonic() + 60
+    while True:
+        try:
+            urllib.request.urlopen(f"{base}/v3/covid-19/countries/Brazil", timeout=1).read()
+            break
+        except OSError:
+            if process.poll() is not None or time.monotonic() > deadline:
+                process.kill()
+                raise RuntimeError("Servidor local não respondeu")
+            time.sleep(0.2)
+    return process, {
+        "COVID19_BRASIL_IO_API_URL": f"{base}/v1/dataset/covid19",
+        "COVID19_WORLD_API_URL": f"{base}/v3/covid-19",
+    }
+
+
+def _rss_kb():
+    """Memória residente atual do processo, em KB (/proc no Linux; pico nos demais sistemas)."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") // 1024
+    except OSError:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak // 1024 if sys.platform == "darwin" else peak
+
+
+def _percentile(values, pct):
+    """Percentil por interpolação linear (None sem amostras)."""
+    if not values:
+        return None
+    values = sorted(values)
+    pos = (len(values) - 1) * pct / 100
+    low = int(pos)
+    high = min(low + 1, len(values) - 1)
+    return values[low] + (values[high] - values[low]) * (pos - low)
+
+
+def _ms(seconds, width=11):
+    """Segundos formatados em milissegundos para a tabela ('-' sem amostras)."""
+    return f"{'-':>{width}}" if seconds is None else f"{seconds * 1000:>{width},.0f}"
+
+
+def share_test_runtime():
+    """Deixa várias sessões do AppTest rodarem ao mesmo tempo no mesmo processo.
+
+    O AppTest troca o singleton `Runtime` a cada `run()` e o zera no fim, o
+    que derruba as sessões que ainda estão rodando em outras threads. Com o
+    singleton vazio, todas passam a ver um runtime simulado compartilhado —
+    como em `streamlit run`, um runtime (e um cache) por processo.
+    """
+    from unittest.mock import MagicMock
+
+    from streamlit.runtime import Runtime
+    from streamlit.runtime.caching.storage.dummy_cache_storage import MemoryCacheStorageManager
+    from streamlit.runtime.media_file_manager import MediaFileManager
+    from streamlit.runtime.memory_media_file_storage import MemoryMediaFileStorage
+
+    shared = MagicMock(spec=Runtime)
+    shared.media_file_mgr = MediaFileManager(MemoryMediaFileStorage("/mock/media"))
+    shared.cache_storage_manager = MemoryCacheStorageManager()
+    Runtime.instance = classmethod(lambda cls: cls._instance or shared)
+    Runtime.exists = classmethod(lambda cls: True)
+
+
+class Session:
+    """Usuário simulado: troca de página e mexe nos filtros da página atual."""
+
+    def __init__(self, seed, timeout):
+        from streamlit.testing.v1 import AppTest
+
+        self.random = random.Random(seed)
+        self.app = AppTest.from_file(os.path.join(ROOT, "streamlit_app.py"), default_timeout=timeout)
+        self.page = PAGES[0]
+
+    @staticmethod
+    def _labels_are_values(widget):
+        """O AppTest só expõe os rótulos; widgets com `format_func` próprio não dá para escolher por eles."""
+        try:
+            return all(widget.format_func(option) == option for option in widget.options)
+        except Exception:
+            return False
+
+    def _filter_actions(self):
+        """Interações possíveis com os widgets da página atual."""
+        app = self.app
+        actions = []
+        for radio in app.main.radio:
+            if self._labels_are_values(radio):
+                actions.append(lambda radio=radio: radio.set_value(self.random.choice(radio.options)))
+        for box in app.main.selectbox:
+            if self._labels_are_values(box):
+                actions.append(lambda box=box: box.select(self.random.choice(box.options)))
+        for multi in app.main.multiselect:
+            if self._labels_are_values(multi) and multi.options:
+                def pick(multi=multi):
+                    size = self.random.randint(1, min(4, len(multi.options)))
+                    multi.set_value(self.random.sample(list(multi.options), size))
+                actions.append(pick)
+        return actions
+
+    def step(self):
+        """Executa uma interação e retorna (ação, segundos do rerun, erros)."""
+        actions = self._filter_actions()
+        if not actions or self.random.random() < 0.4:
+            self.page = self.random.choice([page for page in PAGES if page != self.page])
+            self.app.sidebar.selectbox[0].select(self.page)
+            action = f"página:{self.page}"
+        else:
+            self.random.choice(actions)()
+            action = f"filtro:{self.page}"
+
+        start = time.perf_counter()
+        self.app.run()
+        return action, time.perf_counter() - start, len(self.app.exception)
+
+    def first_run(self):
+        start = time.perf_counter()
+        self.app.run()
+        return "início", time.perf_counter() - start, len(self.app.exception)
+
+
+def run_level(concurrency, duration, seed, timeout):
+    """Roda `concurrency` sessões por `duration` segundos e agrega as medidas."""
+    samples, lock = [], threading.Lock()
+    stop_at = time.monotonic() + duration
+
+    def user(index):
+        session = None
+        while time.monotonic() < stop_at:
+            start = time.perf_counter()
+            try:
+                if session is None:
+                    session = Session(seed * 1000 + index, timeout)
+                    result = session.first_run()
+                else:
+                    result = session.step()
+            except Exception as e:  # Rerun travado ou widget sumiu: conta como erro e recomeça a sessão
+                # O tempo até a falha (ex.: o timeout inteiro) entra nos percentis
+                result, session = (f"falha:{type(e).__name__}", time.perf_counter() - start, 1), None
+            with lock:
+                samples.append(result)
+
+    cpu_start, wall_start = time.process_time(), time.perf_counter()
+    rss_max = _rss_kb()
+    threads = [threading.Thread(target=user, args=(i,), name=f"load-user-{i}") for i in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    while any(thread.is_alive() for thread in threads):
+        rss_max = max(rss_max, _rss_kb())
+        time.sleep(0.2)
+    wall = time.perf_counter() - wall_start
+    cpu = time.process_time() - cpu_start
+
+    latencies = [seconds for _, seconds, _ in samples if seconds is not None]
+    return {
+        "concurrency": concurrency,
+        "reruns": len(latencies),
+        "errors": sum(errors for _, _, errors in samples),
+        "failed_reruns": sum(1 for action, _, _ in samples if action.startswith("falha:")),
+        "wall_s": wall,
+        "throughput_rps": len(latencies) / wall,
+        "p50_s": _percentile(latencies, 50),
+        "p95_s": _percentile(latencies, 95),
+        "p99_s": _percentile(latencies, 99),
+        "max_s": max(latencies) if latencies else None,
+        "cpu_percent": cpu / wall * 100,
+        "rss_mb": rss_max / 1024,
+        "by_page": {
+            page: _percentile([s for action, s, _ in samples if s is not None and action.endswith(page)], 50)
+            for page in PAGES
+        },
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Teste de carga com sessões simultâneas do dashboard")
+    parser.add_argument("--levels", type=int, nargs="+", default=[1, 2, 4, 8, 16], help="sessões simultâneas")
+    parser.add_argument("--duration", type=float, default=20, help="segundos por nível")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--timeout", type=float, default=120, help="limite de cada rerun (segundos)")
+    parser.add_argument("--days", type=int, default=1100, help="dias de histórico no servidor local")
+    parser.add_argument("--latency", type=float, default=0.05, help="latência das APIs simuladas (segundos)")
+    parser.add_argument("--jitter", type=float, default=0.05)
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="fração de 429 no servidor local")
+    parser.add_argument("--timeout-rate", type=float, default=0.0, help="fração de requisições sem resposta")
+    parser.add_argument("--output", help="grava o relatório em JSON")
+    args = parser.parse_args()
+
+    stub, env = start_stub(args)
+    os.environ.update(env)  # Antes de importar o app: as URLs base são lidas no import
+    share_test_runtime()
+    try:
+        # Aquecimento: sobe o serviço de dados e preenche os caches do processo
+        warmup = Session(args.seed, args.timeout)
+        warmup.first_run()
+        for page in PAGES[1:]:
+            warmup.app.sidebar.selectbox[0].select(page).run()
+
+        print("=" * 96)
+        print(f"🏋️ TESTE DE CARGA ({args.duration:.0f}s por nível, latência simulada {args.latency * 1000:.0f} ms)")
+        print("=" * 96)
+        print(f"{'Sessões':>8}{'Reruns':>9}{'Erros':>7}{'Reruns/s':>10}{'p50 (ms)':>11}{'p95 (ms)':>11}"
+              f"{'p99 (ms)':>11}{'CPU (%)':>10}{'RSS (MB)':>10}")
+        results = []
+        for level in args.levels:
+            item = run_level(level, args.duration, args.seed, args.timeout)
+            results.append(item)
+            print(f"{item['concurrency']:>8}{item['reruns']:>9}{item['errors']:>7}{item['throughput_rps']:>10.2f}"
+                  f"{_ms(item['p50_s'])}{_ms(item['p95_s'])}{_ms(item['p99_s'])}"
+                  f"{item['cpu_percent']:>10.0f}{item['rss_mb']:>10,.0f}")
+    finally:
+        stub.terminate()
+        stub.wait()
+
+    if args.output:
+        report = {
+            "meta": {
+                "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+                "python": sys.version.split()[0],
+                "cpus": os.cpu_count(),
+                **{key: value for key, value in vars(args).items() if key != "output"},
+            },
+            "levels": results,
+        }
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        print(f"\n📄 Resultado completo em {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+# Sobe o servidor local que imita o Brasil.io e o disease.sh
+
+import argparse
+import os
+import sys
+import threading
+
+# Adicionar o diretório pai ao path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.data.stub_server import StubAPIServer
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Servidor local com dados sintéticos das APIs de COVID-19")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--days", type=int, default=1100, help="dias de histórico por estado")
+    parser.add_argument("--city-states", nargs="*", default=None, help="UFs com linhas por município")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--latency", type=float, default=0.0, help="segundos antes de cada resposta")
+    parser.add_argument("--jitter", type=float, default=0.0, help="espera extra aleatória (segundos)")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="fração de respostas 429")
+    parser.add_argument("--retry-after", type=int, default=1, help="Retry-After dos 429 (segundos)")
+    parser.add_argument("--timeout-rate", type=float, default=0.0, help="fração de requisições sem resposta")
+    parser.add_argument("--hang-seconds", type=float, default=30.0, help="duração das requisições sem resposta")
+    args = parser.parse_args()
+
+    server = StubAPIServer(
+        host=args.host,
+        port=args.port,
+        days=args.days,
+        city_states=args.city_states,
+        seed=args.seed,
+        latency=args.latency,
+        jitter=args.jitter,
+        rate_limit_rate=args.rate_limit_rate,
+        retry_after=args.retry_after,
+        timeout_rate=args.timeout_rate,
+        hang_seconds=args.hang_seconds,
+    )
+    server.start()
+
+    print(f"🧪 Servidor local em {server.url} — aponte o dashboard para ele com:")
+    for name, value in server.env().items():
+        print(f"   export {name}={value}")
+    print("Ctrl+C para encerrar.")
+
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+        print(f"Requisições atendidas: {server.stats()}")
+
+
+if __name__ == "__main__":
+    main()
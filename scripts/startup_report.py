@@ -0,0 +1,80 @@
+# Relatório de tempo de inicialização do streamlit_app.py (imports adiados)
+
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Bibliotecas que só devem ser carregadas quando uma página desenha gráficos
+DEFERRED_MODULES = [
+    "plotly.express",
+    "plotly.subplots",
+    "folium",
+    "streamlit_folium",
+    "src.components.advanced_analytics",
+]
+
+# Cada cenário roda em um interpretador novo; o tempo medido é o dos imports
+SCENARIOS = {
+    "streamlit (referência)": "import streamlit",
+    "streamlit_app (atual)": "import streamlit_app",
+    "streamlit_app + imports antigos": (
+        "import streamlit_app, plotly.express, plotly.graph_objects, plotly.subplots, "
+        "folium, streamlit_folium, json, src.components.advanced_analytics"
+    ),
+}
+
+PROBE = """
+import sys, time, json
+start = time.perf_counter()
+{statement}
+elapsed = time.perf_counter() - start
+print(json.dumps({{"seconds": elapsed, "loaded": [m for m in {modules!r} if m in sys.modules]}}))
+"""
+
+
+def run_scenario(statement, repeat):
+    """Mediana do tempo de import em `repeat` interpretadores novos e módulos adiados carregados."""
+    samples, loaded = [], []
+    for _ in range(repeat):
+        result = subprocess.run(
+            [sys.executable, "-c", PROBE.format(statement=statement, modules=DEFERRED_MODULES)],
+            cwd=ROOT,
+            capture_output=True,
+            text=True,
+            env={**os.environ, "PYTHONPATH": ROOT},
+        )
+        if result.returncode != 0:
+            raise RuntimeError(result.stderr.strip().splitlines()[-1])
+        data = json.loads(result.stdout.strip().splitlines()[-1])
+        samples.append(data["seconds"])
+        loaded = data["loaded"]
+    return statistics.median(samples), loaded
+
+
+def main():
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+
+    print("=" * 72)
+    print(f"🚀 RELATÓRIO DE INICIALIZAÇÃO (mediana de {repeat} execuções)")
+    print("=" * 72)
+
+    results = {}
+    for name, statement in SCENARIOS.items():
+        seconds, loaded = run_scenario(statement, repeat)
+        results[name] = seconds
+        print(f"{name:<36}{seconds * 1000:>10,.0f} ms")
+        if name == "streamlit_app (atual)":
+            status = ", ".join(loaded) if loaded else "nenhuma"
+            print(f"   • Bibliotecas adiadas carregadas no start: {status}")
+
+    saving = results["streamlit_app + imports antigos"] - results["streamlit_app (atual)"]
+    print("-" * 72)
+    print(f"Economia no start com imports adiados: {saving * 1000:,.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
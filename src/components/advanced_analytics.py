@@ -3,68 +3,92 @@
 import streamlit as st
 import pandas as pd
 import plotly.express as px
-import plotly.graph_objects as go
 from plotly.subplots import make_subplots
-import folium
-from streamlit_folium import st_folium
-import json
-from src.utils.constants import REGIOES_BRASIL
+from src.utils.constants import REGIOES_BRASIL, MOVING_AVERAGE_WINDOWS
+from src.data.data_processor import (
+    calculate_moving_averages, enrich_state_metrics, latest_city_snapshot, moving_average_column
+)
+from src.data.time_series_index import index_time_series
+from src.components.figure_cache import cached_figure
+from src.utils.downsampling import downsample_frame, downsample_xy
+from src.components.render_engine import figure_points, line_render_mode, scatter_trace
+from src.components.trace_panel import plotly_chart
+from src.utils.tracing import traced
 
+@traced(kind="figure")
 def create_time_series_charts(df_historical, selected_states=None):
     """Cria gráficos de séries temporais"""
     if df_historical is None or df_historical.empty:
         st.error("Dados históricos não disponíveis")
         return
     
+    # Série indexada por (state, date): os estados saem de recortes por bloco
+    index = index_time_series(df_historical)
+    
     # Filtrar estados se especificado
     if selected_states:
-        df_filtered = df_historical[df_historical['state'].isin(selected_states)]
+        df_filtered = index.select(selected_states)
     else:
         # Pegar os 5 estados com mais casos para visualização
-        top_states = df_historical.groupby('state')['last_available_confirmed'].max().nlargest(5).index.tolist()
-        df_filtered = df_historical[df_historical['state'].isin(top_states)]
+        top_states = index.block_max('last_available_confirmed').nlargest(5).index.tolist()
+        df_filtered = index.select(top_states)
     
-    # Gráfico de casos novos ao longo do tempo
+    # Gráfico de casos novos ao longo do tempo (pontos por estado limitados pela largura do gráfico)
     st.subheader("📈 Evolução de Casos Novos por Estado")
     
+    # Gráficos acima de WEBGL_POINT_THRESHOLD pontos (somando os estados) vão para WebGL (ver render_engine)
+    df_casos = downsample_frame(df_filtered, 'date', 'new_confirmed', group_col='state')
     fig_casos = px.line(
-        df_filtered,
+        df_casos,
         x='date',
         y='new_confirmed',
         color='state',
         title='Casos Novos Diários por Estado',
-        labels={'new_confirmed': 'Casos Novos', 'date': 'Data', 'state': 'Estado'}
+        labels={'new_confirmed': 'Casos Novos', 'date': 'Data', 'state': 'Estado'},
+        render_mode=line_render_mode(figure_points(df_casos))
     )
     fig_casos.update_layout(height=400)
-    st.plotly_chart(fig_casos, use_container_width=True)
+    plotly_chart(fig_casos, use_container_width=True)
     
     # Gráfico de óbitos novos ao longo do tempo
     st.subheader("📉 Evolução de Óbitos por Estado")
     
+    df_obitos = downsample_frame(df_filtered, 'date', 'new_deaths', group_col='state')
     fig_obitos = px.line(
-        df_filtered,
+        df_obitos,
         x='date',
         y='new_deaths',
         color='state',
         title='Óbitos Diários por Estado',
-        labels={'new_deaths': 'Óbitos Novos', 'date': 'Data', 'state': 'Estado'}
+        labels={'new_deaths': 'Óbitos Novos', 'date': 'Data', 'state': 'Estado'},
+        render_mode=line_render_mode(figure_points(df_obitos))
     )
     fig_obitos.update_layout(height=400)
-    st.plotly_chart(fig_obitos, use_container_width=True)
+    plotly_chart(fig_obitos, use_container_width=True)
 
+@traced(kind="figure")
 def create_moving_averages_chart(df_with_ma):
     """Cria gráfico com médias móveis"""
     if df_with_ma is None or df_with_ma.empty:
         return
     
-    st.subheader("📊 Médias Móveis (7 dias)")
+    # Janelas já calculadas por calculate_moving_averages (colunas ma_cases_<janela>)
+    windows = [w for w in MOVING_AVERAGE_WINDOWS if moving_average_column('new_confirmed', w) in df_with_ma.columns]
+    window = st.radio(
+        "Janela da média móvel:", windows, horizontal=True, format_func=lambda w: f"{w} dias"
+    ) if windows else 7
+    
+    st.subheader(f"📊 Médias Móveis ({window} dias)")
     
-    # Selecionar estado para análise detalhada
-    states = sorted(df_with_ma['state'].unique())
-    selected_state = st.selectbox("Selecione um estado para análise detalhada:", states)
+    cases_col = moving_average_column('new_confirmed', window) if windows else 'ma_cases'
+    deaths_col = moving_average_column('new_deaths', window) if windows else 'ma_deaths'
+    
+    # Selecionar estado para análise detalhada (recorte O(1) no índice por estado)
+    index = index_time_series(df_with_ma)
+    selected_state = st.selectbox("Selecione um estado para análise detalhada:", index.states)
     
     if selected_state:
-        df_state = df_with_ma[df_with_ma['state'] == selected_state].copy()
+        df_state = index.state(selected_state)
         
         # Criar subplot com casos e óbitos
         fig = make_subplots(
@@ -73,33 +97,43 @@ def create_moving_averages_chart(df_with_ma):
             vertical_spacing=0.1
         )
         
+        # Cada trace é reduzido por LTTB (picos preservados) antes de ir para o navegador
+        series = {}
+        for col in ('new_confirmed', cases_col, 'new_deaths', deaths_col):
+            x, y = downsample_xy(df_state['date'].to_numpy(), df_state[col].to_numpy())
+            series[col] = dict(x=x, y=y)
+        
+        # Mesmo motor (SVG ou WebGL) para todos os traces, escolhido pelo total do gráfico
+        n_points = sum(len(trace['x']) for trace in series.values())
+        
         # Casos novos
         fig.add_trace(
-            go.Scatter(x=df_state['date'], y=df_state['new_confirmed'], 
-                      name='Casos Diários', line=dict(color='lightblue', width=1)),
+            scatter_trace(n_points, **series['new_confirmed'], 
+                          name='Casos Diários', line=dict(color='lightblue', width=1)),
             row=1, col=1
         )
         fig.add_trace(
-            go.Scatter(x=df_state['date'], y=df_state['ma_cases'],
-                      name='Média Móvel 7d', line=dict(color='blue', width=3)),
+            scatter_trace(n_points, **series[cases_col],
+                          name=f'Média Móvel {window}d', line=dict(color='blue', width=3)),
             row=1, col=1
         )
         
         # Óbitos
         fig.add_trace(
-            go.Scatter(x=df_state['date'], y=df_state['new_deaths'], 
-                      name='Óbitos Diários', line=dict(color='lightcoral', width=1)),
+            scatter_trace(n_points, **series['new_deaths'], 
+                          name='Óbitos Diários', line=dict(color='lightcoral', width=1)),
             row=2, col=1
         )
         fig.add_trace(
-            go.Scatter(x=df_state['date'], y=df_state['ma_deaths'],
-                      name='Média Móvel 7d', line=dict(color='red', width=3)),
+            scatter_trace(n_points, **series[deaths_col],
+                          name=f'Média Móvel {window}d', line=dict(color='red', width=3)),
             row=2, col=1
         )
         
         fig.update_layout(height=600, title=f'Análise Temporal - {selected_state}')
-        st.plotly_chart(fig, use_container_width=True)
+        plotly_chart(fig, use_container_width=True)
 
+@traced(kind="figure")
 def create_per_capita_analysis(df_estados):
     """Cria análises per capita"""
     if df_estados is None or df_estados.empty:
@@ -107,17 +141,8 @@ def create_per_capita_analysis(df_estados):
     
     st.subheader("👥 Análises Per Capita")
     
-    # Usar dados já calculados pela API
-    df_analysis = df_estados.copy()
-    
-    # Calcular incidência se não estiver disponível
-    if 'last_available_confirmed_per_100k_inhabitants' not in df_analysis.columns:
-        df_analysis['incidencia_100k'] = (df_analysis['last_available_confirmed'] / df_analysis['estimated_population'] * 100000)
-    else:
-        df_analysis['incidencia_100k'] = df_analysis['last_available_confirmed_per_100k_inhabitants']
-    
-    # Calcular mortalidade per capita
-    df_analysis['mortalidade_100k'] = (df_analysis['last_available_deaths'] / df_analysis['estimated_population'] * 100000)
+    # Indicadores per capita já calculados pela etapa de enriquecimento
+    df_analysis = enrich_state_metrics(df_estados)
     
     col1, col2 = st.columns(2)
     
@@ -135,7 +160,7 @@ def create_per_capita_analysis(df_estados):
             color_continuous_scale='Oranges'
         )
         fig_inc.update_layout(height=500, showlegend=False)
-        st.plotly_chart(fig_inc, use_container_width=True)
+        plotly_chart(fig_inc, use_container_width=True)
     
     with col2:
         st.markdown("**Mortalidade por 100k Habitantes**")
@@ -151,8 +176,9 @@ def create_per_capita_analysis(df_estados):
             color_continuous_scale='Reds'
         )
         fig_mort.update_layout(height=500, showlegend=False)
-        st.plotly_chart(fig_mort, use_container_width=True)
+        plotly_chart(fig_mort, use_container_width=True)
 
+@traced(kind="figure")
 def create_brazil_charts(df_estados):
     """Cria visualizações por estados do Brasil usando gráficos de barras"""
     st.subheader("📊 Análise Comparativa entre Estados")
@@ -162,24 +188,8 @@ def create_brazil_charts(df_estados):
         return
     
     try:
-        # Preparar dados
-        df_chart = df_estados.copy()
-        
-        # Calcular métricas se não existirem
-        if 'taxa_mortalidade' not in df_chart.columns:
-            df_chart['taxa_mortalidade'] = df_chart.apply(
-                lambda row: (row['last_available_deaths'] / row['last_available_confirmed'] * 100) 
-                if row['last_available_confirmed'] > 0 else 0, axis=1
-            )
-        
-        if 'incidencia_100k' not in df_chart.columns:
-            if 'last_available_confirmed_per_100k_inhabitants' in df_chart.columns:
-                df_chart['incidencia_100k'] = df_chart['last_available_confirmed_per_100k_inhabitants']
-            else:
-                df_chart['incidencia_100k'] = df_chart.apply(
-                    lambda row: (row['last_available_confirmed'] / row['estimated_population'] * 100000) 
-                    if row['estimated_population'] > 0 else 0, axis=1
-                )
+        # Preparar dados (taxa_mortalidade e incidencia_100k já calculadas)
+        df_chart = enrich_state_metrics(df_estados)
         
         # Filtros
         col1, col2 = st.columns(2)
@@ -219,69 +229,81 @@ def create_brazil_charts(df_estados):
         # Ordenar por casos confirmados para melhor visualização
         df_filtered = df_filtered.sort_values('last_available_confirmed', ascending=False)
         
-        # Criar visualizações
+        # Criar visualizações (do cache enquanto dados e filtros não mudam)
         col1, col2 = st.columns(2)
         
         with col1:
             # Gráfico de casos confirmados
-            fig_casos = px.bar(
-                df_filtered.head(15),  # Top 15 para melhor visualização
-                x='state',
-                y='last_available_confirmed',
-                title='Top 15 Estados - Casos Confirmados',
-                labels={'last_available_confirmed': 'Casos Confirmados', 'state': 'Estado'},
-                color='last_available_confirmed',
-                color_continuous_scale='Blues'
-            )
-            fig_casos.update_layout(xaxis_tickangle=-45)
-            st.plotly_chart(fig_casos, use_container_width=True)
+            def build_casos():
+                fig_casos = px.bar(
+                    df_filtered.head(15),  # Top 15 para melhor visualização
+                    x='state',
+                    y='last_available_confirmed',
+                    title='Top 15 Estados - Casos Confirmados',
+                    labels={'last_available_confirmed': 'Casos Confirmados', 'state': 'Estado'},
+                    color='last_available_confirmed',
+                    color_continuous_scale='Blues'
+                )
+                fig_casos.update_layout(xaxis_tickangle=-45)
+                return fig_casos
+            fig_casos = cached_figure('estados.top_casos', df_chart, build_casos, states=tuple(selected_states))
+            plotly_chart(fig_casos, use_container_width=True)
             
         with col2:
             # Gráfico de óbitos
-            fig_obitos = px.bar(
-                df_filtered.head(15),
-                x='state',
-                y='last_available_deaths',
-                title='Top 15 Estados - Óbitos',
-                labels={'last_available_deaths': 'Óbitos', 'state': 'Estado'},
-                color='last_available_deaths',
-                color_continuous_scale='Reds'
-            )
-            fig_obitos.update_layout(xaxis_tickangle=-45)
-            st.plotly_chart(fig_obitos, use_container_width=True)
+            def build_obitos():
+                fig_obitos = px.bar(
+                    df_filtered.head(15),
+                    x='state',
+                    y='last_available_deaths',
+                    title='Top 15 Estados - Óbitos',
+                    labels={'last_available_deaths': 'Óbitos', 'state': 'Estado'},
+                    color='last_available_deaths',
+                    color_continuous_scale='Reds'
+                )
+                fig_obitos.update_layout(xaxis_tickangle=-45)
+                return fig_obitos
+            fig_obitos = cached_figure('estados.top_obitos', df_chart, build_obitos, states=tuple(selected_states))
+            plotly_chart(fig_obitos, use_container_width=True)
         
         # Segunda linha de gráficos
         col3, col4 = st.columns(2)
         
         with col3:
             # Gráfico de taxa de mortalidade
-            df_mortalidade = df_filtered.sort_values('taxa_mortalidade', ascending=False)
-            fig_mortalidade = px.bar(
-                df_mortalidade.head(15),
-                x='state',
-                y='taxa_mortalidade',
-                title='Top 15 Estados - Taxa de Mortalidade (%)',
-                labels={'taxa_mortalidade': 'Taxa de Mortalidade (%)', 'state': 'Estado'},
-                color='taxa_mortalidade',
-                color_continuous_scale='Oranges'
-            )
-            fig_mortalidade.update_layout(xaxis_tickangle=-45)
-            st.plotly_chart(fig_mortalidade, use_container_width=True)
+            def build_mortalidade():
+                df_mortalidade = df_filtered.sort_values('taxa_mortalidade', ascending=False)
+                fig_mortalidade = px.bar(
+                    df_mortalidade.head(15),
+                    x='state',
+                    y='taxa_mortalidade',
+                    title='Top 15 Estados - Taxa de Mortalidade (%)',
+                    labels={'taxa_mortalidade': 'Taxa de Mortalidade (%)', 'state': 'Estado'},
+                    color='taxa_mortalidade',
+                    color_continuous_scale='Oranges'
+                )
+                fig_mortalidade.update_layout(xaxis_tickangle=-45)
+                return fig_mortalidade
+            fig_mortalidade = cached_figure('estados.taxa_mortalidade', df_chart, build_mortalidade, states=tuple(selected_states))
+            plotly_chart(fig_mortalidade, use_container_width=True)
             
         with col4:
             # Gráfico de incidência por 100k
-            df_incidencia = df_filtered.sort_values('incidencia_100k', ascending=False)
-            fig_incidencia = px.bar(
-                df_incidencia.head(15),
-                x='state',
-                y='incidencia_100k',
-                title='Top 15 Estados - Incidência por 100k hab',
-                labels={'incidencia_100k': 'Casos por 100k hab', 'state': 'Estado'},
-                color='incidencia_100k',
-                color_continuous_scale='Greens'
-            )
-            fig_incidencia.update_layout(xaxis_tickangle=-45)
-            st.plotly_chart(fig_incidencia, use_container_width=True)
+            def build_incidencia():
+                df_incidencia = df_filtered.sort_values('incidencia_100k', ascending=False)
+                fig_incidencia = px.bar(
+                    df_incidencia.head(15),
+                    x='state',
+                    y='incidencia_100k',
+                    title='Top 15 Estados - Incidência por 100k hab',
+                    labels={'incidencia_100k': 'Casos por 100k hab', 'state': 'Estado'},
+                    color='incidencia_100k',
+                    color_continuous_scale='Greens'
+                )
+                fig_incidencia.update_layout(xaxis_tickangle=-45)
+                return fig_incidencia
+            fig_incidencia = cached_figure('estados.incidencia', df_chart, build_incidencia, states=tuple(selected_states))
+            plotly_chart(fig_incidencia, use_container_width=True)
         
         # Estatísticas resumidas
         st.subheader("📈 Estatísticas dos Estados Selecionados")
@@ -325,21 +347,16 @@ def create_brazil_charts(df_estados):
         st.error(f"Erro ao criar visualizações: {str(e)}")
         st.info("Verifique se os dados estão disponíveis e tente novamente.")
 
+@traced(kind="figure")
 def create_regional_analysis(df_estados):
     """Cria análise por regiões do Brasil"""
     st.subheader("🌎 Análise por Regiões")
     
-    # Definir regiões
-    regioes = REGIOES_BRASIL
-    
-    # Adicionar coluna de região
-    df_regional = df_estados.copy()
-    df_regional['regiao'] = df_regional['state'].map(
-        {state: regiao for regiao, states in regioes.items() for state in states}
-    )
+    # Coluna `regiao` vem da etapa de enriquecimento
+    df_regional = enrich_state_metrics(df_estados)
     
     # Agregar dados por região
-    regional_summary = df_regional.groupby('regiao').agg({
+    regional_summary = df_regional.groupby('regiao', observed=True).agg({
         'last_available_confirmed': 'sum',
         'last_available_deaths': 'sum',
         'estimated_population': 'sum',
@@ -363,7 +380,7 @@ def create_regional_analysis(df_estados):
             color='last_available_confirmed',
             color_continuous_scale='Blues'
         )
-        st.plotly_chart(fig_casos_regiao, use_container_width=True)
+        plotly_chart(fig_casos_regiao, use_container_width=True)
     
     with col2:
         fig_inc_regiao = px.bar(
@@ -375,7 +392,7 @@ def create_regional_analysis(df_estados):
             color='incidencia_100k',
             color_continuous_scale='Oranges'
         )
-        st.plotly_chart(fig_inc_regiao, use_container_width=True)
+        plotly_chart(fig_inc_regiao, use_container_width=True)
     
     # Tabela resumo
     st.markdown("**Resumo Regional**")
@@ -383,4 +400,89 @@ def create_regional_analysis(df_estados):
         regional_summary[['regiao', 'last_available_confirmed', 'last_available_deaths', 
                          'taxa_mortalidade', 'incidencia_100k']].round(2),
         use_container_width=True
-    )
\ No newline at end of file
+    )
+
+@traced(kind="figure")
+def create_city_analysis(df_cities, state):
+    """Cria análises por município de um estado (série de get_brasil_city_time_series)"""
+    if df_cities is None or df_cities.empty:
+        return
+    
+    st.subheader(f"🏙️ Municípios - {state}")
+    
+    # Última linha de cada município, com incidência e mortalidade calculadas
+    df_latest = enrich_state_metrics(latest_city_snapshot(df_cities))
+    
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("Municípios", f"{len(df_latest):,}".replace(",", "."))
+    col2.metric("Casos Confirmados", f"{int(df_latest['last_available_confirmed'].sum()):,}".replace(",", "."))
+    col3.metric("Óbitos", f"{int(df_latest['last_available_deaths'].sum()):,}".replace(",", "."))
+    col4.metric("Dias de Série", df_cities['date'].nunique())
+    if df_cities.attrs.get('truncated'):
+        st.caption("Série encurtada para caber no limite de memória do modo municípios (COVID19_CITY_MEMORY_MB).")
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.markdown("**Top 15 Municípios - Casos Confirmados**")
+        def build_casos():
+            top_casos = df_latest.head(15).assign(city=lambda df: df['city'].astype(str))
+            fig_casos = px.bar(
+                top_casos,
+                x='last_available_confirmed',
+                y='city',
+                orientation='h',
+                labels={'last_available_confirmed': 'Casos Confirmados', 'city': 'Município'},
+                color='last_available_confirmed',
+                color_continuous_scale='Blues'
+            )
+            fig_casos.update_layout(height=500, showlegend=False, yaxis={'categoryorder': 'total ascending'})
+            return fig_casos
+        fig_casos = cached_figure('municipios.top_casos', df_cities, build_casos, state=state)
+        plotly_chart(fig_casos, use_container_width=True)
+    
+    with col2:
+        st.markdown("**Top 15 Municípios - Incidência por 100k Habitantes**")
+        def build_incidencia():
+            top_incidencia = df_latest.nlargest(15, 'incidencia_100k').assign(city=lambda df: df['city'].astype(str))
+            fig_inc = px.bar(
+                top_incidencia,
+                x='incidencia_100k',
+                y='city',
+                orientation='h',
+                labels={'incidencia_100k': 'Casos por 100k hab', 'city': 'Município'},
+                color='incidencia_100k',
+                color_continuous_scale='Oranges'
+            )
+            fig_inc.update_layout(height=500, showlegend=False, yaxis={'categoryorder': 'total ascending'})
+            return fig_inc
+        fig_inc = cached_figure('municipios.top_incidencia', df_cities, build_incidencia, state=state)
+        plotly_chart(fig_inc, use_container_width=True)
+    
+    # Evolução dos municípios escolhidos (média móvel de 7 dias, calculada só para eles)
+    cidades = df_latest['city'].astype(str).tolist()
+    selected_cities = st.multiselect(
+        "Municípios para comparar:", cidades, default=cidades[:5], key=f"municipios_{state}"
+    )
+    if not selected_cities:
+        return
+    
+    def build_evolucao():
+        df_selected = df_cities[df_cities['city'].isin(selected_cities)]
+        df_selected = calculate_moving_averages(df_selected, windows=(7,), group_col='city')
+        df_selected = df_selected.assign(city=df_selected['city'].astype(str))
+        ma_col = moving_average_column('new_confirmed', 7)
+        df_plot = downsample_frame(df_selected, 'date', ma_col, group_col='city')
+        fig = px.line(
+            df_plot,
+            x='date',
+            y=ma_col,
+            color='city',
+            title='Casos Novos por Município (média móvel de 7 dias)',
+            labels={ma_col: 'Casos Novos (MM 7d)', 'date': 'Data', 'city': 'Município'},
+            render_mode=line_render_mode(figure_points(df_plot))
+        )
+        fig.update_layout(height=450)
+        return fig
+    fig_evolucao = cached_figure('municipios.evolucao', df_cities, build_evolucao, cidades=tuple(selected_cities))
+    plotly_chart(fig_evolucao, use_container_width=True)
@@ -2,6 +2,7 @@
 import streamlit as st
 import plotly.express as px
 import pandas as pd
+from src.components.trace_panel import plotly_chart
 
 def aplicar_layout_padrao(fig, altura=400):
     """Aplica um estilo padrão para os gráficos Plotly"""
@@ -166,7 +167,7 @@ def exibir_grafico(fig, titulo="", use_container_width=True):
     """
     if titulo:
         st.subheader(titulo)
-    st.plotly_chart(fig, use_container_width=use_container_width)
+    plotly_chart(fig, use_container_width=use_container_width)
 
 def criar_colunas_metricas(metricas_dados, num_colunas=None):
     """Cria colunas com métricas usando Streamlit
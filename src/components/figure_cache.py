@@ -0,0 +1,134 @@
+# Cache de figuras Plotly por versão dos dados e parâmetros da visualização
+
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from src.data.data_processor import data_version
+from src.data.metrics import record_cache
+from src.utils.constants import FIGURE_CACHE_MAX_BYTES, FIGURE_CACHE_MAX_ENTRIES
+from src.utils.tracing import span
+
+_shared_cache = None
+_shared_cache_lock = threading.Lock()
+
+
+def _estimate_bytes(obj):
+    """Estimativa barata da memória de uma estrutura do Plotly (dicts, listas e arrays)."""
+    if isinstance(obj, np.ndarray):
+        return obj.nbytes if obj.dtype != object else 64 * obj.size
+    if isinstance(obj, dict):
+        return sum(_estimate_bytes(value) for value in obj.values()) + 64
+    if isinstance(obj, (list, tuple)):
+        return sum(_estimate_bytes(item) for item in obj) + 8 * len(obj)
+    if isinstance(obj, str):
+        return len(obj) + 48
+    return 16
+
+
+def figure_size(fig):
+    """Tamanho aproximado de uma figura em bytes (sem serializá-la para JSON)."""
+    return _estimate_bytes(fig.to_plotly_json())
+
+
+class FigureCache:
+    """Cache LRU de figuras prontas, limitado por quantidade de entradas e por bytes.
+
+    A chave combina o nome da visualização, a versão dos dados de entrada
+    (`data_version`) e os filtros usados, então uma figura só é reconstruída
+    quando os dados ou os filtros mudam. As figuras guardadas são
+    compartilhadas entre sessões: trate-as como somente leitura.
+    """
+
+    def __init__(self, max_entries=FIGURE_CACHE_MAX_ENTRIES, max_bytes=FIGURE_CACHE_MAX_BYTES):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(name, data, params=None):
+        """Chave do cache: nome + versão de cada DataFrame de entrada + parâmetros em ordem estável."""
+        frames = data if isinstance(data, (tuple, list)) else (data,)
+        versions = tuple(data_version(df) if isinstance(df, pd.DataFrame) or df is None else repr(df) for df in frames)
+        return name, versions, repr(sorted((params or {}).items()))
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        """Retorna a figura guardada (marcando-a como usada recentemente) ou None."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def store(self, key, fig):
+        """Guarda uma figura; figuras maiores que o limite de bytes não são guardadas."""
+        size = figure_size(fig)
+        if size > self.max_bytes:
+            return fig
+
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.total_bytes -= previous[1]
+            self._entries[key] = (fig, size)
+            self.total_bytes += size
+            while self._entries and (len(self._entries) > self.max_entries or self.total_bytes > self.max_bytes):
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self.total_bytes -= evicted_size
+        return fig
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.total_bytes = 0
+
+
+def get_shared_figure_cache():
+    """Retorna o cache de figuras único do processo."""
+    global _shared_cache
+    if _shared_cache is None:
+        with _shared_cache_lock:
+            if _shared_cache is None:
+                _shared_cache = FigureCache()
+    return _shared_cache
+
+
+def cached_figure(name, data, build, **params):
+    """Retorna a figura de `name` para os dados e filtros informados, construindo-a só se preciso.
+
+    Parâmetros:
+    -----------
+    name : str
+        Identificação da visualização (ex.: "brasil.top_casos").
+    data : pandas.DataFrame | tuple
+        DataFrame(s) de origem da figura; a versão deles entra na chave.
+    build : callable
+        Função sem argumentos que monta a figura (chamada apenas em caso de miss).
+    **params :
+        Filtros e opções que alteram a figura (ex.: estados selecionados).
+
+    Retorna:
+    --------
+    plotly.graph_objects.Figure
+        Figura pronta (compartilhada; não altere depois de obtê-la).
+    """
+    cache = get_shared_figure_cache()
+    key = cache.make_key(name, data, params)
+    fig = cache.get(key)
+    record_cache("figure_cache", fig is not None)
+    if fig is None:
+        with span(f"figura:{name}", kind="figure"):
+            fig = cache.store(key, build())
+    return fig
@@ -0,0 +1,52 @@
+# Escolha entre SVG e WebGL para os traces de séries temporais
+
+import plotly.graph_objects as go
+
+from src.utils.constants import RENDER_ENGINE, WEBGL_POINT_THRESHOLD
+
+RENDER_ENGINES = ("auto", "svg", "webgl")
+
+
+def use_webgl(n_points, engine=None, threshold=None):
+    """Indica se um gráfico com `n_points` pontos deve ser desenhado em WebGL.
+
+    O custo do SVG cresce com o total de pontos do gráfico, não com o maior
+    trace: 27 estados de 500 pontos pesam como um trace de 13.500.
+
+    Parâmetros:
+    -----------
+    n_points : int
+        Pontos do gráfico (soma de todos os traces, já reduzidos).
+    engine : str | None
+        'auto', 'svg' ou 'webgl' (padrão: RENDER_ENGINE / COVID19_RENDER_ENGINE).
+        Valores desconhecidos são tratados como 'auto'.
+    threshold : int | None
+        Limite de pontos do modo 'auto' (padrão: WEBGL_POINT_THRESHOLD).
+
+    Retorna:
+    --------
+    bool
+        True para WebGL, False para SVG.
+    """
+    engine = engine or RENDER_ENGINE
+    if engine == "svg":
+        return False
+    if engine == "webgl":
+        return True
+    return n_points > (WEBGL_POINT_THRESHOLD if threshold is None else threshold)
+
+
+def scatter_trace(n_points, engine=None, **kwargs):
+    """Cria um `go.Scattergl` ou `go.Scatter` conforme o motor escolhido."""
+    trace_class = go.Scattergl if use_webgl(n_points, engine) else go.Scatter
+    return trace_class(**kwargs)
+
+
+def line_render_mode(n_points, engine=None):
+    """Valor de `render_mode` para `px.line` ('webgl' ou 'svg')."""
+    return "webgl" if use_webgl(n_points, engine) else "svg"
+
+
+def figure_points(df):
+    """Pontos de um `px.line` montado a partir de `df` (uma linha por ponto, todos os traces)."""
+    return 0 if df is None else len(df)
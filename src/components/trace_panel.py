@@ -0,0 +1,62 @@
+# Painel de rastreamento na sidebar e st.plotly_chart medido
+
+import pandas as pd
+import streamlit as st
+
+from src.utils.tracing import KIND_LABELS, flatten, span, time_by_kind, tracing_active
+
+
+def plotly_chart(fig, **kwargs):
+    """`st.plotly_chart` medido como um span (serialização e envio da figura)."""
+    if not tracing_active():
+        return st.plotly_chart(fig, **kwargs)
+    title = fig.layout.title.text if fig.layout.title else None
+    attrs = {"chart": title} if title else {}
+    with span("st.plotly_chart", kind="chart", traces=len(fig.data), **attrs):
+        return st.plotly_chart(fig, **kwargs)
+
+
+def _label(row):
+    """Nome do span, com o título do gráfico ou a URL quando houver."""
+    detail = row["attrs"].get("chart") or row["attrs"].get("url")
+    return f"{row['name']} ({detail})" if detail else row["name"]
+
+
+def render_trace_panel(root, min_ms=0.05):
+    """Expander na sidebar com os spans do rerun e o tempo por categoria.
+
+    Parâmetros:
+    -----------
+    root : src.utils.tracing.Span
+        Span raiz devolvido por `start_trace`.
+    min_ms : float
+        Spans mais curtos que isso ficam fora da tabela (continuam no total).
+    """
+    with st.sidebar.expander(f"⏱️ Tempos do render ({root.duration * 1000:,.0f} ms)", expanded=True):
+        by_kind = sorted(time_by_kind(root).items(), key=lambda item: item[1], reverse=True)
+        st.dataframe(
+            pd.DataFrame({
+                "categoria": [KIND_LABELS.get(kind, kind) for kind, _ in by_kind],
+                "ms": [seconds * 1000 for _, seconds in by_kind],
+            }),
+            hide_index=True,
+            use_container_width=True,
+            column_config={"ms": st.column_config.NumberColumn(format="%.1f")},
+        )
+
+        rows = [row for row in flatten(root) if row["ms"] >= min_ms]
+        st.dataframe(
+            pd.DataFrame({
+                "span": ["  " * row["depth"] + _label(row) for row in rows],
+                "ms": [row["ms"] for row in rows],
+                "próprio (ms)": [row["self_ms"] for row in rows],
+                "%": [row["pct"] for row in rows],
+            }),
+            hide_index=True,
+            use_container_width=True,
+            column_config={
+                "ms": st.column_config.NumberColumn(format="%.1f"),
+                "próprio (ms)": st.column_config.NumberColumn(format="%.1f"),
+                "%": st.column_config.NumberColumn(format="%.0f"),
+            },
+        )
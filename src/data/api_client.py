@@ -4,59 +4,236 @@ import requests
 import pandas as pd
 import os
 from dotenv import load_dotenv
-from src.utils.constants import BRASIL_IO_API_URL, WORLD_COVID_API_URL
+from src.utils.constants import (
+    BRASIL_IO_API_URL, WORLD_COVID_API_URL, MAX_CONCURRENT_REQUESTS, BRASIL_IO_PAGE_SIZE, ESTADOS_BRASIL,
+    BRASIL_IO_MAX_PAGE_SIZE, BRASIL_IO_DATE_FROM_PARAM, BRASIL_IO_DATE_TO_PARAM,
+    TIME_SERIES_STORE_PATH, MOVING_AVERAGE_WINDOWS, CITY_HISTORY_DAYS, CITY_MEMORY_BUDGET_BYTES
+)
+from src.data.http_session import get_shared_session
+from src.data.http_cache import get_shared_response_cache
+from src.data.rate_limit import get_limiter
+from src.data.resilience import get_breaker, parse_retry_after, remaining_budget
+from src.data.single_flight import SingleFlight
+from src.data.time_series_store import get_store
+from src.data.ingestion import ingest_caso_full, concat_caso_full
+from src.data.data_processor import calculate_moving_averages, moving_average_column
+from src.utils.tracing import span
+from src.data.metrics import UPSTREAM_LATENCY, UPSTREAM_RATE_LIMITED, UPSTREAM_RETRIES, UPSTREAM_TIMEOUTS
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+import contextvars
+import threading
 import time
 
 # Carregar variáveis de ambiente
 load_dotenv()
 
+# Semáforo global: limita as requisições em voo somando todos os clientes do processo
+_request_slots = threading.BoundedSemaphore(MAX_CONCURRENT_REQUESTS)
+
+# Requisições idênticas em andamento, compartilhadas entre todos os clientes do processo
+_flights = SingleFlight()
+
+class IncompletePaginationError(RuntimeError):
+    """Uma página de /caso_full/data falhou: o que já foi baixado estaria incompleto."""
+
+
+def _endpoint_label(url):
+    """Rota da URL sem as partes variáveis (ex.: /countries/{list}), para rótulos de métricas"""
+    path = urlparse(url).path.rstrip('/')
+    if '/countries/' in path:
+        return '/countries/{list}'
+    for route in ('/countries', '/caso_full/data'):
+        if path.endswith(route):
+            return route
+    return path.rsplit('/', 1)[-1] or '/'
+
 class COVID19APIClient:
     """Cliente para acessar APIs de dados da COVID-19"""
     
-    def __init__(self): 
+    def __init__(self, session=None, store=None): 
         self.brasil_io_api_key = os.getenv('BRASIL_IO_API_KEY')
+        self.session = session or get_shared_session()  # Pool keep-alive compartilhado pelo processo
+        self.response_cache = get_shared_response_cache()  # Respostas revalidáveis com GET condicional
+        # Store local em Parquet: séries lidas do disco, rede só para o delta
+        self.store = store or (get_store(TIME_SERIES_STORE_PATH) if TIME_SERIES_STORE_PATH else None)
         self.brasil_populacao = 215313498  # População do Brasil com base na estimativa do IBGE em 2022
         self.timeout = 10  # Timeout de 10 segundos
         self.max_retries = 2  # Máximo de 2 tentativas
         
     def _make_request(self, url, headers=None, params=None):
-        """Faz uma requisição HTTP com retry e timeout"""
+        """Faz uma requisição HTTP, compartilhando chamadas idênticas em andamento
+        
+        Requisições concorrentes com a mesma URL e parâmetros (ex.: várias
+        sessões logo após o fim do TTL do cache) resultam em uma única
+        chamada à API: a primeira executa `_fetch` e as demais recebem a
+        mesma resposta. Quem espera respeita o próprio orçamento de tempo.
+        """
+        key = self.response_cache.make_key(url, params)
+        try:
+            with span("http.get", kind="network", url=url):
+                return _flights.do(key, lambda: self._fetch(url, headers, params), timeout=remaining_budget())
+        except TimeoutError:
+            print(f"Orçamento de tempo esgotado aguardando requisição em andamento para {url}")
+            return None
+            
+    def _fetch(self, url, headers=None, params=None):
+        """Faz uma requisição HTTP com retry, timeout, GET condicional e circuit breaker
+        
+        Se já houver uma resposta com ETag/Last-Modified para a mesma URL e
+        parâmetros, envia If-None-Match/If-Modified-Since; um 304 é atendido
+        pelo cache local sem transferir nem decodificar o corpo de novo.
+        
+        Com o circuito do host aberto a chamada falha na hora (retorna None).
+        Timeouts, erros de conexão, 429 e qualquer 5xx contam como falha do
+        host; 2xx/3xx/4xx contam como sucesso. Timeouts e esperas entre
+        tentativas respeitam o orçamento definido por `resilience.deadline`,
+        e um Retry-After em 429/503 abre o circuito pelo tempo pedido pelo
+        servidor.
+        
+        Antes de cada tentativa a requisição entra na fila do limitador de
+        taxa do host (ver `rate_limit`); um 429 adia a fila inteira, em vez
+        de cada sessão fazer seu próprio backoff.
+        Depois ela espera uma vaga no limite global de requisições em voo
+        (MAX_CONCURRENT_REQUESTS), também dentro do orçamento: sem vaga a
+        tempo, a chamada falha como um orçamento esgotado.
+        """
+        host = urlparse(url).netloc
+        breaker = get_breaker(host)
+        limiter = get_limiter(host)
+        cache_key = self.response_cache.make_key(url, params)
+        validators = self.response_cache.conditional_headers(cache_key)
+        endpoint = _endpoint_label(url)
+        
         for attempt in range(self.max_retries):
+            budget = remaining_budget()
+            if budget is not None and budget <= 0:
+                print(f"Orçamento de tempo esgotado para {url}")
+                return None
+            if not breaker.allow_request():
+                print(f"Circuito aberto para {breaker.name}; falhando rápido")
+                return None
+            if limiter is not None:
+                if not limiter.acquire(timeout=budget):
+                    breaker.release_probe()  # Nada saiu: não há resultado a registrar no circuito
+                    print(f"Cota de requisições de {host} não libera dentro do orçamento")
+                    return None
+                budget = remaining_budget()  # Desconta a espera na fila
+                
+            # Vaga no limite global de requisições em voo, sem passar do orçamento
+            if not _request_slots.acquire(timeout=None if budget is None else max(0.0, budget)):
+                breaker.release_probe()  # Nada saiu: não há resultado a registrar no circuito
+                print(f"Orçamento de tempo esgotado aguardando vaga para requisição a {url}")
+                return None
+            budget = remaining_budget()  # Desconta a espera pela vaga
+            if budget is not None and budget <= 0:
+                _request_slots.release()
+                breaker.release_probe()
+                print(f"Orçamento de tempo esgotado para {url}")
+                return None
+                
+            if attempt > 0:
+                UPSTREAM_RETRIES.inc(host=host, endpoint=endpoint)
+            started = time.monotonic()
             try:
-                response = requests.get(
-                    url, 
-                    headers=headers, 
-                    params=params, 
-                    timeout=self.timeout
-                )
+                try:
+                    response = self.session.get(
+                        url, 
+                        headers={**(headers or {}), **validators}, 
+                        params=params, 
+                        timeout=min(self.timeout, budget) if budget is not None else self.timeout
+                    )
+                finally:
+                    _request_slots.release()
+                latency = time.monotonic() - started
+                UPSTREAM_LATENCY.observe(latency, host=host, endpoint=endpoint, status=str(response.status_code))
+                if response.status_code == 429:
+                    UPSTREAM_RATE_LIMITED.inc(host=host)
+                
+                throttled = response.status_code in (429, 503)
+                if throttled or response.status_code >= 500:
+                    # Só 429/503 trazem Retry-After; qualquer 5xx conta como falha do host
+                    retry_after = parse_retry_after(response.headers.get('Retry-After')) if throttled else None
+                    breaker.record_failure(f"HTTP {response.status_code}", retry_after=retry_after, latency=latency)
+                    if throttled and limiter is not None:
+                        limiter.defer(retry_after if retry_after is not None else 2 ** attempt)
+                    if retry_after is not None:
+                        return None  # O servidor disse quando voltar; o circuito fica aberto até lá
+                else:
+                    breaker.record_success(latency)
+                    
                 if response.status_code == 200:
-                    return response
-                elif response.status_code == 429:  # Rate limit
-                    time.sleep(2 ** attempt)  # Backoff exponencial
+                    return self.response_cache.store(cache_key, response)
+                elif response.status_code == 304:  # Não modificado desde a última resposta
+                    cached = self.response_cache.get(cache_key)
+                    if cached is not None:
+                        return cached
+                    validators = {}  # Entrada despejada no meio do caminho: refaz sem validadores
                     continue
+                elif response.status_code == 429:  # Rate limit
+                    if limiter is None:
+                        self._sleep_within_budget(2 ** attempt)  # Backoff exponencial
+                    continue  # Com limitador, a próxima vez na fila já espera o adiamento
                 else:
                     print(f"Erro HTTP {response.status_code} na tentativa {attempt + 1}")
                     
             except requests.exceptions.Timeout:
+                UPSTREAM_TIMEOUTS.inc(host=host)
+                UPSTREAM_LATENCY.observe(time.monotonic() - started, host=host, endpoint=endpoint, status='timeout')
+                breaker.record_failure("timeout", latency=time.monotonic() - started)
                 print(f"Timeout na tentativa {attempt + 1} para {url}")
             except requests.exceptions.ConnectionError:
+                UPSTREAM_LATENCY.observe(time.monotonic() - started, host=host, endpoint=endpoint, status='connection_error')
+                breaker.record_failure("erro de conexão", latency=time.monotonic() - started)
                 print(f"Erro de conexão na tentativa {attempt + 1} para {url}")
             except requests.exceptions.RequestException as e:
+                UPSTREAM_LATENCY.observe(time.monotonic() - started, host=host, endpoint=endpoint, status='error')
+                breaker.record_failure(str(e), latency=time.monotonic() - started)
                 print(f"Erro na requisição na tentativa {attempt + 1}: {e}")
                 
             if attempt < self.max_retries - 1:
-                time.sleep(1)  # Aguarda 1 segundo antes de tentar novamente
+                self._sleep_within_budget(1)  # Aguarda 1 segundo antes de tentar novamente
                 
         return None
         
+    @staticmethod
+    def _sleep_within_budget(seconds):
+        """Dorme `seconds`, sem ultrapassar o orçamento de tempo restante"""
+        budget = remaining_budget()
+        time.sleep(seconds if budget is None else min(seconds, budget))
+        
+    def fetch_many(self, calls, max_workers=None):
+        """Executa chamadas independentes do cliente em paralelo
+        
+        `calls` é uma lista de tuplas (nome_do_método, kwargs). Os resultados
+        voltam na mesma ordem; uma chamada que lançar exceção resulta em None,
+        como nos demais métodos do cliente. A latência total passa a ser a da
+        chamada mais lenta, e não a soma de todas.
+        """
+        if not calls:
+            return []
+            
+        bound_calls = [(name, getattr(self, name), kwargs or {}) for name, kwargs in calls]
+        
+        def run(call):
+            name, method, kwargs = call
+            try:
+                return method(**kwargs)
+            except Exception as e:
+                print(f"Erro em chamada paralela {name}: {e}")
+                return None
+        
+        workers = max_workers or min(len(bound_calls), MAX_CONCURRENT_REQUESTS)
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='covid19-fetch') as executor:
+            # Cada chamada roda com uma cópia do contexto atual (mantém o orçamento de tempo)
+            futures = [executor.submit(contextvars.copy_context().run, run, call) for call in bound_calls]
+            return [future.result() for future in futures]
+        
     def get_brasil_data(self):
         """Obtém dados atuais do Brasil por estado"""
         try:
             url = f"{BRASIL_IO_API_URL}/caso_full/data"
-            headers = {
-                'Authorization': f'Token {self.brasil_io_api_key}',
-                'Content-Type': 'application/json'
-            } if self.brasil_io_api_key else {}
+            headers = self._brasil_io_headers()
             
             params = {
                 'place_type': 'state', # Filtrar apenas dados de estados
@@ -68,7 +245,7 @@ class COVID19APIClient:
             if response and response.status_code == 200:
                 data = response.json()
                 if 'results' in data and data['results']:
-                    df = pd.DataFrame(data['results']) # Retorna um dataframe do Pandas com os dados gerados
+                    df = ingest_caso_full(data['results']) # Retorna um dataframe tipado e compacto
                     return df
                     
             return None
@@ -125,61 +302,172 @@ class COVID19APIClient:
             print(f"Erro ao obter dados de países específicos: {e}")
             return None
     
-    def get_brasil_historical_data(self, limit=None):
-        """Obtém dados históricos do Brasil"""
+    def _brasil_io_headers(self):
+        """Cabeçalhos de autenticação do Brasil.io (vazio sem chave)"""
+        return {
+            'Authorization': f'Token {self.brasil_io_api_key}',
+            'Content-Type': 'application/json'
+        } if self.brasil_io_api_key else {}
+    
+    def _fetch_brasil_page(self, url, params=None):
+        """Baixa uma página de /caso_full/data e retorna o JSON (ou None)"""
+        response = self._make_request(url, headers=self._brasil_io_headers(), params=params)
+        if response and response.status_code == 200:
+            return response.json()
+        return None
+    
+    def iter_brasil_pages(self, params=None, max_rows=None, prefetch=True, date_from=None, days=None):
+        """Itera sobre /caso_full/data seguindo o link `next` da paginação
+        
+        Entrega um DataFrame tipado (ver `ingest_caso_full`) por página, à
+        medida que as páginas chegam. Com
+        `prefetch=True` a próxima página é baixada em segundo plano enquanto
+        o chamador processa a atual — no máximo uma página fica adiantada,
+        então a memória usada é limitada. Para ao atingir `max_rows` linhas.
+        
+        As páginas vêm da data mais nova para a mais antiga. Com `date_from`
+        (ou `days`, que a calcula a partir da data mais nova da primeira
+        página) as linhas anteriores são descartadas e a paginação para na
+        primeira página que já alcança datas fora do período.
+        
+        Se uma página não puder ser baixada, levanta IncompletePaginationError
+        em vez de encerrar em silêncio: quem junta as páginas não deve tratar
+        (nem guardar) um resultado parcial como completo.
+        """
+        url = f"{BRASIL_IO_API_URL}/caso_full/data"
+        params = {'page_size': BRASIL_IO_PAGE_SIZE, **(params or {})}
+        date_from = pd.Timestamp(date_from) if date_from is not None else None
+        executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='covid19-page') if prefetch else None
+        
+        def schedule(page_url, page_params):
+            if executor is None:
+                return lambda: self._fetch_brasil_page(page_url, page_params)
+            return executor.submit(contextvars.copy_context().run, self._fetch_brasil_page, page_url, page_params).result
+        
         try:
-            headers = {
-                'Authorization': f'Token {self.brasil_io_api_key}',
-                'Content-Type': 'application/json'
-            } if self.brasil_io_api_key else {}
-            
-            params = {
-                'place_type': 'state'
-            }
-            if limit:
-                params['limit'] = limit
+            pending = schedule(url, params)
+            rows = 0
+            while pending is not None:
+                data = pending()
+                if data is None:
+                    raise IncompletePaginationError(f"falha ao baixar página de {url} após {rows} linhas")
+                if not data.get('results'):
+                    break
+                    
+                # Data mais antiga da página (o campo vem como texto AAAA-MM-DD, comparável como string)
+                page_dates = [row['date'] for row in data['results'] if row.get('date')]
+                if days is not None and date_from is None and page_dates:
+                    date_from = pd.Timestamp(max(page_dates)) - pd.Timedelta(days=days - 1)
+                past_window = date_from is not None and bool(page_dates) and (
+                    pd.Timestamp(min(page_dates)) < date_from
+                )
                 
-            url = f"{BRASIL_IO_API_URL}/caso_full/data"
-            response = self._make_request(url, headers=headers, params=params)
-            
-            if response and response.status_code == 200:
-                data = response.json()
-                if 'results' in data and data['results']:
-                    df = pd.DataFrame(data['results'])
-                    return df
+                # Dispara o download da próxima página antes de processar a atual
+                next_url = data.get('next')
+                needs_more = (max_rows is None or rows + len(data['results']) < max_rows) and not past_window
+                pending = schedule(next_url, None) if next_url and needs_more else None
+                
+                chunk = ingest_caso_full(data['results'])
+                if date_from is not None and 'date' in chunk.columns:
+                    chunk = chunk[chunk['date'] >= date_from]
+                if max_rows is not None:
+                    chunk = chunk.head(max_rows - rows)
+                rows += len(chunk)
+                yield chunk
+        finally:
+            if executor is not None:
+                executor.shutdown(wait=False, cancel_futures=True)
+    
+    def _read_from_store(self, state=None, days=None, date_from=None, date_to=None):
+        """Sincroniza o delta e lê a série do store local (None se indisponível)"""
+        try:
+            self.store.sync(self)
+            if days and date_from is None:
+                latest = pd.Timestamp(date_to) if date_to is not None else self.store.latest_date()
+                if latest is None:
+                    return None
+                date_from = latest - pd.Timedelta(days=days - 1)
+            df = self.store.read(state=state, date_from=date_from, date_to=date_to)
+            return df if not df.empty else None
+        except Exception as e:
+            print(f"Erro ao ler store local: {e}")
+            return None
+    
+    def get_brasil_historical_data(self, limit=None):
+        """Obtém dados históricos do Brasil (todas as páginas, até `limit` linhas)"""
+        try:
+            if self.store is not None:
+                df = self._read_from_store()
+                if df is not None:
+                    # Mantém as `limit` linhas mais recentes, como a primeira página da API
+                    return df.sort_values('date').tail(limit).reset_index(drop=True) if limit else df
                     
+            chunks = list(self.iter_brasil_pages({'place_type': 'state'}, max_rows=limit))
+            if chunks:
+                return concat_caso_full(chunks)
+                
             return None
             
         except Exception as e:
             print(f"Erro ao obter dados históricos do Brasil: {e}")
             return None
     
-    def get_brasil_time_series(self, state=None, days=30):
-        """Obtém série temporal do Brasil ou de um estado específico"""
+    def _latest_brasil_date(self, state=None, place_type='state'):
+        """Data mais recente publicada em /caso_full/data (uma página de uma linha), ou None"""
+        params = {'place_type': place_type, 'page_size': 1}
+        if state:
+            params['state'] = state
+        data = self._fetch_brasil_page(f"{BRASIL_IO_API_URL}/caso_full/data", params)
+        if data and data.get('results') and data['results'][0].get('date'):
+            return pd.Timestamp(data['results'][0]['date'])
+        return None
+    
+    def get_brasil_time_series(self, state=None, days=30, date_from=None, date_to=None):
+        """Obtém série temporal do Brasil ou de um estado específico
+        
+        O período e o estado são enviados ao Brasil.io como filtros, e a
+        página é dimensionada para caber o período inteiro (dias × estados),
+        então só as linhas pedidas trafegam. Sem `date_from`, o período são
+        os `days` dias que terminam em `date_to`. Sem nenhuma das duas datas,
+        `date_to` é a data mais recente publicada, obtida antes com uma
+        página de uma linha (ver `_latest_brasil_date`); se essa consulta
+        falhar, o período sai da data mais nova da primeira página e o
+        recorte é feito localmente.
+        """
         try:
-            headers = {
-                'Authorization': f'Token {self.brasil_io_api_key}',
-                'Content-Type': 'application/json'
-            } if self.brasil_io_api_key else {}
+            if self.store is not None:
+                df = self._read_from_store(state=state, days=days, date_from=date_from, date_to=date_to)
+                if df is not None:
+                    return df.sort_values('date').reset_index(drop=True)
+                    
+            if date_from is None and date_to is None:
+                date_to = self._latest_brasil_date(state)
+            date_to = pd.Timestamp(date_to) if date_to is not None else None
+            if date_from is not None:
+                date_from = pd.Timestamp(date_from)
+            elif date_to is not None:
+                date_from = date_to - pd.Timedelta(days=days - 1)
+            window_days = (date_to - date_from).days + 1 if date_from is not None and date_to is not None else days
             
             params = {
-                'place_type': 'state' if state else 'state'
+                'place_type': 'state',
+                'page_size': min(window_days * (1 if state else len(ESTADOS_BRASIL)), BRASIL_IO_MAX_PAGE_SIZE)
             }
             if state:
                 params['state'] = state
+            if date_from is not None:
+                params[BRASIL_IO_DATE_FROM_PARAM] = date_from.strftime('%Y-%m-%d')
+            if date_to is not None:
+                params[BRASIL_IO_DATE_TO_PARAM] = date_to.strftime('%Y-%m-%d')
                 
-            url = f"{BRASIL_IO_API_URL}/caso_full/data"
-            response = self._make_request(url, headers=headers, params=params)
-            
-            if response and response.status_code == 200:
-                data = response.json()
-                if 'results' in data and data['results']:
-                    df = pd.DataFrame(data['results'])
-                    # Ordenar por data e pegar os últimos N dias
-                    if 'date' in df.columns:
-                        df['date'] = pd.to_datetime(df['date'])
-                        df = df.sort_values('date').tail(days * len(df['state'].unique()) if not state else days)
-                    return df
+            chunks = list(self.iter_brasil_pages(params, date_from=date_from, days=days if date_from is None else None))
+            if chunks:
+                df = concat_caso_full(chunks)
+                # Recorte local do período, caso a API ignore algum filtro
+                if date_to is not None:
+                    df = df[df['date'] <= date_to]
+                if not df.empty:
+                    return df.sort_values('date', kind='stable').reset_index(drop=True)
                     
             return None
             
@@ -187,20 +475,87 @@ class COVID19APIClient:
             print(f"Erro ao obter série temporal: {e}")
             return None
     
+    def get_brasil_city_time_series(self, state, days=CITY_HISTORY_DAYS, date_from=None, date_to=None,
+                                    max_bytes=CITY_MEMORY_BUDGET_BYTES):
+        """Obtém a série temporal dos municípios de um estado, dentro de um teto de memória
+        
+        As páginas (do dia mais novo para o mais antigo) são ingeridas uma a
+        uma em frames tipados com categóricas, e o JSON de cada página é
+        descartado em seguida. Se a próxima página passaria de `max_bytes`,
+        a paginação para e o dia mais antigo (possivelmente incompleto) é
+        removido: a série fica mais curta, mas cabe no orçamento. Nesse caso
+        `df.attrs['truncated']` é True. Se uma página falhar no meio, o
+        retorno é None: uma série com buracos nunca é devolvida como completa.
+        """
+        try:
+            date_to = pd.Timestamp(date_to) if date_to is not None else None
+            date_from = pd.Timestamp(date_from) if date_from is not None else None
+            if date_from is None and date_to is not None:
+                date_from = date_to - pd.Timedelta(days=days - 1)
+                
+            params = {'place_type': 'city', 'page_size': BRASIL_IO_MAX_PAGE_SIZE}
+            if state:
+                params['state'] = state
+            if date_from is not None:
+                params[BRASIL_IO_DATE_FROM_PARAM] = date_from.strftime('%Y-%m-%d')
+            if date_to is not None:
+                params[BRASIL_IO_DATE_TO_PARAM] = date_to.strftime('%Y-%m-%d')
+                
+            chunks, used, truncated = [], 0, False
+            pages = self.iter_brasil_pages(params, date_from=date_from, days=days if date_from is None else None)
+            try:
+                for chunk in pages:
+                    size = int(chunk.memory_usage(deep=True).sum())
+                    if max_bytes and chunks and used + size > max_bytes:
+                        truncated = True
+                        break
+                    chunks.append(chunk)
+                    used += size
+            finally:
+                pages.close()  # Cancela a página adiantada
+                
+            if not chunks:
+                return None
+                
+            df = concat_caso_full(chunks)
+            if date_to is not None:
+                df = df[df['date'] <= date_to]
+            if truncated:
+                df = df[df['date'] > df['date'].min()]
+                print(f"Série de municípios de {state or 'todo o país'} limitada a "
+                      f"{df['date'].nunique()} dias para caber em {max_bytes / 2**20:.0f} MB")
+            if df.empty:
+                return None
+                
+            df = df.sort_values(['city', 'date'], kind='stable').reset_index(drop=True)
+            df.attrs['truncated'] = truncated
+            return df
+            
+        except Exception as e:
+            print(f"Erro ao obter série dos municípios: {e}")
+            return None
+    
     def calculate_moving_averages(self, df, window=7):
-        """Calcula médias móveis para os dados"""
+        """Calcula médias móveis por estado (ver data_processor.calculate_moving_averages)
+        
+        Mantém as colunas `ma_cases`/`ma_deaths` com a janela pedida, além das
+        colunas `ma_cases_<janela>`/`ma_deaths_<janela>` de MOVING_AVERAGE_WINDOWS.
+        """
         try:
             if df is None or df.empty:
                 return df
                 
+            windows = sorted(set(MOVING_AVERAGE_WINDOWS) | {window})
+            df = calculate_moving_averages(df, windows=windows)
+            
             # Calcular médias móveis para casos e óbitos
             if 'new_confirmed' in df.columns:
-                df['ma_cases'] = df['new_confirmed'].rolling(window=window, min_periods=1).mean()
+                df['ma_cases'] = df[moving_average_column('new_confirmed', window)]
             if 'new_deaths' in df.columns:
-                df['ma_deaths'] = df['new_deaths'].rolling(window=window, min_periods=1).mean()
+                df['ma_deaths'] = df[moving_average_column('new_deaths', window)]
                 
             return df
             
         except Exception as e:
             print(f"Erro ao calcular médias móveis: {e}")
-            return df
\ No newline at end of file
+            return df
@@ -0,0 +1,141 @@
+# Séries por município (place_type=city) carregadas por estado, sob um teto de memória
+
+import contextvars
+import threading
+import time
+from collections import OrderedDict
+
+from src.data.api_client import COVID19APIClient
+from src.data.data_processor import stamp_data_version
+from src.data.metrics import record_cache
+from src.data.resilience import deadline
+from src.data.single_flight import SingleFlight
+from src.utils.constants import (
+    CITY_FAILURE_TTL, CITY_HISTORY_DAYS, CITY_MEMORY_BUDGET_BYTES, REFRESH_DEADLINE_SECONDS, UPDATE_INTERVAL
+)
+from src.utils.tracing import span
+
+_shared_city_data = None
+_shared_city_data_lock = threading.Lock()
+
+
+def frame_bytes(df):
+    """Memória de um DataFrame em bytes (categóricas contam as categorias uma vez)."""
+    return int(df.memory_usage(deep=True).sum())
+
+
+class CityData:
+    """Cache LRU das séries de municípios por estado, limitado pelo total de bytes.
+
+    Selecionar um estado carrega só os municípios dele; os estados vistos
+    recentemente ficam em memória até que a soma passe de `max_bytes`, quando
+    os menos usados são descartados. Cada série também é carregada com esse
+    teto (ver `COVID19APIClient.get_brasil_city_time_series`), então um único
+    estado nunca ocupa mais que o orçamento inteiro. Sessões que pedem o mesmo
+    estado ao mesmo tempo compartilham uma única carga.
+
+    A carga roda com o orçamento das atualizações em segundo plano
+    (REFRESH_DEADLINE_SECONDS), não com o do render: um estado grande pede
+    dezenas de páginas e, cortado no meio, viraria uma série incompleta.
+    Uma carga que falha (ou estoura esse orçamento) não é repetida por
+    `failure_ttl` segundos: os reruns seguintes servem a série anterior,
+    ou None, sem esperar outra vez pela API.
+    """
+
+    def __init__(self, max_bytes=CITY_MEMORY_BUDGET_BYTES, days=CITY_HISTORY_DAYS, ttl=UPDATE_INTERVAL / 1000,
+                 client_factory=COVID19APIClient, clock=time.monotonic, failure_ttl=CITY_FAILURE_TTL):
+        self.max_bytes = max_bytes
+        self.days = days
+        self.ttl = ttl
+        self.failure_ttl = failure_ttl
+        self.client_factory = client_factory
+        self.clock = clock
+        self.total_bytes = 0
+        self._entries = OrderedDict()  # estado -> (DataFrame, bytes, carregado_em)
+        self._failures = {}  # estado -> horário da última carga que falhou
+        self._version = 0
+        self._lock = threading.Lock()
+        self._flights = SingleFlight()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, state):
+        """Série dos municípios de `state` (do cache enquanto não expirar) ou None.
+
+        Se a recarga falhar, a série anterior continua sendo servida.
+        """
+        with self._lock:
+            entry = self._entries.get(state)
+            if entry is not None:
+                self._entries.move_to_end(state)
+            failed_at = self._failures.get(state)
+        now = self.clock()
+        fresh = entry is not None and now - entry[2] < self.ttl
+        record_cache("cities", fresh)
+        if fresh:
+            return entry[0]
+        if failed_at is not None and now - failed_at < self.failure_ttl:
+            return entry[0] if entry is not None else None
+
+        with span(f"municipios:{state}", kind="network"):
+            # Contexto limpo: sem o orçamento de rede do render em andamento
+            df = self._flights.do(state, lambda: contextvars.Context().run(self._load, state))
+        if df is None:
+            return entry[0] if entry is not None else None
+        return df
+
+    def _load(self, state):
+        try:
+            with deadline(REFRESH_DEADLINE_SECONDS):
+                df = self.client_factory().get_brasil_city_time_series(state, days=self.days, max_bytes=self.max_bytes)
+        except Exception:
+            self._mark_failure(state)
+            raise
+        if df is None or df.empty:
+            self._mark_failure(state)
+            return None
+
+        with self._lock:
+            self._failures.pop(state, None)
+            self._version += 1
+            stamp_data_version(df, f"city:{state}:{self._version}")
+            self._store(state, df)
+        return df
+
+    def _mark_failure(self, state):
+        with self._lock:
+            self._failures[state] = self.clock()
+
+    def _store(self, state, df):
+        size = frame_bytes(df)
+        previous = self._entries.pop(state, None)
+        if previous is not None:
+            self.total_bytes -= previous[1]
+        self._entries[state] = (df, size, self.clock())
+        self.total_bytes += size
+        # Nunca descarta a série recém-carregada, mesmo que sozinha ocupe o orçamento
+        while len(self._entries) > 1 and self.total_bytes > self.max_bytes:
+            _, (_, evicted_size, _) = self._entries.popitem(last=False)
+            self.total_bytes -= evicted_size
+
+    def states(self):
+        """Estados em memória, do menos para o mais usado recentemente."""
+        with self._lock:
+            return list(self._entries)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._failures.clear()
+            self.total_bytes = 0
+
+
+def get_shared_city_data():
+    """Retorna o cache de municípios único do processo."""
+    global _shared_city_data
+    if _shared_city_data is None:
+        with _shared_city_data_lock:
+            if _shared_city_data is None:
+                _shared_city_data = CityData()
+    return _shared_city_data
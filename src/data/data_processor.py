@@ -1,8 +1,30 @@
 # Funções de processamento e transformação de dados
 
+import threading
+from collections import OrderedDict
+
+import numpy as np
 import pandas as pd
 
+from src.data.ingestion import concat_caso_full
+from src.utils.constants import MOVING_AVERAGE_WINDOWS, REGIOES_BRASIL
+from src.utils.tracing import traced
+
+# Colunas de origem das médias móveis e prefixo das colunas geradas
+MOVING_AVERAGE_SOURCES = {"new_confirmed": "ma_cases", "new_deaths": "ma_deaths"}
+
+# Indicadores derivados adicionados por enrich_state_metrics
+DERIVED_COLUMNS = ["taxa_mortalidade", "incidencia_100k", "mortalidade_100k", "regiao"]
+
+# Estado -> região, para o mapeamento vetorizado
+STATE_TO_REGION = {state: regiao for regiao, states in REGIOES_BRASIL.items() for state in states}
 
+_ENRICH_CACHE_SIZE = 8
+_enrich_cache = OrderedDict()
+_enrich_cache_lock = threading.Lock()
+
+
+@traced(kind="pandas")
 def calculate_totals(df):
     """Calcula os totais de casos e óbitos a partir de um DataFrame de estados.
 
@@ -51,6 +73,7 @@ def calculate_mortality_rate(total_cases, total_deaths):
     return round((total_deaths / total_cases) * 100, 2)
 
 
+@traced(kind="pandas")
 def get_top_states(df, column, n=5):
     """Retorna os N estados com maiores valores em uma coluna específica.
 
@@ -73,3 +96,323 @@ def get_top_states(df, column, n=5):
         return pd.DataFrame()
 
     return df.nlargest(n, column).reset_index(drop=True)
+
+
+@traced(kind="pandas")
+def latest_city_snapshot(df):
+    """Última linha de cada município de uma série por cidade (place_type=city).
+
+    Parâmetros:
+    -----------
+    df : pandas.DataFrame | None
+        Série com `state`, `city` e `date` (ex.: `get_brasil_city_time_series`).
+
+    Retorna:
+    --------
+    pandas.DataFrame | None
+        Uma linha por (estado, município), ordenada por casos confirmados de
+        forma decrescente. Retorna df inalterado se for None/vazio.
+    """
+    if df is None or df.empty:
+        return df
+
+    latest = df.groupby(["state", "city"], observed=True, sort=False)["date"].idxmax()
+    snapshot = df.loc[latest.to_numpy()]
+    if "last_available_confirmed" in snapshot.columns:
+        snapshot = snapshot.sort_values("last_available_confirmed", ascending=False, kind="stable")
+    return snapshot.reset_index(drop=True)
+
+
+def moving_average_column(source, window):
+    """Nome da coluna de média móvel gerada para uma coluna de origem.
+
+    Exemplo: moving_average_column("new_confirmed", 14) -> "ma_cases_14".
+    """
+    return f"{MOVING_AVERAGE_SOURCES.get(source, source)}_{window}"
+
+
+@traced(kind="pandas")
+def calculate_moving_averages(df, windows=MOVING_AVERAGE_WINDOWS, group_col="state"):
+    """Calcula médias móveis por grupo (estado) para várias janelas de uma vez.
+
+    As linhas são ordenadas por (grupo, data) e todas as janelas saem de uma
+    única soma acumulada vetorizada: a média de uma janela é a diferença
+    entre duas posições da soma acumulada dividida pela quantidade de valores
+    válidos nela. A janela nunca ultrapassa a fronteira entre estados e, como
+    em `rolling(min_periods=1)`, os primeiros dias usam os valores disponíveis.
+
+    Parâmetros:
+    -----------
+    df : pandas.DataFrame | None
+        Série temporal com `new_confirmed` e/ou `new_deaths`.
+    windows : iterable[int]
+        Janelas em dias (padrão MOVING_AVERAGE_WINDOWS).
+    group_col : str
+        Coluna que separa as séries (padrão "state").
+
+    Retorna:
+    --------
+    pandas.DataFrame
+        Cópia ordenada por (grupo, data) com uma coluna `ma_cases_<janela>` e
+        `ma_deaths_<janela>` por janela. Retorna df inalterado se for None/vazio.
+    """
+    if df is None or df.empty:
+        return df
+
+    sort_cols = [col for col in (group_col, "date") if col in df.columns]
+    df = df.sort_values(sort_cols, kind="stable").reset_index(drop=True) if sort_cols else df.copy()
+
+    if group_col in df.columns:
+        position = df.groupby(group_col, observed=True, sort=False).cumcount().to_numpy()
+    else:
+        position = np.arange(len(df))
+    end = np.arange(1, len(df) + 1)
+
+    for source in MOVING_AVERAGE_SOURCES:
+        if source not in df.columns:
+            continue
+
+        values = pd.to_numeric(df[source], errors="coerce").to_numpy(dtype="float64")
+        valid = ~np.isnan(values)
+        sums = np.concatenate(([0.0], np.cumsum(np.where(valid, values, 0.0))))
+        counts = np.concatenate(([0], np.cumsum(valid)))
+
+        for window in windows:
+            start = end - np.minimum(position + 1, window)
+            n_valid = counts[end] - counts[start]
+            with np.errstate(invalid="ignore", divide="ignore"):
+                mean = (sums[end] - sums[start]) / n_valid
+            df[moving_average_column(source, window)] = np.where(n_valid > 0, mean, np.nan)
+
+    return df
+
+
+@traced(kind="pandas")
+def update_moving_averages(df_with_ma, new_rows, windows=MOVING_AVERAGE_WINDOWS, group_col="state"):
+    """Anexa dias novos a uma série que já tem médias móveis, sem recalcular tudo.
+
+    Só as novas linhas são calculadas, usando como contexto os últimos
+    `max(windows) - 1` dias de cada grupo já processado. O resultado é igual
+    ao de `calculate_moving_averages` sobre a série completa, desde que as
+    datas novas sejam posteriores às existentes em cada grupo.
+
+    Parâmetros:
+    -----------
+    df_with_ma : pandas.DataFrame
+        Saída anterior de `calculate_moving_averages`.
+    new_rows : pandas.DataFrame
+        Linhas novas (sem médias móveis).
+    windows : iterable[int]
+        Mesmas janelas usadas no cálculo original.
+    group_col : str
+        Coluna que separa as séries (padrão "state").
+
+    Retorna:
+    --------
+    pandas.DataFrame
+        Série completa, ordenada por (grupo, data), com as médias das novas linhas.
+    """
+    if new_rows is None or new_rows.empty:
+        return df_with_ma
+    if df_with_ma is None or df_with_ma.empty:
+        return calculate_moving_averages(new_rows, windows, group_col)
+
+    context_size = max(windows) - 1
+    context = df_with_ma.groupby(group_col, observed=True, sort=False).tail(context_size)
+    context = context[[col for col in new_rows.columns if col in context.columns]]
+
+    marker = "_is_new_row"
+    combined = concat_caso_full([context.assign(**{marker: False}), new_rows.assign(**{marker: True})])
+    computed = calculate_moving_averages(combined, windows, group_col)
+    appended = computed[computed[marker]].drop(columns=marker)
+
+    merged = concat_caso_full([df_with_ma, appended])
+    sort_cols = [col for col in (group_col, "date") if col in merged.columns]
+    return merged.sort_values(sort_cols, kind="stable").reset_index(drop=True)
+
+
+def _same_rows(old, new, group_col):
+    """Indica se dois recortes da série têm as mesmas linhas de origem das médias."""
+    cols = [col for col in (group_col, "date", *MOVING_AVERAGE_SOURCES) if col in new.columns]
+    if len(old) != len(new) or any(col not in old.columns for col in cols):
+        return False
+    keys = [col for col in (group_col, "date") if col in cols]
+    old = old[cols].sort_values(keys, kind="stable").reset_index(drop=True)
+    new = new[cols].sort_values(keys, kind="stable").reset_index(drop=True)
+    return old.equals(new)
+
+
+@traced(kind="pandas")
+def refresh_moving_averages(previous_series, previous_ma, series, windows=MOVING_AVERAGE_WINDOWS, group_col="state"):
+    """Médias móveis de `series` reaproveitando as calculadas para a série anterior.
+
+    Pensado para a atualização periódica de uma janela deslizante (ex.: os
+    últimos 90 dias): se os dias em comum com `previous_series` não mudaram,
+    os dias que saíram da janela são descartados, só os dias novos são
+    calculados (`update_moving_averages`) e os primeiros dias de cada grupo,
+    que perderam o contexto anterior, são recalculados. O resultado é igual
+    ao de `calculate_moving_averages(series)`. Qualquer diferença nos dias em
+    comum (ex.: correção retroativa na fonte) leva ao cálculo completo.
+
+    Parâmetros:
+    -----------
+    previous_series : pandas.DataFrame | None
+        Série usada no cálculo anterior.
+    previous_ma : pandas.DataFrame | None
+        Saída anterior de `calculate_moving_averages(previous_series, windows, group_col)`.
+    series : pandas.DataFrame | None
+        Série atual.
+    windows : iterable[int]
+        Mesmas janelas usadas no cálculo anterior.
+    group_col : str
+        Coluna que separa as séries (padrão "state").
+
+    Retorna:
+    --------
+    pandas.DataFrame
+        Como `calculate_moving_averages(series, windows, group_col)`.
+    """
+    if (series is None or series.empty or previous_series is None or previous_series.empty
+            or previous_ma is None or previous_ma.empty or "date" not in series.columns):
+        return calculate_moving_averages(series, windows, group_col)
+
+    first, last = series["date"].min(), previous_series["date"].max()
+    if not _same_rows(previous_series[previous_series["date"] >= first], series[series["date"] <= last], group_col):
+        return calculate_moving_averages(series, windows, group_col)
+
+    kept = previous_ma[previous_ma["date"] >= first].reset_index(drop=True)
+    result = update_moving_averages(kept, series[series["date"] > last], windows, group_col)
+
+    # Os primeiros dias de cada grupo perderam o contexto anterior a `first`: só eles são recalculados
+    head = result.groupby(group_col, observed=True, sort=False).head(max(windows) - 1)
+    recomputed = calculate_moving_averages(head, windows, group_col)
+    ma_cols = [moving_average_column(source, window) for source in MOVING_AVERAGE_SOURCES for window in windows]
+    ma_cols = [col for col in ma_cols if col in recomputed.columns]
+    result.loc[head.index, ma_cols] = recomputed[ma_cols].to_numpy()
+    return result
+
+
+def stamp_data_version(df, version):
+    """Marca um DataFrame com a versão do snapshot de dados que o originou.
+
+    A marca fica em `df.attrs` e é usada por `data_version` para evitar
+    recalcular o hash do conteúdo a cada rerun.
+    """
+    if df is not None:
+        df.attrs["data_version"] = str(version)
+    return df
+
+
+def _ordered_hash(hashes):
+    """Combina hashes por linha levando a posição em conta (reordenar muda o resultado)."""
+    hashes = np.asarray(hashes, dtype="uint64")
+    weights = np.arange(1, 2 * len(hashes), 2, dtype="uint64")
+    return int((hashes * weights).sum()) & 0xFFFFFFFFFFFF
+
+
+def _rows_fingerprint(df, sample_size=64):
+    """Impressão barata de quais linhas o frame contém e em que ordem.
+
+    Combina o índice (O(1) para um RangeIndex) com o hash de até
+    `sample_size` linhas espaçadas — o suficiente para distinguir recortes
+    do mesmo snapshot sem recalcular o hash do conteúdo inteiro.
+    """
+    index = df.index
+    if isinstance(index, pd.RangeIndex):
+        index_part = f"r{index.start}.{index.stop}.{index.step}"
+    else:
+        index_part = f"i{_ordered_hash(pd.util.hash_pandas_object(index, index=False)):x}"
+    positions = np.unique(np.linspace(0, len(df) - 1, min(len(df), sample_size)).astype(int))
+    sample = pd.util.hash_pandas_object(df.iloc[positions], index=False)
+    return f"{index_part}:{_ordered_hash(sample):x}"
+
+
+def data_version(df):
+    """Identificador estável do conteúdo de um DataFrame.
+
+    Usa a marca de `stamp_data_version` quando existir, combinada com o
+    número de linhas, as colunas e uma impressão das linhas (índice + amostra
+    do conteúdo) — `attrs` é herdado por filtros e cópias, então recortes do
+    mesmo snapshot, mesmo do mesmo tamanho, recebem versões diferentes. Sem
+    marca, calcula um hash vetorizado do conteúdo.
+
+    Retorna:
+    --------
+    str
+        Versão do DataFrame ("empty" para None/vazio).
+    """
+    if df is None or df.empty:
+        return "empty"
+
+    stamp = df.attrs.get("data_version")
+    if stamp is not None:
+        return f"{stamp}:{len(df)}:{hash(tuple(df.columns))}:{_rows_fingerprint(df)}"
+
+    content_hash = int(pd.util.hash_pandas_object(df, index=False).sum()) & 0xFFFFFFFFFFFF
+    return f"h{content_hash:x}:{hash(tuple(df.columns))}"
+
+
+def _safe_ratio(numerator, denominator, scale):
+    """numerator / denominator * scale, com 0 onde o denominador é 0 ou ausente."""
+    num = pd.to_numeric(numerator, errors="coerce").to_numpy(dtype="float64")
+    den = pd.to_numeric(denominator, errors="coerce").to_numpy(dtype="float64")
+    with np.errstate(invalid="ignore", divide="ignore"):
+        ratio = num / den * scale
+    return np.where((den > 0) & np.isfinite(ratio), ratio, 0.0)
+
+
+@traced(kind="pandas")
+def enrich_state_metrics(df):
+    """Adiciona os indicadores derivados usados pelas visualizações.
+
+    Colunas calculadas (todas vetorizadas):
+    - taxa_mortalidade: óbitos / casos * 100;
+    - incidencia_100k: casos por 100 mil habitantes (usa a coluna da API
+      `last_available_confirmed_per_100k_inhabitants` quando existir);
+    - mortalidade_100k: óbitos por 100 mil habitantes;
+    - regiao: região do estado (categórica).
+
+    O resultado é memorizado por `data_version`, então cada versão dos dados
+    é enriquecida uma única vez por processo. Trate o retorno como somente
+    leitura (faça `.copy()` antes de alterar).
+
+    Parâmetros:
+    -----------
+    df : pandas.DataFrame | None
+        DataFrame de estados com `last_available_confirmed` e `last_available_deaths`.
+
+    Retorna:
+    --------
+    pandas.DataFrame | None
+        DataFrame com as colunas de DERIVED_COLUMNS (o próprio df se for None/vazio).
+    """
+    if df is None or df.empty or all(col in df.columns for col in DERIVED_COLUMNS):
+        return df
+
+    key = data_version(df)
+    with _enrich_cache_lock:
+        if key in _enrich_cache:
+            _enrich_cache.move_to_end(key)
+            return _enrich_cache[key]
+
+    enriched = df.copy()
+    confirmed = enriched.get("last_available_confirmed", pd.Series(0, index=enriched.index))
+    deaths = enriched.get("last_available_deaths", pd.Series(0, index=enriched.index))
+    population = enriched.get("estimated_population", pd.Series(np.nan, index=enriched.index))
+
+    enriched["taxa_mortalidade"] = _safe_ratio(deaths, confirmed, 100)
+    if "last_available_confirmed_per_100k_inhabitants" in enriched.columns:
+        enriched["incidencia_100k"] = pd.to_numeric(
+            enriched["last_available_confirmed_per_100k_inhabitants"], errors="coerce"
+        ).fillna(0).astype("float64")
+    else:
+        enriched["incidencia_100k"] = _safe_ratio(confirmed, population, 100000)
+    enriched["mortalidade_100k"] = _safe_ratio(deaths, population, 100000)
+    if "state" in enriched.columns:
+        enriched["regiao"] = enriched["state"].astype("object").map(STATE_TO_REGION).astype("category")
+
+    with _enrich_cache_lock:
+        _enrich_cache[key] = enriched
+        while len(_enrich_cache) > _ENRICH_CACHE_SIZE:
+            _enrich_cache.popitem(last=False)
+    return enriched
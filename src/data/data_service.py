@@ -0,0 +1,214 @@
+# Serviço de dados compartilhado pelo processo, com atualização em segundo plano
+
+import threading
+import time
+
+import pandas as pd
+
+from src.data.api_client import COVID19APIClient
+from src.data.data_processor import enrich_state_metrics, refresh_moving_averages, stamp_data_version
+from src.data.metrics import DATA_AGE, LAST_REFRESH_SUCCESS, REFRESH_SECONDS, REGISTRY
+from src.data.resilience import deadline
+from src.utils.constants import REFRESH_DEADLINE_SECONDS, UPDATE_INTERVAL, WORLD_SNAPSHOT_LIMIT
+
+
+class Snapshot:
+    """Última versão bem-sucedida de um conjunto de dados."""
+
+    def __init__(self, data, version, fetched_at):
+        self.data = data
+        self.version = version
+        self.fetched_at = fetched_at  # time.time() do fim da atualização
+
+    @property
+    def age(self):
+        """Idade do snapshot em segundos."""
+        return time.time() - self.fetched_at
+
+
+def load_brasil(client, snapshots):
+    """Dados atuais por estado, já com os indicadores derivados."""
+    return enrich_state_metrics(client.get_brasil_data())
+
+
+def load_world(client, snapshots):
+    """Todos os países (exceto Brasil) ordenados por casos."""
+    return client.get_world_top_countries(limit=WORLD_SNAPSHOT_LIMIT)
+
+
+def load_analises(client, snapshots):
+    """Dados da página de Análises Avançadas, buscados em paralelo.
+
+    Os dados atuais por estado vêm do snapshot 'brasil', atualizado antes
+    no mesmo ciclo (ver a ordem de DEFAULT_LOADERS), sem uma segunda
+    chamada ao Brasil.io. As médias móveis reaproveitam as do snapshot
+    anterior: a cada atualização só os dias novos da janela de 90 dias são
+    calculados (ver `refresh_moving_averages`).
+    """
+    brasil_data = snapshots.get('brasil')
+    historical_data, time_series_data = client.fetch_many([
+        ('get_brasil_historical_data', {'limit': 2000}),
+        ('get_brasil_time_series', {'days': 90}),
+    ])
+    if brasil_data is None and time_series_data is None:
+        return None
+    previous_series, previous_ma = snapshots['analises'][2:] if 'analises' in snapshots else (None, None)
+    return (
+        brasil_data,
+        historical_data,
+        time_series_data,
+        refresh_moving_averages(previous_series, previous_ma, time_series_data),
+    )
+
+
+# Ordem de atualização: 'analises' usa o snapshot 'brasil' do mesmo ciclo
+DEFAULT_LOADERS = {
+    'brasil': load_brasil,
+    'world': load_world,
+    'analises': load_analises,
+}
+
+
+class DataService:
+    """Mantém snapshots dos dados em memória e os atualiza em uma thread própria.
+
+    Leitores nunca esperam pela rede: `get` devolve o último snapshot bom
+    enquanto a atualização seguinte acontece em segundo plano
+    (stale-while-revalidate). Uma atualização que falha mantém o snapshot
+    anterior e registra o erro em `status()`.
+
+    Parâmetros:
+    -----------
+    loaders : dict[str, callable] | None
+        Nome do conjunto -> função `loader(client, snapshots)` que retorna os
+        dados (None indica falha). `snapshots` traz os dados atuais de cada
+        conjunto já carregado (somente leitura), inclusive o anterior do
+        próprio conjunto. Padrão: DEFAULT_LOADERS.
+    interval : float
+        Segundos entre atualizações (padrão UPDATE_INTERVAL).
+    client_factory : callable
+        Cria o cliente de API usado pelos loaders.
+    """
+
+    def __init__(self, loaders=None, interval=UPDATE_INTERVAL / 1000, client_factory=COVID19APIClient):
+        self.loaders = dict(loaders or DEFAULT_LOADERS)
+        self.interval = interval
+        self.client_factory = client_factory
+        self._snapshots = {}
+        self._errors = {}
+        self._version = 0
+        self._lock = threading.Lock()
+        self._ready = {name: threading.Event() for name in self.loaders}
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        """Inicia a thread de atualização (a primeira carga começa imediatamente)."""
+        if self._thread is None or not self._thread.is_alive():
+            REGISTRY.register_collector(self._collect_metrics)
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name='covid19-data-service', daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self, timeout=None):
+        """Sinaliza a parada da thread e aguarda seu término."""
+        self._stop.set()
+        REGISTRY.unregister_collector(self._collect_metrics)
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.refresh()
+            self._stop.wait(self.interval)
+
+    def refresh(self, name=None):
+        """Atualiza um conjunto (ou todos) de forma síncrona.
+
+        Retorna:
+        --------
+        bool
+            True se todos os conjuntos pedidos foram atualizados com sucesso.
+        """
+        names = [name] if name else list(self.loaders)
+        client = self.client_factory()
+        ok = True
+        for current in names:
+            started = time.perf_counter()
+            try:
+                with self._lock:
+                    snapshots = {key: snapshot.data for key, snapshot in self._snapshots.items()}
+                with deadline(REFRESH_DEADLINE_SECONDS):  # Um host lento não trava as demais cargas
+                    data = self.loaders[current](client, snapshots)
+                if data is None or (isinstance(data, pd.DataFrame) and data.empty):
+                    raise ValueError('loader não retornou dados')
+            except Exception as e:
+                print(f"Erro ao atualizar '{current}' (mantendo snapshot anterior): {e}")
+                REFRESH_SECONDS.observe(time.perf_counter() - started, dataset=current, result='error')
+                with self._lock:
+                    self._errors[current] = str(e)
+                ok = False
+                continue
+            REFRESH_SECONDS.observe(time.perf_counter() - started, dataset=current, result='ok')
+
+            with self._lock:
+                self._version += 1
+                data = self._stamp(data, f"{current}-{self._version}")
+                self._snapshots[current] = Snapshot(data, self._version, time.time())
+                self._errors.pop(current, None)
+            LAST_REFRESH_SUCCESS.set(self._snapshots[current].fetched_at, dataset=current)
+            self._ready[current].set()
+        return ok
+
+    @staticmethod
+    def _stamp(data, version):
+        """Marca os DataFrames do snapshot com a versão (em cópias rasas, sem copiar dados)."""
+        if isinstance(data, tuple):
+            return tuple(DataService._stamp(item, version) for item in data)
+        if isinstance(data, pd.DataFrame):
+            return stamp_data_version(data.copy(deep=False), version)
+        return data
+
+    def get(self, name, wait=0):
+        """Retorna o snapshot mais recente de um conjunto, sem tocar na rede.
+
+        Parâmetros:
+        -----------
+        name : str
+            Nome do conjunto (ex.: 'brasil', 'world', 'analises').
+        wait : float
+            Segundos a aguardar pela primeira carga, quando ainda não há
+            nenhum snapshot (só acontece logo após o processo iniciar).
+
+        Retorna:
+        --------
+        Snapshot | None
+            Snapshot (tratar `data` como somente leitura) ou None se ainda não
+            houver dados.
+        """
+        snapshot = self._snapshots.get(name)
+        if snapshot is None and wait and name in self._ready:
+            self._ready[name].wait(wait)
+            snapshot = self._snapshots.get(name)
+        return snapshot
+
+    def _collect_metrics(self):
+        """Atualiza a idade de cada snapshot na hora em que as métricas são lidas."""
+        with self._lock:
+            snapshots = list(self._snapshots.items())
+        for name, snapshot in snapshots:
+            DATA_AGE.set(round(snapshot.age, 3), dataset=name)
+
+    def status(self):
+        """Versão, idade (s) e último erro de cada conjunto, para diagnóstico."""
+        with self._lock:
+            return {
+                name: {
+                    'version': self._snapshots[name].version if name in self._snapshots else None,
+                    'age': round(self._snapshots[name].age, 1) if name in self._snapshots else None,
+                    'error': self._errors.get(name),
+                }
+                for name in self.loaders
+            }
+
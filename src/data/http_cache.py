@@ -0,0 +1,132 @@
+# Cache de respostas HTTP com validadores (ETag / Last-Modified) e despejo LRU
+
+import json
+import threading
+from collections import OrderedDict
+
+from src.utils.constants import RESPONSE_CACHE_MAX_BYTES, RESPONSE_CACHE_MAX_ENTRIES
+
+_shared_cache = None
+_shared_cache_lock = threading.Lock()
+
+
+class CachedResponse:
+    """Resposta guardada no cache, com a mesma interface usada de `requests.Response`.
+
+    O JSON é decodificado uma única vez; respostas 304 posteriores reaproveitam
+    o objeto já decodificado em vez de transferir e decodificar o corpo de novo.
+    """
+
+    def __init__(self, url, content, headers, encoding=None):
+        self.url = url
+        self.status_code = 200
+        self.content = content
+        self.headers = dict(headers)
+        self.encoding = encoding or "utf-8"
+        self.from_cache = False
+        self._payload = None
+        self._parsed = False
+        self._lock = threading.Lock()
+
+    @property
+    def text(self):
+        return self.content.decode(self.encoding, errors="replace")
+
+    def json(self):
+        """Retorna o JSON decodificado (compartilhado; trate como somente leitura)."""
+        if not self._parsed:
+            with self._lock:
+                if not self._parsed:
+                    self._payload = json.loads(self.content)
+                    self._parsed = True
+        return self._payload
+
+
+class ResponseCache:
+    """Cache LRU de respostas limitado por quantidade de entradas e por bytes.
+
+    Só guarda respostas que trazem `ETag` ou `Last-Modified`, pois são as
+    únicas que podem ser revalidadas com uma requisição condicional.
+    """
+
+    def __init__(self, max_entries=RESPONSE_CACHE_MAX_ENTRIES, max_bytes=RESPONSE_CACHE_MAX_BYTES):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(url, params=None):
+        """Chave do cache: URL + parâmetros em ordem estável."""
+        return url, tuple(sorted((str(k), str(v)) for k, v in (params or {}).items()))
+
+    def __len__(self):
+        return len(self._entries)
+
+    def conditional_headers(self, key):
+        """Cabeçalhos If-None-Match / If-Modified-Since para a chave (vazio se não houver entrada)."""
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is None:
+            return {}
+
+        headers = {}
+        if entry.headers.get("ETag"):
+            headers["If-None-Match"] = entry.headers["ETag"]
+        if entry.headers.get("Last-Modified"):
+            headers["If-Modified-Since"] = entry.headers["Last-Modified"]
+        return headers
+
+    def get(self, key):
+        """Retorna a resposta guardada (marcando-a como usada recentemente) ou None."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                entry.from_cache = True
+            return entry
+
+    def store(self, key, response):
+        """Guarda uma resposta 200 que tenha validadores.
+
+        Retorna:
+        --------
+        CachedResponse | requests.Response
+            A entrada criada no cache, ou a própria resposta se ela não puder
+            ser revalidada (sem validadores) ou for maior que o limite de bytes.
+        """
+        headers = response.headers
+        if not (headers.get("ETag") or headers.get("Last-Modified")):
+            return response
+
+        content = response.content
+        if len(content) > self.max_bytes:
+            return response
+
+        entry = CachedResponse(response.url, content, headers, response.encoding)
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.total_bytes -= len(previous.content)
+            self._entries[key] = entry
+            self.total_bytes += len(content)
+            while self._entries and (len(self._entries) > self.max_entries or self.total_bytes > self.max_bytes):
+                _, evicted = self._entries.popitem(last=False)
+                self.total_bytes -= len(evicted.content)
+        return entry
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.total_bytes = 0
+
+
+def get_shared_response_cache():
+    """Retorna o cache de respostas único do processo."""
+    global _shared_cache
+    if _shared_cache is None:
+        with _shared_cache_lock:
+            if _shared_cache is None:
+                _shared_cache = ResponseCache()
+    return _shared_cache
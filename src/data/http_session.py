@@ -0,0 +1,69 @@
+# Sessão HTTP compartilhada com pool de conexões (keep-alive)
+
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from src.utils.constants import HTTP_POOL_BLOCK, HTTP_POOL_CONNECTIONS, HTTP_POOL_MAXSIZE
+
+_shared_session = None
+_shared_session_lock = threading.Lock()
+
+
+def create_session(pool_connections=HTTP_POOL_CONNECTIONS, pool_maxsize=HTTP_POOL_MAXSIZE,
+                   pool_block=HTTP_POOL_BLOCK):
+    """Cria uma sessão HTTP com pool de conexões persistentes.
+
+    Parâmetros:
+    -----------
+    pool_connections : int
+        Quantidade de hosts distintos cujos pools ficam em memória.
+    pool_maxsize : int
+        Máximo de conexões abertas simultaneamente para um mesmo host.
+    pool_block : bool
+        Se True, requisições além de `pool_maxsize` aguardam uma conexão livre
+        em vez de abrir conexões descartáveis — funciona como limite por host.
+
+    Retorna:
+    --------
+    requests.Session
+        Sessão com o mesmo adaptador montado para http:// e https://.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=pool_connections,
+        pool_maxsize=pool_maxsize,
+        pool_block=pool_block,
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def get_shared_session():
+    """Retorna a sessão HTTP única do processo, criando-a na primeira chamada.
+
+    Todas as instâncias de `COVID19APIClient` (e, portanto, todas as sessões
+    do Streamlit no mesmo processo) reutilizam as conexões TCP/TLS abertas.
+
+    Retorna:
+    --------
+    requests.Session
+        Sessão compartilhada.
+    """
+    global _shared_session
+    if _shared_session is None:
+        with _shared_session_lock:
+            if _shared_session is None:
+                _shared_session = create_session()
+    return _shared_session
+
+
+def reset_shared_session():
+    """Fecha e descarta a sessão compartilhada; a próxima chamada cria outra."""
+    global _shared_session
+    with _shared_session_lock:
+        if _shared_session is not None:
+            _shared_session.close()
+        _shared_session = None
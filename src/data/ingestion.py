@@ -0,0 +1,137 @@
+# Ingestão tipada e compacta dos dados do Brasil.io (caso_full)
+
+import pandas as pd
+
+# Colunas de /caso_full/data usadas pelo cliente e pelas visualizações
+CASO_FULL_COLUMNS = [
+    "state",
+    "city",
+    "city_ibge_code",
+    "place_type",
+    "date",
+    "is_last",
+    "estimated_population",
+    "last_available_confirmed",
+    "last_available_deaths",
+    "last_available_confirmed_per_100k_inhabitants",
+    "last_available_death_rate",
+    "new_confirmed",
+    "new_deaths",
+]
+
+# Colunas com poucos valores distintos: viram categóricas
+CATEGORICAL_COLUMNS = ["state", "city", "place_type"]
+
+# Contagens (e o código IBGE): reduzidas ao menor inteiro que comporta os valores
+COUNT_COLUMNS = [
+    "city_ibge_code",
+    "estimated_population",
+    "last_available_confirmed",
+    "last_available_deaths",
+    "new_confirmed",
+    "new_deaths",
+]
+
+# Taxas: float32 já tem precisão de sobra para exibição
+RATE_COLUMNS = [
+    "last_available_confirmed_per_100k_inhabitants",
+    "last_available_death_rate",
+]
+
+DATE_FORMAT = "%Y-%m-%d"
+
+
+def _downcast_counts(series):
+    """Converte contagens para o menor inteiro seguro.
+
+    Colunas com valores ausentes ou não inteiros continuam em float64, que
+    representa contagens grandes (ex.: populações) sem perda de precisão.
+    """
+    numeric = pd.to_numeric(series, errors="coerce")
+    if numeric.isna().any() or not (numeric == numeric.round()).all():
+        return numeric.astype("float64")
+    return pd.to_numeric(numeric.astype("int64"), downcast="integer")
+
+
+def ingest_caso_full(data):
+    """Converte resultados de /caso_full/data em um DataFrame compacto e tipado.
+
+    Etapas:
+    - descarta colunas não usadas (mantém apenas CASO_FULL_COLUMNS presentes);
+    - `state`, `city` e `place_type` viram categóricas;
+    - contagens e `city_ibge_code` viram o menor inteiro seguro (int8 a int64);
+    - `date` é convertida uma única vez com formato explícito.
+
+    Parâmetros:
+    -----------
+    data : list[dict] | pandas.DataFrame | None
+        Lista `results` da API ou um DataFrame com as mesmas colunas.
+
+    Retorna:
+    --------
+    pandas.DataFrame
+        DataFrame tipado (vazio se `data` for None ou vazio).
+    """
+    df = data if isinstance(data, pd.DataFrame) else pd.DataFrame(data or [])
+    if df.empty:
+        return df
+
+    df = df[[col for col in CASO_FULL_COLUMNS if col in df.columns]].copy()
+
+    for col in CATEGORICAL_COLUMNS:
+        if col in df.columns and not isinstance(df[col].dtype, pd.CategoricalDtype):
+            df[col] = df[col].astype("category")
+
+    for col in COUNT_COLUMNS:
+        if col in df.columns:
+            df[col] = _downcast_counts(df[col])
+
+    for col in RATE_COLUMNS:
+        if col in df.columns:
+            df[col] = pd.to_numeric(df[col], errors="coerce").astype("float32")
+
+    if "date" in df.columns and not pd.api.types.is_datetime64_any_dtype(df["date"]):
+        df["date"] = pd.to_datetime(df["date"], format=DATE_FORMAT)
+
+    return df
+
+
+def concat_caso_full(frames):
+    """Concatena DataFrames já ingeridos preservando as colunas categóricas.
+
+    `pd.concat` transforma categóricas com categorias diferentes em `object`;
+    aqui as categorias são unificadas antes, sem passar por strings. Contagens
+    com tipos diferentes entre as partes são reduzidas novamente.
+
+    Parâmetros:
+    -----------
+    frames : list[pandas.DataFrame]
+        Partes produzidas por `ingest_caso_full` (ex.: páginas da API).
+
+    Retorna:
+    --------
+    pandas.DataFrame
+        DataFrame único com índice reiniciado.
+    """
+    frames = [df for df in frames if df is not None and not df.empty]
+    if not frames:
+        return pd.DataFrame()
+    if len(frames) == 1:
+        return frames[0].reset_index(drop=True)
+
+    frames = [df.copy(deep=False) for df in frames]
+    for col in CATEGORICAL_COLUMNS:
+        dtypes = [df[col].dtype for df in frames if col in df.columns]
+        if dtypes and all(isinstance(dtype, pd.CategoricalDtype) for dtype in dtypes):
+            categories = pd.api.types.union_categoricals(
+                [df[col] for df in frames if col in df.columns]
+            ).categories
+            for df in frames:
+                if col in df.columns:
+                    df[col] = df[col].cat.set_categories(categories)
+
+    merged = pd.concat(frames, ignore_index=True)
+    for col in COUNT_COLUMNS:
+        if col in merged.columns and merged[col].dtype == "float64":
+            merged[col] = _downcast_counts(merged[col])
+    return merged
@@ -0,0 +1,339 @@
+# Métricas no formato texto do Prometheus (latência das APIs, caches, fallback e frescor dos dados)
+
+import os
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from src.utils.constants import METRICS_FILE_INTERVAL, METRICS_FILE_PATH, METRICS_HOST, METRICS_PORT
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Limites (segundos) dos buckets padrão dos histogramas
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names, values, extra=()):
+    pairs = list(zip(names, values)) + list(extra)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+
+def _format_value(value):
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Metric:
+    """Base das métricas: nome, ajuda, rótulos e uma série por combinação de valores dos rótulos.
+
+    Cada subclasse define `samples()`, com as linhas (sufixo, valores dos
+    rótulos, rótulos extras, valor) da exposição.
+    """
+
+    type_name = None
+
+    def __init__(self, name, help, labelnames=()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels):
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} espera os rótulos {self.labelnames}, recebeu {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def clear(self):
+        with self._lock:
+            self._series.clear()
+
+    def expose(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.type_name}"]
+        for suffix, values, extra, value in self.samples():
+            lines.append(f"{self.name}{suffix}{_format_labels(self.labelnames, values, extra)} {_format_value(value)}")
+        return lines
+
+
+class Counter(_Metric):
+    """Contador que só cresce (ex.: requisições, 429, ativações de fallback); o nome termina em `_total`."""
+
+    type_name = "counter"
+
+    def inc(self, amount=1, **labels):
+        if amount < 0:
+            raise ValueError("Contadores só podem aumentar")
+        key = self._key(labels)
+        with self._lock:
+            self._series[key] = self._series.get(key, 0) + amount
+
+    def value(self, **labels):
+        return self._series.get(self._key(labels), 0)
+
+    def samples(self):
+        with self._lock:
+            return [("", key, (), value) for key, value in sorted(self._series.items())]
+
+
+class Gauge(_Metric):
+    """Valor que sobe e desce (ex.: idade dos dados, servindo fallback ou não)."""
+
+    type_name = "gauge"
+
+    def set(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._series[key] = value
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._series[key] = self._series.get(key, 0) + amount
+
+    def value(self, **labels):
+        return self._series.get(self._key(labels))
+
+    def samples(self):
+        with self._lock:
+            return [("", key, (), value) for key, value in sorted(self._series.items())]
+
+
+class Histogram(_Metric):
+    """Distribuição de durações em buckets cumulativos, com soma e contagem."""
+
+    type_name = "histogram"
+
+    def __init__(self, name, help, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (float("inf"),)
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = {"counts": [0] * len(self.buckets), "sum": 0.0}
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series["counts"][i] += 1
+                    break
+            series["sum"] += value
+
+    def count(self, **labels):
+        series = self._series.get(self._key(labels))
+        return sum(series["counts"]) if series else 0
+
+    def samples(self):
+        rows = []
+        with self._lock:
+            for key, series in sorted(self._series.items()):
+                cumulative = 0
+                for bound, count in zip(self.buckets, series["counts"]):
+                    cumulative += count
+                    rows.append(("_bucket", key, (("le", _format_value(bound)),), cumulative))
+                rows.append(("_sum", key, (), series["sum"]))
+                rows.append(("_count", key, (), cumulative))
+        return rows
+
+
+class Registry:
+    """Conjunto de métricas do processo, com coletores chamados antes de cada exposição.
+
+    Coletores servem para valores calculados na hora da leitura (ex.: a idade
+    de cada snapshot do serviço de dados).
+    """
+
+    def __init__(self):
+        self._metrics = {}
+        self._collectors = []
+        self._lock = threading.Lock()
+
+    def _get_or_create(self, cls, name, help, labelnames, **kwargs):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(name, help, labelnames, **kwargs)
+            elif not isinstance(metric, cls) or metric.labelnames != tuple(labelnames):
+                raise ValueError(f"Métrica {name} já registrada com outro tipo ou rótulos")
+            return metric
+
+    def counter(self, name, help, labelnames=()):
+        return self._get_or_create(Counter, name, help, labelnames)
+
+    def gauge(self, name, help, labelnames=()):
+        return self._get_or_create(Gauge, name, help, labelnames)
+
+    def histogram(self, name, help, labelnames=(), buckets=DEFAULT_BUCKETS):
+        return self._get_or_create(Histogram, name, help, labelnames, buckets=buckets)
+
+    def register_collector(self, collector):
+        with self._lock:
+            self._collectors.append(collector)
+        return collector
+
+    def unregister_collector(self, collector):
+        with self._lock:
+            if collector in self._collectors:
+                self._collectors.remove(collector)
+
+    def expose(self):
+        """Texto no formato de exposição do Prometheus (0.0.4)."""
+        with self._lock:
+            collectors = list(self._collectors)
+            metrics = sorted(self._metrics.values(), key=lambda metric: metric.name)
+        for collector in collectors:
+            try:
+                collector()
+            except Exception as e:
+                print(f"Erro em coletor de métricas: {e}")
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.expose())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+# ---------------------------------------------------------------------------
+# Métricas do dashboard
+# ---------------------------------------------------------------------------
+
+UPSTREAM_LATENCY = REGISTRY.histogram(
+    "covid19_upstream_request_seconds",
+    "Duração de cada tentativa de requisição às APIs externas",
+    ("host", "endpoint", "status"),
+)
+UPSTREAM_RETRIES = REGISTRY.counter(
+    "covid19_upstream_retries_total", "Tentativas repetidas após a primeira", ("host", "endpoint")
+)
+UPSTREAM_RATE_LIMITED = REGISTRY.counter(
+    "covid19_upstream_rate_limited_total", "Respostas 429 recebidas das APIs externas", ("host",)
+)
+UPSTREAM_TIMEOUTS = REGISTRY.counter(
+    "covid19_upstream_timeouts_total", "Requisições às APIs externas encerradas por timeout", ("host",)
+)
+FALLBACK_ACTIVATIONS = REGISTRY.counter(
+    "covid19_fallback_activations_total", "Vezes em que dados de fallback foram servidos", ("dataset",)
+)
+SERVING_FALLBACK = REGISTRY.gauge(
+    "covid19_serving_fallback", "1 se o último render do conjunto usou dados de fallback", ("dataset",)
+)
+CACHE_REQUESTS = REGISTRY.counter(
+    "covid19_cache_requests_total", "Leituras de cache por loader e resultado (hit/miss)", ("loader", "result")
+)
+RERUN_SECONDS = REGISTRY.histogram(
+    "covid19_rerun_seconds", "Duração do render de cada página", ("page",)
+)
+REFRESH_SECONDS = REGISTRY.histogram(
+    "covid19_data_refresh_seconds", "Duração das atualizações do serviço de dados", ("dataset", "result"),
+    buckets=(0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0),
+)
+LAST_REFRESH_SUCCESS = REGISTRY.gauge(
+    "covid19_data_last_success_timestamp_seconds", "Horário (epoch) da última atualização bem-sucedida",
+    ("dataset",),
+)
+DATA_AGE = REGISTRY.gauge(
+    "covid19_data_age_seconds", "Idade do snapshot servido (calculada na leitura das métricas)", ("dataset",)
+)
+
+
+def record_cache(loader, hit):
+    """Conta uma leitura de cache de `loader` como hit ou miss."""
+    CACHE_REQUESTS.inc(loader=loader, result="hit" if hit else "miss")
+
+
+def record_fallback(dataset, active=True):
+    """Registra se o conjunto foi servido com dados de fallback neste render."""
+    if active:
+        FALLBACK_ACTIVATIONS.inc(dataset=dataset)
+    SERVING_FALLBACK.set(1 if active else 0, dataset=dataset)
+
+
+# ---------------------------------------------------------------------------
+# Exportação
+# ---------------------------------------------------------------------------
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?")[0] not in ("/", "/metrics"):
+            self.send_error(404)
+            return
+        body = self.server.registry.expose().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_http_server(port, host="127.0.0.1", registry=REGISTRY):
+    """Serve `/metrics` em uma thread de fundo; retorna o servidor (porta 0 escolhe uma livre)."""
+    server = ThreadingHTTPServer((host, port), _MetricsHandler)
+    server.daemon_threads = True
+    server.registry = registry
+    threading.Thread(target=server.serve_forever, name="covid19-metrics", daemon=True).start()
+    return server
+
+
+def write_metrics_file(path, registry=REGISTRY):
+    """Grava a exposição em `path` de forma atômica (para o textfile collector do node_exporter)."""
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=directory, prefix=".metrics-", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(registry.expose())
+        os.chmod(tmp, 0o644)  # mkstemp cria com 0600; o node_exporter costuma rodar com outro usuário
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+
+
+def start_file_writer(path, interval=METRICS_FILE_INTERVAL, registry=REGISTRY):
+    """Regrava o arquivo de métricas a cada `interval` segundos; retorna o Event que para a thread."""
+    stop = threading.Event()
+
+    def run():
+        while not stop.is_set():
+            try:
+                write_metrics_file(path, registry)
+            except OSError as e:
+                print(f"Erro ao gravar métricas em {path}: {e}")
+            stop.wait(interval)
+
+    threading.Thread(target=run, name="covid19-metrics-file", daemon=True).start()
+    return stop
+
+
+_exporters_started = False
+_exporters_lock = threading.Lock()
+
+
+def start_exporters():
+    """Sobe os exportadores configurados (COVID19_METRICS_PORT / COVID19_METRICS_FILE), uma vez por processo."""
+    global _exporters_started
+    with _exporters_lock:
+        if _exporters_started:
+            return
+        _exporters_started = True
+        if METRICS_PORT:
+            try:
+                start_http_server(METRICS_PORT, METRICS_HOST)
+            except OSError as e:
+                print(f"Erro ao abrir o endpoint de métricas na porta {METRICS_PORT}: {e}")
+        if METRICS_FILE_PATH:
+            start_file_writer(METRICS_FILE_PATH)
@@ -0,0 +1,161 @@
+# Limitador de taxa (token bucket) por host, compartilhado entre threads e réplicas
+
+import sqlite3
+import threading
+import time
+from contextlib import closing
+
+from src.utils.constants import RATE_LIMIT_DB_PATH, RATE_LIMITS
+
+_limiters = {}
+_limiters_lock = threading.Lock()
+
+
+class TokenBucket:
+    """Token bucket de um host, compartilhado pelas threads do processo.
+
+    Implementado como GCRA: em vez de contar fichas, guarda o instante
+    teórico da próxima liberação (`tat`). Cada chamada a `acquire` reserva o
+    próximo horário livre sob o lock e só então dorme até ele, de modo que
+    as requisições são atendidas na ordem de chegada, sem disputa nem
+    tentativas desperdiçadas.
+
+    Parâmetros:
+    -----------
+    rate : float
+        Requisições por segundo permitidas em regime.
+    capacity : int
+        Rajada máxima (requisições que podem sair de uma vez com o balde cheio).
+    clock : callable
+        Relógio em segundos (substituível em testes).
+    sleep : callable
+        Função de espera (substituível em testes).
+    """
+
+    def __init__(self, rate, capacity=1, clock=time.monotonic, sleep=time.sleep):
+        self.interval = 1.0 / rate
+        self.burst = max(0, capacity - 1) * self.interval
+        self.clock = clock
+        self.sleep = sleep
+        self._tat = 0.0
+        self._lock = threading.Lock()
+
+    def _reserve(self, tat, now, timeout):
+        """Calcula a espera para o próximo horário livre e o novo `tat` (None se exceder `timeout`)."""
+        tat = max(tat, now)
+        wait = tat - self.burst - now
+        if timeout is not None and wait > timeout:
+            return None, tat
+        return max(0.0, wait), tat + self.interval
+
+    def acquire(self, timeout=None):
+        """Aguarda a vez da requisição.
+
+        Parâmetros:
+        -----------
+        timeout : float | None
+            Espera máxima em segundos; None aguarda o quanto for preciso.
+
+        Retorna:
+        --------
+        bool
+            True se a requisição pode sair; False se a vez dela cairia depois
+            de `timeout` (nesse caso nenhum horário é reservado).
+        """
+        with self._lock:
+            wait, tat = self._reserve(self._tat, self.clock(), timeout)
+            if wait is None:
+                return False
+            self._tat = tat
+        if wait > 0:
+            self.sleep(wait)
+        return True
+
+    def defer(self, seconds):
+        """Adia todas as próximas liberações em `seconds` (ex.: após um 429)."""
+        with self._lock:
+            self._tat = max(self._tat, self.clock() + seconds)
+
+
+class SQLiteTokenBucket(TokenBucket):
+    """Token bucket cujo estado fica em um arquivo SQLite, compartilhado entre processos.
+
+    Réplicas na mesma máquina que apontam para o mesmo arquivo dividem a
+    mesma cota do host. A reserva é feita dentro de uma transação
+    `BEGIN IMMEDIATE`, que serializa os processos; o relógio é o de parede
+    (time.time), comum a todos eles.
+
+    Parâmetros:
+    -----------
+    path : str
+        Arquivo SQLite (criado se não existir).
+    host : str
+        Host cuja cota é controlada (chave da linha no banco).
+    rate, capacity, sleep :
+        Como em TokenBucket.
+    """
+
+    def __init__(self, path, host, rate, capacity=1, clock=time.time, sleep=time.sleep):
+        super().__init__(rate, capacity, clock=clock, sleep=sleep)
+        self.path = str(path)
+        self.host = host
+        with closing(self._connect()) as conn:
+            conn.execute("CREATE TABLE IF NOT EXISTS rate_limit (host TEXT PRIMARY KEY, tat REAL NOT NULL)")
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=30, isolation_level=None)
+
+    def _update(self, compute):
+        """Lê o `tat` do host, aplica `compute(tat) -> (resultado, novo_tat)` e grava, atomicamente."""
+        with self._lock, closing(self._connect()) as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = conn.execute("SELECT tat FROM rate_limit WHERE host = ?", (self.host,)).fetchone()
+                result, tat = compute(row[0] if row else 0.0)
+                if tat is not None:
+                    conn.execute("INSERT OR REPLACE INTO rate_limit (host, tat) VALUES (?, ?)", (self.host, tat))
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            return result
+
+    def acquire(self, timeout=None):
+        def compute(tat):
+            wait, new_tat = self._reserve(tat, self.clock(), timeout)
+            return wait, new_tat if wait is not None else None
+
+        wait = self._update(compute)
+        if wait is None:
+            return False
+        if wait > 0:
+            self.sleep(wait)
+        return True
+
+    def defer(self, seconds):
+        self._update(lambda tat: (None, max(tat, self.clock() + seconds)))
+
+
+def get_limiter(host):
+    """Retorna o limitador do host (None se o host não tiver limite configurado).
+
+    Com COVID19_RATE_LIMIT_DB definido, o estado fica no SQLite e é
+    compartilhado entre as réplicas locais; caso contrário vale só para o
+    processo atual.
+    """
+    if host not in RATE_LIMITS:
+        return None
+    with _limiters_lock:
+        if host not in _limiters:
+            rate, capacity = RATE_LIMITS[host]
+            if RATE_LIMIT_DB_PATH:
+                _limiters[host] = SQLiteTokenBucket(RATE_LIMIT_DB_PATH, host, rate, capacity)
+            else:
+                _limiters[host] = TokenBucket(rate, capacity)
+        return _limiters[host]
+
+
+def reset_limiters():
+    """Esquece todos os limitadores (útil em testes)."""
+    with _limiters_lock:
+        _limiters.clear()
@@ -0,0 +1,174 @@
+# Circuit breaker por host e orçamento de latência (deadline) para as APIs externas
+
+import contextvars
+import threading
+import time
+from contextlib import contextmanager
+from email.utils import parsedate_to_datetime
+
+from src.utils.constants import CIRCUIT_FAILURE_THRESHOLD, CIRCUIT_RECOVERY_SECONDS
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+_breakers = {}
+_breakers_lock = threading.Lock()
+
+_deadline = contextvars.ContextVar("covid19_deadline", default=None)
+
+
+class CircuitBreaker:
+    """Acompanha a saúde de um host e corta as chamadas enquanto ele está fora.
+
+    - closed: requisições passam; falhas consecutivas são contadas.
+    - open: após `failure_threshold` falhas (ou um Retry-After), as chamadas
+      falham na hora, sem tocar na rede, até o fim do período de recuperação.
+    - half_open: terminado o período, uma única requisição de teste passa;
+      sucesso fecha o circuito, falha o reabre.
+
+    Parâmetros:
+    -----------
+    name : str
+        Identificação do host (ex.: "api.brasil.io").
+    failure_threshold : int
+        Falhas consecutivas que abrem o circuito.
+    recovery_timeout : float
+        Segundos com o circuito aberto antes do teste (half-open).
+    clock : callable
+        Relógio monotônico (substituível em testes).
+    """
+
+    def __init__(self, name, failure_threshold=CIRCUIT_FAILURE_THRESHOLD,
+                 recovery_timeout=CIRCUIT_RECOVERY_SECONDS, clock=time.monotonic):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.clock = clock
+        self.state = CLOSED
+        self.failures = 0
+        self.open_until = 0.0
+        self.last_latency = None
+        self.last_error = None
+        self._probe_in_flight = False
+        self._probe_owner = None  # Thread que reservou o teste do half-open
+        self._lock = threading.Lock()
+
+    def allow_request(self):
+        """Indica se uma requisição pode sair agora (reserva o teste no half-open)."""
+        with self._lock:
+            if self.state == CLOSED:
+                return True
+            if self.state == OPEN and self.clock() >= self.open_until:
+                self.state = HALF_OPEN
+                self._probe_in_flight = False
+            if self.state == HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                self._probe_owner = threading.get_ident()
+                return True
+            return False
+
+    def release_probe(self):
+        """Devolve o teste reservado por esta thread quando a requisição não chegou a sair.
+
+        Sem isso, uma requisição que desiste antes da rede (ex.: sem vez no
+        limitador de taxa) deixaria o half-open com o teste "em andamento"
+        para sempre. Não mexe no teste reservado por outra thread.
+        """
+        with self._lock:
+            if self._probe_in_flight and self._probe_owner == threading.get_ident():
+                self._probe_in_flight = False
+                self._probe_owner = None
+
+    def record_success(self, latency=None):
+        """Registra uma resposta do host (qualquer status que não indique indisponibilidade)."""
+        with self._lock:
+            self.state = CLOSED
+            self.failures = 0
+            self.last_error = None
+            self._probe_in_flight = False
+            if latency is not None:
+                self.last_latency = latency
+
+    def record_failure(self, error=None, retry_after=None, latency=None):
+        """Registra uma falha; abre o circuito no limite, no half-open ou com Retry-After."""
+        with self._lock:
+            self.failures += 1
+            self.last_error = error
+            self._probe_in_flight = False
+            if latency is not None:
+                self.last_latency = latency
+            if retry_after is not None or self.state == HALF_OPEN or self.failures >= self.failure_threshold:
+                self.state = OPEN
+                self.open_until = self.clock() + (self.recovery_timeout if retry_after is None else retry_after)
+
+    def snapshot(self):
+        """Estado atual para exibição na página."""
+        with self._lock:
+            return {
+                "host": self.name,
+                "state": self.state,
+                "failures": self.failures,
+                "retry_in": round(max(0.0, self.open_until - self.clock()), 1) if self.state == OPEN else 0.0,
+                "last_latency_ms": round(self.last_latency * 1000) if self.last_latency is not None else None,
+                "last_error": self.last_error,
+            }
+
+
+def get_breaker(host):
+    """Retorna o circuit breaker do host, compartilhado por todo o processo."""
+    with _breakers_lock:
+        if host not in _breakers:
+            _breakers[host] = CircuitBreaker(host)
+        return _breakers[host]
+
+
+def breaker_states():
+    """Lista com o estado de todos os circuit breakers conhecidos."""
+    with _breakers_lock:
+        breakers = list(_breakers.values())
+    return [breaker.snapshot() for breaker in breakers]
+
+
+def reset_breakers():
+    """Esquece todos os circuit breakers (útil em testes)."""
+    with _breakers_lock:
+        _breakers.clear()
+
+
+def parse_retry_after(value):
+    """Converte o cabeçalho Retry-After (segundos ou data HTTP) em segundos, ou None."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except (TypeError, ValueError):
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError, IndexError):
+        return None
+
+
+@contextmanager
+def deadline(seconds):
+    """Define um orçamento de tempo para as requisições feitas dentro do bloco.
+
+    O orçamento vale para a thread/contexto atual (contextvars); blocos
+    aninhados só podem encurtar o prazo, nunca estendê-lo.
+    """
+    current = _deadline.get()
+    new = time.monotonic() + seconds
+    token = _deadline.set(new if current is None else min(current, new))
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def remaining_budget():
+    """Segundos restantes do orçamento atual (None se não houver orçamento)."""
+    current = _deadline.get()
+    if current is None:
+        return None
+    return max(0.0, current - time.monotonic())
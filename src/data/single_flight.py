@@ -0,0 +1,78 @@
+# Deduplicação de chamadas concorrentes idênticas (single-flight)
+
+import threading
+
+
+class _Call:
+    """Chamada em andamento: o resultado (ou a exceção) é entregue a todos que esperam."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """Garante que só uma execução por chave esteja em andamento ao mesmo tempo.
+
+    O primeiro chamador de `do(key, fn)` executa `fn`; quem chega com a
+    mesma chave enquanto ela roda apenas aguarda e recebe o mesmo resultado
+    (ou a mesma exceção). Terminada a execução a chave é liberada — não é
+    um cache, a próxima chamada executa `fn` de novo.
+    """
+
+    def __init__(self):
+        self._calls = {}
+        self._lock = threading.Lock()
+
+    def do(self, key, fn, timeout=None):
+        """Executa `fn()` ou aguarda a execução já em andamento para `key`.
+
+        Parâmetros:
+        -----------
+        key : hashable
+            Identificação da chamada (ex.: URL + parâmetros).
+        fn : callable
+            Função sem argumentos que produz o resultado.
+        timeout : float | None
+            Espera máxima de quem aguarda outra execução (o executor não é
+            interrompido).
+
+        Retorna:
+        --------
+        object
+            O valor retornado por `fn`.
+
+        Levanta:
+        --------
+        TimeoutError
+            Se a execução em andamento não terminar dentro de `timeout`.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+
+        if not leader:
+            if not call.done.wait(timeout):
+                raise TimeoutError(f"chamada em andamento para {key!r} não terminou a tempo")
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result
+
+    def in_flight(self):
+        """Quantidade de chaves com execução em andamento."""
+        with self._lock:
+            return len(self._calls)
@@ -0,0 +1,286 @@
+# Servidor HTTP local que imita o Brasil.io e o disease.sh (testes de carga e de resiliência)
+
+import hashlib
+import json
+import random
+import threading
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, unquote, urlencode, urlsplit
+
+import numpy as np
+import pandas as pd
+
+from src.data.synthetic import DEFAULT_DAYS, generate_cities, generate_countries, generate_states
+from src.utils.constants import BRASIL_IO_MAX_PAGE_SIZE, BRASIL_IO_PAGE_SIZE
+
+# Prefixos iguais aos das APIs reais: basta trocar o host nas URLs base
+BRASIL_IO_PREFIX = "/v1/dataset/covid19"
+WORLD_PREFIX = "/v3/covid-19"
+
+# Falhas injetáveis e seus valores padrão (ver `StubAPIServer.configure`)
+DEFAULT_FAULTS = {
+    "latency": 0.0,  # Segundos de espera antes de cada resposta
+    "jitter": 0.0,  # Espera extra aleatória, entre 0 e `jitter` segundos
+    "rate_limit_rate": 0.0,  # Fração das requisições respondidas com 429
+    "retry_after": 1,  # Valor do cabeçalho Retry-After nos 429 (None omite o cabeçalho)
+    "timeout_rate": 0.0,  # Fração das requisições que ficam sem resposta
+    "hang_seconds": 30.0,  # Quanto tempo uma requisição "sem resposta" segura a conexão
+}
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server_version = "COVID19Stub/1.0"
+    protocol_version = "HTTP/1.1"  # Keep-alive, como as APIs reais (o cliente usa um pool)
+
+    def do_GET(self):
+        self.server.stub.handle(self)
+
+    def log_message(self, format, *args):
+        pass  # Sem uma linha por requisição no stderr durante testes de carga
+
+
+class StubAPIServer:
+    """Servidor local com os endpoints usados por `COVID19APIClient`.
+
+    Atende `/caso_full/data` (filtros `place_type`, `state`, `is_last`,
+    `date__gte`/`date__lte`, `page_size` e paginação pelo link `next`),
+    `/countries` (com `sort`) e `/countries/{lista}`, com dados de
+    `src.data.synthetic`. As respostas têm ETag e respondem 304 a
+    If-None-Match, então o cache HTTP do cliente também é exercitado.
+
+    Latência, 429 e requisições sem resposta (timeouts) são injetados com
+    as frações de `DEFAULT_FAULTS`, sorteadas com a semente informada, e
+    podem ser alteradas com o servidor no ar (`configure`). As contagens
+    ficam em `stats()`.
+
+    Os dois serviços ficam no mesmo host; como os limites de taxa de
+    `RATE_LIMITS` são por host, o limite do disease.sh vale para ambos.
+
+    Exemplo:
+        with StubAPIServer(days=120, latency=0.05) as server:
+            os.environ.update(server.env())  # antes de importar o cliente
+    """
+
+    def __init__(self, host="127.0.0.1", port=0, days=DEFAULT_DAYS, city_states=None, countries=200,
+                 seed=0, max_page_size=BRASIL_IO_MAX_PAGE_SIZE, **faults):
+        unknown = set(faults) - set(DEFAULT_FAULTS)
+        if unknown:
+            raise TypeError(f"Falha desconhecida: {', '.join(sorted(unknown))}")
+
+        self.host = host
+        self.port = port
+        self.max_page_size = max_page_size
+        self.faults = {**DEFAULT_FAULTS, **faults}
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._stats = Counter()
+        self._stopping = threading.Event()
+        self._server = None
+        self._thread = None
+
+        frames = [generate_states(days=days, seed=seed, raw=True)]
+        if city_states:
+            frames.append(generate_cities(days=days, states=city_states, seed=seed, raw=True))
+        # Mais recentes primeiro, como o Brasil.io (iter_brasil_pages depende disso)
+        rows = pd.concat(frames, ignore_index=True)
+        self._rows = rows.sort_values("date", ascending=False, kind="stable").reset_index(drop=True)
+        self._columns = {
+            col: self._rows[col].to_numpy() for col in ("place_type", "state", "date", "is_last", "city_ibge_code")
+        }
+        self._countries = generate_countries(countries, seed=seed)
+
+    # ------------------------------------------------------------------
+    # Ciclo de vida
+    # ------------------------------------------------------------------
+
+    def start(self):
+        """Sobe o servidor em uma thread de fundo (porta 0 escolhe uma livre)."""
+        self._stopping.clear()
+        self._server = ThreadingHTTPServer((self.host, self.port), _Handler)
+        self._server.daemon_threads = True
+        self._server.stub = self
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(target=self._server.serve_forever, name="covid19-stub", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Para o servidor, liberando também as requisições presas em timeouts simulados."""
+        self._stopping.set()
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._thread.join()
+            self._server = self._thread = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    @property
+    def url(self):
+        return f"http://{self.host}:{self.port}"
+
+    @property
+    def brasil_io_url(self):
+        return self.url + BRASIL_IO_PREFIX
+
+    @property
+    def world_url(self):
+        return self.url + WORLD_PREFIX
+
+    def env(self):
+        """Variáveis que apontam o cliente para este servidor (lidas ao importar as constantes)."""
+        return {
+            "COVID19_BRASIL_IO_API_URL": self.brasil_io_url,
+            "COVID19_WORLD_API_URL": self.world_url,
+        }
+
+    def configure(self, **faults):
+        """Altera as falhas injetadas com o servidor no ar (chaves de DEFAULT_FAULTS)."""
+        unknown = set(faults) - set(DEFAULT_FAULTS)
+        if unknown:
+            raise TypeError(f"Falha desconhecida: {', '.join(sorted(unknown))}")
+        with self._lock:
+            self.faults.update(faults)
+
+    def stats(self):
+        """Contagens de requisições, 429, timeouts e 304 desde a criação (ou `reset_stats`)."""
+        with self._lock:
+            return dict(self._stats)
+
+    def reset_stats(self):
+        with self._lock:
+            self._stats.clear()
+
+    # ------------------------------------------------------------------
+    # Requisições
+    # ------------------------------------------------------------------
+
+    def _draw_faults(self, endpoint):
+        """Sorteia a espera e a falha de uma requisição (None, 'rate_limit' ou 'timeout')."""
+        with self._lock:
+            faults = dict(self.faults)
+            self._stats["requests"] += 1
+            self._stats[endpoint] += 1
+            delay = faults["latency"] + self._random.uniform(0, faults["jitter"])
+            roll = self._random.random()
+        if roll < faults["timeout_rate"]:
+            return delay, "timeout", faults
+        if roll < faults["timeout_rate"] + faults["rate_limit_rate"]:
+            return delay, "rate_limit", faults
+        return delay, None, faults
+
+    def _count(self, key):
+        with self._lock:
+            self._stats[key] += 1
+
+    def handle(self, handler):
+        """Atende um GET (chamado pelas threads do ThreadingHTTPServer)."""
+        parts = urlsplit(handler.path)
+        path = parts.path.rstrip("/")
+        query = dict(parse_qsl(parts.query))
+
+        if path.endswith("/caso_full/data"):
+            endpoint = "caso_full"
+        elif "/countries" in path:
+            endpoint = "countries"
+        else:
+            return self._send(handler, 404, {"detail": "Not found."})
+
+        delay, fault, faults = self._draw_faults(endpoint)
+        if delay:
+            self._stopping.wait(delay)
+        if fault == "timeout":
+            self._count("timeouts")
+            self._stopping.wait(faults["hang_seconds"])
+            handler.close_connection = True
+            return None
+        if fault == "rate_limit":
+            self._count("rate_limited")
+            headers = {} if faults["retry_after"] is None else {"Retry-After": str(faults["retry_after"])}
+            return self._send(handler, 429, {"detail": "Request was throttled."}, headers)
+
+        if endpoint == "caso_full":
+            status, payload = self._caso_full(query, f"http://{handler.headers.get('Host', self.host)}{parts.path}")
+        else:
+            status, payload = self._world(path, query)
+        return self._send(handler, status, payload, if_none_match=handler.headers.get("If-None-Match"))
+
+    def _send(self, handler, status, payload, headers=None, if_none_match=None):
+        body = json.dumps(payload).encode("utf-8")
+        etag = f'"{hashlib.md5(body).hexdigest()}"'
+        if status == 200 and if_none_match == etag:
+            self._count("not_modified")
+            status, body = 304, b""
+
+        handler.send_response(status)
+        handler.send_header("Content-Type", "application/json")
+        handler.send_header("Content-Length", str(len(body)))
+        if status in (200, 304):
+            handler.send_header("ETag", etag)
+        for name, value in (headers or {}).items():
+            handler.send_header(name, value)
+        handler.end_headers()
+        if body:
+            handler.wfile.write(body)
+        return None
+
+    def _caso_full(self, query, base_url):
+        """Página de /caso_full/data no formato do Brasil.io (count, next, previous, results)."""
+        columns = self._columns
+        mask = np.ones(len(self._rows), dtype=bool)
+        if "place_type" in query:
+            mask &= columns["place_type"] == query["place_type"]
+        if "state" in query:
+            mask &= columns["state"] == query["state"].upper()
+        if "city_ibge_code" in query:
+            mask &= columns["city_ibge_code"] == int(query["city_ibge_code"])
+        if "is_last" in query:
+            mask &= columns["is_last"] == (query["is_last"].lower() in ("true", "1"))
+        if "date__gte" in query:
+            mask &= columns["date"] >= query["date__gte"]
+        if "date__lte" in query:
+            mask &= columns["date"] <= query["date__lte"]
+        if "date" in query:
+            mask &= columns["date"] == query["date"]
+
+        try:
+            page = int(query.get("page", 1))
+            page_size = min(int(query.get("page_size", BRASIL_IO_PAGE_SIZE)), self.max_page_size)
+        except ValueError:
+            return 400, {"detail": "Invalid page."}
+        positions = np.flatnonzero(mask)
+        start = (page - 1) * page_size
+        if page < 1 or page_size < 1 or (start >= len(positions) and page > 1):
+            return 404, {"detail": "Invalid page."}
+
+        def link(number):
+            return f"{base_url}?{urlencode({**query, 'page': number})}"
+
+        self._count("pages")
+        return 200, {
+            "count": len(positions),
+            "next": link(page + 1) if start + page_size < len(positions) else None,
+            "previous": link(page - 1) if page > 1 else None,
+            "results": self._rows.iloc[positions[start:start + page_size]].to_dict("records"),
+        }
+
+    def _world(self, path, query):
+        """/countries (lista ordenada por `sort`) e /countries/{a,b,...} como no disease.sh."""
+        names = unquote(path.split("/countries", 1)[1].strip("/"))
+        if not names:
+            sort = query.get("sort")
+            if sort and self._countries and sort in self._countries[0]:
+                return 200, sorted(self._countries, key=lambda country: country[sort], reverse=True)
+            return 200, self._countries
+
+        wanted = [name.strip().lower() for name in names.split(",") if name.strip()]
+        by_name = {country["country"].lower(): country for country in self._countries}
+        found = [by_name[name] for name in wanted if name in by_name]
+        if not found:
+            return 404, {"message": "Country not found or doesn't have any cases"}
+        return 200, found[0] if len(wanted) == 1 else found
@@ -0,0 +1,328 @@
+# Gerador determinístico de dados sintéticos em escala real (caso_full e disease.sh)
+
+import numpy as np
+import pandas as pd
+
+from src.data.ingestion import DATE_FORMAT, concat_caso_full, ingest_caso_full
+
+# Primeiro dia da série e tamanho padrão do histórico (como no Brasil.io)
+START_DATE = "2020-02-25"
+DEFAULT_DAYS = 1100
+
+# Código IBGE, população estimada (2020) e número de municípios de cada UF
+ESTADOS_IBGE = {
+    'RO': (11, 1_796_460, 52), 'AC': (12, 894_470, 22), 'AM': (13, 4_207_714, 62),
+    'RR': (14, 631_181, 15), 'PA': (15, 8_690_745, 144), 'AP': (16, 861_773, 16),
+    'TO': (17, 1_590_248, 139), 'MA': (21, 7_114_598, 217), 'PI': (22, 3_281_480, 224),
+    'CE': (23, 9_187_103, 184), 'RN': (24, 3_534_165, 167), 'PB': (25, 4_039_277, 223),
+    'PE': (26, 9_616_621, 185), 'AL': (27, 3_351_543, 102), 'SE': (28, 2_318_822, 75),
+    'BA': (29, 14_930_634, 417), 'MG': (31, 21_292_666, 853), 'ES': (32, 4_064_052, 78),
+    'RJ': (33, 17_366_189, 92), 'SP': (35, 46_289_333, 645), 'PR': (41, 11_516_840, 399),
+    'SC': (42, 7_252_502, 295), 'RS': (43, 11_422_973, 497), 'MS': (50, 2_809_394, 79),
+    'MT': (51, 3_526_220, 141), 'GO': (52, 7_113_540, 246), 'DF': (53, 3_055_149, 1),
+}
+
+# Ondas epidêmicas: (dia do pico, largura em dias, casos por 100 mil hab./dia no pico)
+ONDAS = [(150, 45, 25.0), (420, 50, 35.0), (720, 20, 180.0), (900, 30, 40.0)]
+CASOS_BASE_100K = 2.0
+ATRASO_OBITOS = 14
+
+# Subnotificação nos fins de semana (segunda = 0 ... domingo = 6)
+FATOR_DIA_SEMANA = np.array([0.85, 1.1, 1.1, 1.1, 1.05, 0.8, 0.6])
+
+# Probabilidade de um dia trazer correção negativa (revisão de casos já notificados)
+PROB_CORRECAO = 0.001
+
+# Países (nome como no disease.sh) e população; os do seletor de comparação e o Brasil
+PAISES = {
+    'USA': 331_002_651, 'India': 1_380_004_385, 'Brazil': 212_559_417,
+    'Russia': 145_934_462, 'UK': 67_886_011, 'France': 65_273_511,
+    'Italy': 60_461_826, 'Germany': 83_783_942, 'Spain': 46_754_778,
+    'Argentina': 45_195_774, 'Colombia': 50_882_891, 'Mexico': 128_932_753,
+    'Peru': 32_971_854, 'South Africa': 59_308_690, 'China': 1_439_323_776,
+    'Japan': 126_476_461,
+}
+
+
+def _estados(states):
+    """Valida e ordena as UFs pedidas (todas, se None)."""
+    states = sorted(ESTADOS_IBGE) if states is None else [uf.upper() for uf in states]
+    unknown = [uf for uf in states if uf not in ESTADOS_IBGE]
+    if unknown:
+        raise ValueError(f"UF desconhecida: {', '.join(unknown)}")
+    return states
+
+
+def _incidencia(t, deslocamento, escala):
+    """Casos esperados por 100 mil habitantes em cada (local, dia).
+
+    Parâmetros:
+    -----------
+    t : numpy.ndarray
+        Dias desde o início da série (forma `(dias,)`).
+    deslocamento, escala : numpy.ndarray
+        Atraso das ondas e intensidade relativa de cada local (forma `(locais,)`).
+    """
+    t = t[None, :] - deslocamento[:, None]
+    taxa = np.full(t.shape, CASOS_BASE_100K)
+    for pico, largura, altura in ONDAS:
+        taxa += altura * np.exp(-0.5 * ((t - pico) / largura) ** 2)
+    return taxa * escala[:, None]
+
+
+def _letalidade(t):
+    """Fração de casos que evoluem para óbito, alta no início e em queda depois."""
+    return 0.003 + 0.025 * np.exp(-t / 300)
+
+
+class _Simulacao:
+    """Estado da simulação de um conjunto de locais, avançando dia a dia.
+
+    O ruído de cada dia vem de um gerador semeado por (seed, tipo, dia), então
+    o resultado não depende do tamanho dos blocos em que a série é produzida.
+    """
+
+    def __init__(self, populacao, deslocamento, escala, seed, tipo):
+        self.populacao = populacao.astype("float64")
+        self.deslocamento = deslocamento
+        self.escala = escala
+        self.seed = seed
+        self.tipo = tipo
+        self.confirmados = np.zeros(len(populacao), dtype="int64")
+        self.obitos = np.zeros(len(populacao), dtype="int64")
+
+    def avancar(self, t0, dias, dia_semana):
+        """Simula os dias `t0 .. t0 + dias - 1`; retorna matrizes (locais × dias)."""
+        t = np.arange(t0, t0 + dias, dtype="float64")
+        fator = FATOR_DIA_SEMANA[dia_semana][None, :]
+        esperados = _incidencia(t, self.deslocamento, self.escala) * self.populacao[:, None] / 100_000
+        esperados_obitos = (
+            _incidencia(t - ATRASO_OBITOS, self.deslocamento, self.escala)
+            * self.populacao[:, None] / 100_000 * _letalidade(t)[None, :]
+        )
+
+        forma = (len(self.populacao), dias)
+        novos = np.empty(forma, dtype="int64")
+        novos_obitos = np.empty(forma, dtype="int64")
+        acumulados = np.empty(forma, dtype="int64")
+        acumulados_obitos = np.empty(forma, dtype="int64")
+
+        for j in range(dias):
+            rng = np.random.default_rng([self.seed, self.tipo, t0 + j])
+            ruido = rng.gamma(20.0, 1 / 20, len(self.populacao))  # Sobredispersão (binomial negativa)
+            casos = rng.poisson(esperados[:, j] * fator[0, j] * ruido)
+            mortes = rng.poisson(esperados_obitos[:, j] * fator[0, j] * ruido)
+
+            correcao = (rng.random(len(casos)) < PROB_CORRECAO) & (self.confirmados > 0)
+            casos[correcao] = -np.minimum(self.confirmados[correcao], casos[correcao] + 1)
+
+            self.confirmados += casos
+            self.obitos += mortes
+            novos[:, j], novos_obitos[:, j] = casos, mortes
+            acumulados[:, j], acumulados_obitos[:, j] = self.confirmados, self.obitos
+
+        return novos, novos_obitos, acumulados, acumulados_obitos
+
+
+def _linhas(locais, datas, ultimo_dia, simulado, raw):
+    """Monta as linhas no formato de /caso_full/data, ordenadas por data e local."""
+    novos, novos_obitos, acumulados, acumulados_obitos = simulado
+    n_locais, n_dias = novos.shape
+
+    populacao = np.tile(locais["estimated_population"].to_numpy(), n_dias)
+    confirmados = acumulados.T.ravel()
+    obitos = acumulados_obitos.T.ravel()
+    with np.errstate(divide="ignore", invalid="ignore"):
+        letalidade = np.where(confirmados > 0, obitos / confirmados, 0.0)
+
+    df = pd.DataFrame({
+        "state": np.tile(locais["state"].to_numpy(), n_dias),
+        "city": np.tile(locais["city"].to_numpy(), n_dias),
+        "city_ibge_code": np.tile(locais["city_ibge_code"].to_numpy(), n_dias),
+        "place_type": np.tile(locais["place_type"].to_numpy(), n_dias),
+        "date": np.repeat(datas, n_locais),
+        "is_last": np.repeat(datas == ultimo_dia, n_locais),
+        "estimated_population": populacao,
+        "last_available_confirmed": confirmados,
+        "last_available_deaths": obitos,
+        "last_available_confirmed_per_100k_inhabitants": np.round(confirmados / populacao * 100_000, 5),
+        "last_available_death_rate": np.round(letalidade, 4),
+        "new_confirmed": novos.T.ravel(),
+        "new_deaths": novos_obitos.T.ravel(),
+    })
+
+    if raw:
+        df["date"] = df["date"].dt.strftime(DATE_FORMAT)
+        return df
+    return ingest_caso_full(df)
+
+
+def _iter_blocos(locais, days, start, seed, tipo, chunk_days, raw):
+    """Gera a série de `locais` em blocos de `chunk_days` dias."""
+    datas = pd.date_range(start, periods=days)
+    rng = np.random.default_rng([seed, tipo])
+    simulacao = _Simulacao(
+        locais["estimated_population"].to_numpy(),
+        deslocamento=rng.integers(-20, 21, len(locais)).astype("float64"),
+        escala=rng.lognormal(0.0, 0.25, len(locais)),
+        seed=seed,
+        tipo=tipo,
+    )
+    for t0 in range(0, days, chunk_days):
+        bloco = datas[t0:t0 + chunk_days]
+        simulado = simulacao.avancar(t0, len(bloco), bloco.dayofweek.to_numpy())
+        yield _linhas(locais, bloco, datas[-1], simulado, raw)
+
+
+def states_table(states=None):
+    """UFs com código IBGE e população, no formato das linhas `place_type="state"`."""
+    states = _estados(states)
+    return pd.DataFrame({
+        "state": states,
+        "city": None,
+        "city_ibge_code": [ESTADOS_IBGE[uf][0] for uf in states],
+        "place_type": "state",
+        "estimated_population": [ESTADOS_IBGE[uf][1] for uf in states],
+    })
+
+
+def municipalities(states=None, seed=0):
+    """Municípios sintéticos (5.570 no total) com código IBGE e população.
+
+    A população de cada município segue uma log-normal, reescalada para que a
+    soma de cada UF seja a população estimada do estado.
+
+    Retorna:
+    --------
+    pandas.DataFrame
+        Colunas state, city, city_ibge_code, place_type e estimated_population.
+    """
+    frames = []
+    for uf in _estados(states):
+        codigo, populacao, quantidade = ESTADOS_IBGE[uf]
+        rng = np.random.default_rng([seed, 2, codigo])
+        pesos = rng.lognormal(9.3, 1.1, quantidade)
+        habitantes = np.maximum(800, np.round(pesos / pesos.sum() * populacao)).astype("int64")
+        frames.append(pd.DataFrame({
+            "state": uf,
+            "city": [f"Município {uf}-{i:03d}" for i in range(1, quantidade + 1)],
+            "city_ibge_code": codigo * 100_000 + np.arange(1, quantidade + 1) * 10,
+            "place_type": "city",
+            "estimated_population": habitantes,
+        }))
+    return pd.concat(frames, ignore_index=True)
+
+
+def generate_states(days=DEFAULT_DAYS, states=None, start=START_DATE, seed=0, raw=False):
+    """Série diária sintética por estado, com todas as colunas de CASO_FULL_COLUMNS.
+
+    Os casos seguem ondas epidêmicas com atraso e intensidade próprios de cada
+    UF, sobredispersão, subnotificação nos fins de semana e raras correções
+    negativas; os óbitos acompanham os casos com atraso de 14 dias. Os
+    acumulados, a incidência por 100 mil e a letalidade são consistentes com
+    os valores diários, e `is_last` marca o último dia de cada UF.
+
+    Parâmetros:
+    -----------
+    days : int
+        Quantidade de dias a partir de `start`.
+    states : list[str] | None
+        UFs incluídas (todas, se None).
+    start : str
+        Primeiro dia da série (YYYY-MM-DD).
+    seed : int
+        Mesma semente, mesmos dados.
+    raw : bool
+        Se True, devolve as colunas como a API (datas em texto); senão o
+        DataFrame já passa por `ingest_caso_full`.
+
+    Retorna:
+    --------
+    pandas.DataFrame
+        Linhas ordenadas por data e UF.
+    """
+    return concat_caso_full(list(_iter_blocos(states_table(states), days, start, seed, 0, days, raw)))
+
+
+def iter_cities(days=DEFAULT_DAYS, states=None, start=START_DATE, seed=0, chunk_days=90, raw=False):
+    """Série diária sintética por município, produzida em blocos de dias.
+
+    Com todas as UFs são 5.570 municípios; em 1.100 dias isso passa de 6
+    milhões de linhas, por isso o resultado sai em blocos de `chunk_days` dias
+    (os mesmos dados para qualquer tamanho de bloco). Os parâmetros são os de
+    `generate_states`.
+
+    Retorna:
+    --------
+    Iterator[pandas.DataFrame]
+        Blocos consecutivos, cada um ordenado por data e município.
+    """
+    yield from _iter_blocos(municipalities(states, seed), days, start, seed, 1, chunk_days, raw)
+
+
+def generate_cities(days=DEFAULT_DAYS, states=None, start=START_DATE, seed=0, chunk_days=90, raw=False):
+    """Série por município em um único DataFrame (ver `iter_cities`)."""
+    blocos = list(iter_cities(days, states, start, seed, chunk_days, raw))
+    if raw:
+        return pd.concat(blocos, ignore_index=True)
+    return concat_caso_full(blocos)
+
+
+def generate_countries(n=200, seed=0, updated="2022-03-27"):
+    """Payload sintético de /countries do disease.sh, ordenado por casos.
+
+    Inclui o Brasil e os países do seletor da página de comparação; o
+    restante é completado com países fictícios ("Country 017", ...).
+
+    Parâmetros:
+    -----------
+    n : int
+        Quantidade de países (no mínimo os conhecidos).
+    seed : int
+        Mesma semente, mesmos dados.
+    updated : str
+        Data usada no campo `updated` (milissegundos desde a época).
+
+    Retorna:
+    --------
+    list[dict]
+        Registros com country, cases, deaths, todayCases, todayDeaths,
+        casesPerOneMillion, deathsPerOneMillion, population e afins.
+    """
+    rng = np.random.default_rng([seed, 3])
+    nomes = list(PAISES) + [f"Country {i:03d}" for i in range(len(PAISES) + 1, n + 1)]
+    populacao = np.array(
+        [PAISES.get(nome, 0) for nome in nomes], dtype="int64"
+    )
+    ficticios = populacao == 0
+    populacao[ficticios] = np.round(rng.lognormal(15.5, 1.6, ficticios.sum()) + 10_000).astype("int64")
+
+    casos = np.round(populacao * rng.uniform(0.02, 0.35, len(nomes))).astype("int64")
+    obitos = np.round(casos * rng.uniform(0.002, 0.025, len(nomes))).astype("int64")
+    recuperados = np.round(casos * rng.uniform(0.85, 0.98, len(nomes))).astype("int64")
+    criticos = np.round((casos - obitos - recuperados).clip(0) * rng.uniform(0, 0.01, len(nomes))).astype("int64")
+    testes = np.round(casos * rng.uniform(3, 20, len(nomes))).astype("int64")
+    casos_hoje = rng.poisson(casos / 2000)
+    obitos_hoje = rng.poisson(obitos / 4000)
+    atualizado = int(pd.Timestamp(updated, tz="UTC").timestamp() * 1000)
+
+    registros = [
+        {
+            "updated": atualizado,
+            "country": nome,
+            "cases": int(casos[i]),
+            "todayCases": int(casos_hoje[i]),
+            "deaths": int(obitos[i]),
+            "todayDeaths": int(obitos_hoje[i]),
+            "recovered": int(recuperados[i]),
+            "active": int(casos[i] - obitos[i] - recuperados[i]),
+            "critical": int(criticos[i]),
+            "casesPerOneMillion": round(casos[i] / populacao[i] * 1_000_000),
+            "deathsPerOneMillion": round(obitos[i] / populacao[i] * 1_000_000),
+            "tests": int(testes[i]),
+            "testsPerOneMillion": round(testes[i] / populacao[i] * 1_000_000),
+            "population": int(populacao[i]),
+        }
+        for i, nome in enumerate(nomes)
+    ]
+    return sorted(registros, key=lambda registro: registro["cases"], reverse=True)
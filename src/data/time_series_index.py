@@ -0,0 +1,113 @@
+# Série temporal indexada por (state, date), com blocos contíguos por estado
+
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from src.data.data_processor import data_version
+
+_INDEX_CACHE_SIZE = 8
+_index_cache = OrderedDict()
+_index_cache_lock = threading.Lock()
+
+
+class StateTimeSeries:
+    """DataFrame ordenado por (state, date) com o intervalo de linhas de cada estado.
+
+    A ordenação e o cálculo dos blocos acontecem uma vez, na construção.
+    Depois disso, pegar a série de um estado é um recorte posicional O(1)
+    (`iloc[início:fim]`, sem máscara booleana sobre o frame inteiro) e
+    restringir um período dentro do bloco é uma busca binária nas datas.
+
+    Parâmetros:
+    -----------
+    df : pandas.DataFrame
+        Linhas de caso_full com as colunas `state_col` e `date_col`.
+    state_col : str
+        Coluna do estado.
+    date_col : str
+        Coluna de data (datetime).
+    """
+
+    def __init__(self, df, state_col="state", date_col="date"):
+        self.state_col = state_col
+        self.date_col = date_col
+        self.frame = df.sort_values([state_col, date_col], kind="stable").reset_index(drop=True)
+        self._dates = self.frame[date_col].to_numpy(dtype="datetime64[ns]")
+
+        states = self.frame[state_col].astype(str).to_numpy()
+        if len(states):
+            # Início de cada bloco: posições onde o estado muda
+            starts = np.flatnonzero(np.r_[True, states[1:] != states[:-1]])
+            stops = np.r_[starts[1:], len(states)]
+        else:
+            starts = stops = np.array([], dtype=int)
+        self._starts = starts
+        self._blocks = {states[start]: (int(start), int(stop)) for start, stop in zip(starts, stops)}
+
+    def __len__(self):
+        return len(self.frame)
+
+    def __contains__(self, state):
+        return state in self._blocks
+
+    @property
+    def states(self):
+        """Estados presentes, em ordem alfabética."""
+        return sorted(self._blocks)
+
+    def _bounds(self, state, date_from=None, date_to=None):
+        """Posições [início, fim) das linhas do estado dentro do período (inclusivo)."""
+        start, stop = self._blocks.get(state, (0, 0))
+        if date_from is not None:
+            start += int(np.searchsorted(self._dates[start:stop], np.datetime64(pd.Timestamp(date_from)), side="left"))
+        if date_to is not None:
+            stop = start + int(np.searchsorted(self._dates[start:stop], np.datetime64(pd.Timestamp(date_to)), side="right"))
+        return start, stop
+
+    def state(self, state, date_from=None, date_to=None):
+        """Série de um estado (opcionalmente restrita a um período), ordenada por data.
+
+        Retorna um recorte do frame indexado: trate-o como somente leitura.
+        """
+        start, stop = self._bounds(state, date_from, date_to)
+        return self.frame.iloc[start:stop]
+
+    def select(self, states, date_from=None, date_to=None):
+        """Linhas de vários estados, montadas a partir dos blocos (sem varrer o frame)."""
+        ranges = [self._bounds(state, date_from, date_to) for state in states if state in self._blocks]
+        if not ranges:
+            return self.frame.iloc[0:0]
+        positions = np.concatenate([np.arange(start, stop) for start, stop in ranges])
+        return self.frame.take(positions)
+
+    def block_max(self, column):
+        """Máximo de `column` por estado, calculado bloco a bloco (np.maximum.reduceat)."""
+        if not self._blocks:
+            return pd.Series(dtype="float64")
+        values = pd.to_numeric(self.frame[column], errors="coerce").to_numpy(dtype="float64")
+        values = np.where(np.isnan(values), -np.inf, values)
+        return pd.Series(np.maximum.reduceat(values, self._starts), index=list(self._blocks), name=column)
+
+
+def index_time_series(df, state_col="state", date_col="date"):
+    """Retorna o StateTimeSeries de `df`, construído uma vez por versão dos dados.
+
+    O índice é memorizado por `data_version`, então trocar o estado no
+    selectbox reaproveita o índice do rerun anterior em vez de reordenar.
+    """
+    key = (data_version(df), state_col, date_col)
+    with _index_cache_lock:
+        if key in _index_cache:
+            _index_cache.move_to_end(key)
+            return _index_cache[key]
+
+    index = StateTimeSeries(df, state_col=state_col, date_col=date_col)
+
+    with _index_cache_lock:
+        _index_cache[key] = index
+        while len(_index_cache) > _INDEX_CACHE_SIZE:
+            _index_cache.popitem(last=False)
+    return index
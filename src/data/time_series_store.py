@@ -0,0 +1,170 @@
+# Armazenamento local (Parquet) das séries de caso_full com sincronização incremental
+
+import os
+import threading
+import time
+from pathlib import Path
+
+import pandas as pd
+
+from src.data.ingestion import concat_caso_full
+from src.utils.constants import BRASIL_IO_DATE_FROM_PARAM, STORE_SYNC_INTERVAL
+
+STORE_KEY = ["state", "date"]
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+
+class TimeSeriesStore:
+    """Linhas de /caso_full/data persistidas em Parquet, com chave (state, date).
+
+    A leitura usa filtros do Parquet (estado e intervalo de datas), então uma
+    consulta local leva milissegundos. `sync` baixa do Brasil.io apenas as
+    datas posteriores à mais recente já gravada.
+    """
+
+    def __init__(self, path, sync_interval=STORE_SYNC_INTERVAL):
+        self.path = Path(path)
+        self.sync_interval = sync_interval
+        self._lock = threading.RLock()
+        self._last_sync = None
+
+    def exists(self):
+        """Indica se já existe algum dado gravado."""
+        return self.path.exists()
+
+    def read(self, state=None, date_from=None, date_to=None, columns=None):
+        """Lê as linhas gravadas, opcionalmente filtradas por estado e período.
+
+        Parâmetros:
+        -----------
+        state : str | None
+            Sigla do estado (ex.: "SP").
+        date_from, date_to : str | datetime | None
+            Limites inclusivos do período.
+        columns : list | None
+            Subconjunto de colunas a carregar.
+
+        Retorna:
+        --------
+        pandas.DataFrame
+            Linhas ordenadas por (state, date). Vazio se o store não existir.
+        """
+        if not self.exists():
+            return pd.DataFrame()
+
+        filters = []
+        if state:
+            filters.append(("state", "==", state))
+        if date_from is not None:
+            filters.append(("date", ">=", pd.Timestamp(date_from)))
+        if date_to is not None:
+            filters.append(("date", "<=", pd.Timestamp(date_to)))
+
+        with self._lock:
+            return pd.read_parquet(self.path, columns=columns, filters=filters or None)
+
+    def latest_date(self):
+        """Data mais recente gravada (ou None se o store estiver vazio)."""
+        dates = self.read(columns=["date"])
+        if dates.empty:
+            return None
+        return dates["date"].max()
+
+    def append(self, df):
+        """Mescla novas linhas ao store, mantendo a versão mais nova de cada (state, date).
+
+        A escrita é atômica (arquivo temporário + os.replace), então leitores
+        de outros processos nunca veem um Parquet pela metade.
+
+        Retorna:
+        --------
+        int
+            Total de linhas gravadas após a mescla.
+        """
+        if df is None or df.empty:
+            return len(self.read(columns=["date"]))
+
+        with self._lock:
+            merged = concat_caso_full([self.read(), df])
+            merged = (
+                merged.drop_duplicates(subset=STORE_KEY, keep="last")
+                .sort_values(STORE_KEY)
+                .reset_index(drop=True)
+            )
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_name(f".{self.path.name}.{os.getpid()}.tmp")
+            merged.to_parquet(tmp_path, index=False)
+            os.replace(tmp_path, self.path)
+            return len(merged)
+
+    def needs_sync(self):
+        """True se a última sincronização for mais antiga que `sync_interval` segundos."""
+        return self._last_sync is None or time.monotonic() - self._last_sync >= self.sync_interval
+
+    def sync(self, client, force=False):
+        """Baixa do Brasil.io apenas as datas posteriores à mais recente gravada.
+
+        O período é enviado à API (a partir do dia seguinte ao mais recente
+        gravado), então só o delta trafega; se a API ignorar o filtro, a
+        paginação (da data mais nova para a mais antiga) ainda para na primeira
+        data já presente no store. Com o store vazio, baixa o histórico todo.
+
+        O delta só é gravado se a paginação chegar ao fim: se uma página falhar,
+        `iter_brasil_pages` levanta IncompletePaginationError, nada é gravado e
+        a data mais recente continua a mesma — a próxima sincronização pede o
+        mesmo período de novo, sem deixar dias faltando no meio da série.
+
+        Parâmetros:
+        -----------
+        client : COVID19APIClient
+            Cliente usado para paginar a API.
+        force : bool
+            Ignora o intervalo mínimo entre sincronizações.
+
+        Retorna:
+        --------
+        int
+            Quantidade de linhas novas gravadas.
+
+        Levanta:
+        --------
+        IncompletePaginationError
+            Se alguma página do delta não puder ser baixada.
+        """
+        with self._lock:
+            if not force and not self.needs_sync():
+                return 0
+
+            latest = self.latest_date()
+            params = {"place_type": "state"}
+            if latest is not None:
+                params[BRASIL_IO_DATE_FROM_PARAM] = (latest + pd.Timedelta(days=1)).strftime("%Y-%m-%d")
+            new_chunks = []
+            for chunk in client.iter_brasil_pages(params):
+                if latest is not None:
+                    fresh = chunk[chunk["date"] > latest]
+                    if not fresh.empty:
+                        new_chunks.append(fresh)
+                    if len(fresh) < len(chunk):
+                        break
+                else:
+                    new_chunks.append(chunk)
+
+            self._last_sync = time.monotonic()
+            if not new_chunks:
+                return 0
+
+            delta = concat_caso_full(new_chunks)
+            self.append(delta)
+            return len(delta)
+
+
+def get_store(path):
+    """Retorna o store do caminho informado, compartilhado por todo o processo."""
+    key = str(Path(path).resolve())
+    with _stores_lock:
+        if key not in _stores:
+            _stores[key] = TimeSeriesStore(path)
+        return _stores[key]
@@ -2,13 +2,92 @@
 
 """Constantes utilizadas no projeto"""
 
-# URLs das APIs
-BRASIL_IO_API_URL = "https://api.brasil.io/v1/dataset/covid19"
-WORLD_COVID_API_URL = "https://disease.sh/v3/covid-19"
+import os
+from urllib.parse import urlparse
+
+# URLs das APIs (sobrescrevíveis para apontar para um servidor local, ex.: src/data/stub_server.py)
+BRASIL_IO_API_URL = os.getenv('COVID19_BRASIL_IO_API_URL', "https://api.brasil.io/v1/dataset/covid19").rstrip('/')
+WORLD_COVID_API_URL = os.getenv('COVID19_WORLD_API_URL', "https://disease.sh/v3/covid-19").rstrip('/')
+
+# Tamanho de página pedido ao Brasil.io ao percorrer /caso_full/data
+BRASIL_IO_PAGE_SIZE = 1000
+BRASIL_IO_MAX_PAGE_SIZE = 10000  # Maior página aceita pela API
+
+# Filtros de período enviados ao Brasil.io (datas no formato AAAA-MM-DD, inclusivos)
+BRASIL_IO_DATE_FROM_PARAM = 'date__gte'
+BRASIL_IO_DATE_TO_PARAM = 'date__lte'
+
+# Pool de conexões HTTP compartilhado (keep-alive) entre clientes e sessões
+HTTP_POOL_CONNECTIONS = int(os.getenv('COVID19_HTTP_POOL_CONNECTIONS', '4'))  # Hosts distintos mantidos no pool
+HTTP_POOL_MAXSIZE = int(os.getenv('COVID19_HTTP_POOL_MAXSIZE', '10'))  # Conexões simultâneas por host
+HTTP_POOL_BLOCK = os.getenv('COVID19_HTTP_POOL_BLOCK', 'true').lower() == 'true'  # Aguarda conexão livre ao atingir o limite
+
+# Cache de respostas HTTP revalidadas com GET condicional (ETag / Last-Modified)
+RESPONSE_CACHE_MAX_ENTRIES = int(os.getenv('COVID19_RESPONSE_CACHE_MAX_ENTRIES', '128'))
+RESPONSE_CACHE_MAX_BYTES = int(os.getenv('COVID19_RESPONSE_CACHE_MAX_MB', '64')) * 1024 * 1024
+
+# Circuit breaker e orçamento de latência das APIs externas
+CIRCUIT_FAILURE_THRESHOLD = 3  # Falhas consecutivas que abrem o circuito
+CIRCUIT_RECOVERY_SECONDS = 30  # Tempo com o circuito aberto antes da requisição de teste
+RENDER_DEADLINE_SECONDS = float(os.getenv('COVID19_RENDER_DEADLINE_SECONDS', '8'))  # Orçamento de rede por render
+REFRESH_DEADLINE_SECONDS = 60  # Orçamento de cada carga do serviço de dados em segundo plano
+
+# Limite de taxa por host (token bucket): (requisições por segundo, rajada máxima)
+RATE_LIMITS = {
+    urlparse(BRASIL_IO_API_URL).netloc: (
+        float(os.getenv('COVID19_RATE_LIMIT_BRASIL_IO', '2')),
+        int(os.getenv('COVID19_RATE_BURST_BRASIL_IO', '4')),
+    ),
+    urlparse(WORLD_COVID_API_URL).netloc: (
+        float(os.getenv('COVID19_RATE_LIMIT_WORLD', '10')),
+        int(os.getenv('COVID19_RATE_BURST_WORLD', '20')),
+    ),
+}
+RATE_LIMIT_DB_PATH = os.getenv('COVID19_RATE_LIMIT_DB')  # SQLite compartilhado entre réplicas locais (opcional)
+
+# Cache de figuras Plotly prontas (por versão dos dados e filtros)
+FIGURE_CACHE_MAX_ENTRIES = int(os.getenv('COVID19_FIGURE_CACHE_MAX_ENTRIES', '64'))
+FIGURE_CACHE_MAX_BYTES = int(os.getenv('COVID19_FIGURE_CACHE_MAX_MB', '32')) * 1024 * 1024
+
+# Pontos por trace nos gráficos de séries temporais (LTTB): largura do gráfico × pontos por pixel. 0 desativa
+CHART_WIDTH_PX = int(os.getenv('COVID19_CHART_WIDTH_PX', '1000'))  # Gráfico com use_container_width em tela larga
+DOWNSAMPLE_POINTS_PER_PIXEL = float(os.getenv('COVID19_POINTS_PER_PIXEL', '0.5'))
+
+# Motor de renderização dos gráficos de linha: 'auto' (WebGL acima do limite de pontos), 'svg' ou 'webgl'
+RENDER_ENGINE = os.getenv('COVID19_RENDER_ENGINE', 'auto').lower()
+WEBGL_POINT_THRESHOLD = int(os.getenv('COVID19_WEBGL_POINT_THRESHOLD', '5000'))  # Pontos no gráfico (todos os traces)
+
+# Rastreamento de tempos por rerun (painel na sidebar + linha JSON no log); a sidebar também liga por sessão
+TRACING_ENABLED = os.getenv('COVID19_TRACING', 'false').lower() == 'true'
+
+# Métricas no formato do Prometheus: endpoint HTTP local e/ou arquivo regravado periodicamente (opcionais)
+METRICS_PORT = int(os.getenv('COVID19_METRICS_PORT', '0'))  # 0 desativa o endpoint /metrics
+METRICS_HOST = os.getenv('COVID19_METRICS_HOST', '127.0.0.1')
+METRICS_FILE_PATH = os.getenv('COVID19_METRICS_FILE')  # Ex.: para o textfile collector do node_exporter
+METRICS_FILE_INTERVAL = float(os.getenv('COVID19_METRICS_FILE_INTERVAL', '15'))  # Segundos entre gravações
+
+# Limite global de requisições HTTP simultâneas no processo (usado por fetch_many)
+MAX_CONCURRENT_REQUESTS = int(os.getenv('COVID19_MAX_CONCURRENT_REQUESTS', '6'))
 
 # Configurações de atualização
 UPDATE_INTERVAL = 300000  # 5 minutos em millisegundos
 
+# Store local de séries temporais (Parquet); desativado quando a variável não existe
+TIME_SERIES_STORE_PATH = os.getenv('COVID19_STORE_PATH')
+STORE_SYNC_INTERVAL = UPDATE_INTERVAL / 1000  # Intervalo mínimo entre sincronizações, em segundos
+
+# Serviço de dados em segundo plano
+DATA_SERVICE_WARMUP_SECONDS = float(os.getenv('COVID19_WARMUP_SECONDS', '5'))  # Espera só antes da 1ª carga
+WORLD_SNAPSHOT_LIMIT = 250  # Guarda todos os países; as páginas recortam o que precisam
+
+# Modo municípios (place_type=city): ~5.570 cidades, carregadas por estado só quando pedidas
+CITY_MEMORY_BUDGET_BYTES = int(os.getenv('COVID19_CITY_MEMORY_MB', '256')) * 1024 * 1024  # Teto das séries em memória
+CITY_HISTORY_DAYS = int(os.getenv('COVID19_CITY_HISTORY_DAYS', '365'))  # Dias de série por estado
+CITY_FAILURE_TTL = float(os.getenv('COVID19_CITY_FAILURE_TTL', '60'))  # Segundos sem nova tentativa após uma falha
+
+# Janelas (em dias) das médias móveis calculadas para casos e óbitos
+MOVING_AVERAGE_WINDOWS = (7, 14, 28)
+
 # Cores para gráficos
 COLORS = {
     'primary': '#007bff',
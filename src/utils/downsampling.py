@@ -0,0 +1,151 @@
+# Redução de pontos de séries temporais para gráficos (LTTB vetorizado)
+
+import numpy as np
+
+from src.utils.constants import CHART_WIDTH_PX, DOWNSAMPLE_POINTS_PER_PIXEL
+
+
+def _as_float(values):
+    """Converte datas/números em float64 (datas viram nanossegundos desde a época)."""
+    values = np.asarray(values)
+    if np.issubdtype(values.dtype, np.datetime64):
+        values = values.astype("datetime64[ns]").astype("int64")
+    return values.astype("float64")
+
+
+def lttb_indices(x, y, n_out):
+    """Índices dos pontos mantidos pelo Largest-Triangle-Three-Buckets.
+
+    O primeiro e o último ponto são sempre mantidos; os demais são divididos
+    em `n_out - 2` baldes e, em cada balde, fica o ponto que forma o maior
+    triângulo com as médias dos baldes vizinhos — picos e vales sobrevivem,
+    trechos planos são resumidos.
+
+    Todos os baldes são avaliados de uma vez (matriz baldes × pontos), sem
+    laço em Python. Por isso o vértice anterior do triângulo é a média do
+    balde anterior, e não o ponto escolhido nele como no LTTB sequencial;
+    na prática os pontos escolhidos são os mesmos nos picos.
+
+    Parâmetros:
+    -----------
+    x : array-like
+        Eixo x ordenado (números ou datas).
+    y : array-like
+        Valores finitos (sem NaN).
+    n_out : int
+        Quantidade máxima de pontos no resultado.
+
+    Retorna:
+    --------
+    numpy.ndarray
+        Índices crescentes dos pontos mantidos (todos, se já couberem).
+    """
+    n = len(x)
+    if n_out is None or n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    x = _as_float(x)
+    x = x - x[0]  # Reduz a magnitude (datas em ns) antes das multiplicações
+    y = _as_float(y)
+
+    # Baldes [starts[i], stops[i]) cobrindo os pontos internos 1 .. n-2
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    starts, stops = edges[:-1], edges[1:]
+    lengths = stops - starts
+
+    offsets = np.arange(lengths.max())
+    idx = starts[:, None] + offsets[None, :]
+    valid = offsets[None, :] < lengths[:, None]
+    idx = np.where(valid, idx, (stops - 1)[:, None])
+
+    bx, by = x[idx], y[idx]
+    avg_x = np.where(valid, bx, 0.0).sum(axis=1) / lengths
+    avg_y = np.where(valid, by, 0.0).sum(axis=1) / lengths
+
+    # Vértices A (balde anterior) e C (balde seguinte) de cada triângulo
+    ax, ay = np.r_[x[0], avg_x[:-1]][:, None], np.r_[y[0], avg_y[:-1]][:, None]
+    cx, cy = np.r_[avg_x[1:], x[-1]][:, None], np.r_[avg_y[1:], y[-1]][:, None]
+
+    area = np.abs((ax - cx) * (by - ay) - (ax - bx) * (cy - ay))
+    area = np.where(valid, area, -1.0)
+    chosen = idx[np.arange(len(idx)), area.argmax(axis=1)]
+    return np.r_[0, chosen, n - 1]
+
+
+def points_for_width(width_px=CHART_WIDTH_PX, points_per_pixel=DOWNSAMPLE_POINTS_PER_PIXEL):
+    """Pontos por trace adequados a um gráfico de `width_px` pixels (0 desativa a redução)."""
+    if not width_px or points_per_pixel <= 0:
+        return 0
+    return max(3, int(width_px * points_per_pixel))
+
+
+def downsample_xy(x, y, n_out=None, width_px=CHART_WIDTH_PX):
+    """Versão reduzida de uma série (x, y) para um trace; NaN em y são descartados.
+
+    Parâmetros:
+    -----------
+    x, y : array-like
+        Eixo x ordenado e valores.
+    n_out : int | None
+        Pontos no resultado (padrão: `points_for_width(width_px)`; 0 desativa a redução).
+    width_px : int
+        Largura do gráfico em pixels, usada quando `n_out` não é informado.
+
+    Retorna:
+    --------
+    tuple[numpy.ndarray, numpy.ndarray]
+        (x, y) com no máximo `n_out` pontos.
+    """
+    if n_out is None:
+        n_out = points_for_width(width_px)
+    x, y = np.asarray(x), np.asarray(y)
+    if not n_out or len(x) <= n_out:
+        return x, y
+    finite = ~np.isnan(_as_float(y))
+    x, y = x[finite], y[finite]
+    keep = lttb_indices(x, y, n_out)
+    return x[keep], y[keep]
+
+
+def downsample_frame(df, x, y, n_out=None, group_col=None, width_px=CHART_WIDTH_PX):
+    """Linhas de `df` mantidas pelo LTTB em `y`, com no máximo `n_out` pontos por grupo.
+
+    Útil para `px.line(..., color=group_col)`: cada grupo (ex.: estado)
+    vira um trace com no máximo `n_out` pontos.
+
+    Parâmetros:
+    -----------
+    df : pandas.DataFrame
+        Dados ordenados por `x` dentro de cada grupo.
+    x, y : str
+        Colunas do eixo x e do valor.
+    n_out : int | None
+        Pontos por trace (padrão: `points_for_width(width_px)`; 0 devolve `df` inteiro).
+    group_col : str | None
+        Coluna que separa os traces.
+    width_px : int
+        Largura do gráfico em pixels, usada quando `n_out` não é informado.
+
+    Retorna:
+    --------
+    pandas.DataFrame
+        Subconjunto das linhas de `df`, na ordem original.
+    """
+    if n_out is None:
+        n_out = points_for_width(width_px)
+    if df is None or df.empty or not n_out:
+        return df
+
+    groups = df.groupby(group_col, observed=True, sort=False).indices.values() if group_col else [np.arange(len(df))]
+    y_values = _as_float(df[y].to_numpy())
+    x_values = df[x].to_numpy()
+
+    keep = []
+    for positions in groups:
+        if len(positions) <= n_out:
+            keep.append(positions)
+            continue
+        positions = positions[~np.isnan(y_values[positions])]
+        keep.append(positions[lttb_indices(x_values[positions], y_values[positions], n_out)])
+
+    return df.iloc[np.sort(np.concatenate(keep))] if keep else df
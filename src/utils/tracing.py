@@ -0,0 +1,213 @@
+# Spans de tempo aninhados por rerun (rede, transformações pandas, figuras Plotly)
+
+import contextvars
+import functools
+import json
+import threading
+import time
+from contextlib import contextmanager
+
+# Span aberto no contexto atual; None = rastreamento desligado (caminho rápido)
+_current_span = contextvars.ContextVar("covid19_current_span", default=None)
+
+# Categorias usadas no resumo do painel
+KIND_LABELS = {
+    "network": "Rede (APIs)",
+    "pandas": "Transformações (pandas)",
+    "figure": "Construção de figuras",
+    "chart": "Envio dos gráficos (st.plotly_chart)",
+    None: "Outros",
+}
+
+
+class Span:
+    """Intervalo de tempo nomeado, com os spans filhos abertos dentro dele."""
+
+    __slots__ = ("name", "kind", "attrs", "start", "end", "children", "thread")
+
+    def __init__(self, name, kind=None, attrs=None):
+        self.name = name
+        self.kind = kind
+        self.attrs = attrs or {}
+        self.start = time.perf_counter()
+        self.end = None
+        self.children = []
+        self.thread = threading.current_thread().name
+
+    @property
+    def duration(self):
+        return (self.end if self.end is not None else time.perf_counter()) - self.start
+
+    @property
+    def self_time(self):
+        """Tempo fora dos filhos (zero se os filhos rodaram em paralelo e somam mais que o span)."""
+        return max(0.0, self.duration - sum(child.duration for child in self.children))
+
+    def to_dict(self):
+        data = {"name": self.name, "ms": round(self.duration * 1000, 3)}
+        if self.kind:
+            data["kind"] = self.kind
+        if self.attrs:
+            data["attrs"] = self.attrs
+        if self.children:
+            data["children"] = [child.to_dict() for child in self.children]
+        return data
+
+
+class _NoopSpan:
+    """Usado quando não há rastreamento ativo: entrar e sair não custa nada."""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return None
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NOOP = _NoopSpan()
+
+
+class _ActiveSpan:
+    __slots__ = ("parent", "span", "token")
+
+    def __init__(self, parent, name, kind, attrs):
+        self.parent = parent
+        self.span = Span(name, kind, attrs)
+
+    def __enter__(self):
+        self.span.start = time.perf_counter()
+        self.parent.children.append(self.span)  # list.append é atômico: filhos podem vir de outras threads
+        self.token = _current_span.set(self.span)
+        return self.span
+
+    def __exit__(self, exc_type, exc, tb):
+        self.span.end = time.perf_counter()
+        if exc_type is not None:
+            self.span.attrs["error"] = exc_type.__name__
+        _current_span.reset(self.token)
+        return False
+
+
+def tracing_active():
+    """True se há um rastreamento em andamento no contexto atual."""
+    return _current_span.get() is not None
+
+
+def span(name, kind=None, **attrs):
+    """Context manager que mede um trecho como filho do span atual (no-op sem rastreamento)."""
+    parent = _current_span.get()
+    if parent is None:
+        return _NOOP
+    return _ActiveSpan(parent, name, kind, attrs)
+
+
+def traced(name=None, kind=None):
+    """Decorator que mede cada chamada da função como um span.
+
+    Sem rastreamento ativo o custo é uma leitura de ContextVar por chamada.
+    Pode ser usado como `@traced` ou `@traced("nome", kind="pandas")`; o nome
+    padrão é `modulo.funcao`.
+    """
+    def decorate(fn):
+        module = fn.__module__.rsplit('.', 1)[-1]
+        label = name or (fn.__qualname__ if module == "__main__" else f"{module}.{fn.__qualname__}")
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            parent = _current_span.get()
+            if parent is None:
+                return fn(*args, **kwargs)
+            with _ActiveSpan(parent, label, kind, {}):
+                return fn(*args, **kwargs)
+
+        return wrapper
+
+    if callable(name):
+        fn, name = name, None
+        return decorate(fn)
+    return decorate
+
+
+@contextmanager
+def start_trace(name, **attrs):
+    """Abre o span raiz de um rastreamento (ex.: um rerun) e o entrega ao bloco.
+
+    Funções decoradas com `traced` e blocos `span` executados dentro do bloco
+    — inclusive em threads que recebem uma cópia do contexto, como
+    `fetch_many` — viram filhos dele.
+    """
+    root = Span(name, attrs=attrs)
+    token = _current_span.set(root)
+    try:
+        yield root
+    finally:
+        root.end = time.perf_counter()
+        _current_span.reset(token)
+
+
+def flatten(root):
+    """Lista os spans em pré-ordem, com profundidade, duração e tempo próprio (ms).
+
+    Retorna:
+    --------
+    list[dict]
+        Uma linha por span: depth, name, kind, ms, self_ms, pct (do total), thread e attrs.
+    """
+    total = root.duration or 1e-12
+    rows = []
+
+    def visit(node, depth):
+        rows.append({
+            "depth": depth,
+            "name": node.name,
+            "kind": node.kind,
+            "ms": node.duration * 1000,
+            "self_ms": node.self_time * 1000,
+            "pct": node.duration / total * 100,
+            "thread": node.thread,
+            "attrs": node.attrs,
+        })
+        for child in node.children:
+            visit(child, depth + 1)
+
+    visit(root, 0)
+    return rows
+
+
+def time_by_kind(root):
+    """Tempo próprio somado por categoria; spans sem categoria herdam a do pai.
+
+    Retorna:
+    --------
+    dict
+        {categoria: segundos}, com None para o tempo fora de qualquer categoria.
+    """
+    totals = {}
+
+    def visit(node, inherited):
+        kind = node.kind or inherited
+        totals[kind] = totals.get(kind, 0.0) + node.self_time
+        for child in node.children:
+            visit(child, kind)
+
+    visit(root, None)
+    return totals
+
+
+def trace_record(root):
+    """Registro estruturado de um rastreamento (pronto para `json.dumps`)."""
+    return {
+        "event": "trace",
+        "name": root.name,
+        "attrs": root.attrs,
+        "total_ms": round(root.duration * 1000, 3),
+        "by_kind_ms": {kind or "other": round(seconds * 1000, 3) for kind, seconds in time_by_kind(root).items()},
+        "spans": [child.to_dict() for child in root.children],
+    }
+
+
+def log_trace(root):
+    """Escreve o rastreamento como uma linha JSON no stdout (junto dos demais logs do app)."""
+    print(json.dumps(trace_record(root), ensure_ascii=False, default=str), flush=True)
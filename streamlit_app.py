@@ -2,11 +2,10 @@
 
 import streamlit as st
 import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
 import sys
 import os
+import time
+from contextlib import nullcontext
 
 # Verificação de saúde para Streamlit Cloud
 def health_check():
@@ -30,11 +29,19 @@ sys.path.append(current_dir)
 # Importações condicionais para evitar falhas de inicialização
 try:
     from src.data.api_client import COVID19APIClient
-    from src.utils.helpers import format_number as _format_number
-    from src.components.advanced_analytics import (
-        create_time_series_charts, create_moving_averages_chart, 
-        create_per_capita_analysis, create_brazil_charts, create_regional_analysis
+    from src.data.ingestion import ingest_caso_full
+    from src.data.data_processor import calculate_totals, calculate_mortality_rate, enrich_state_metrics
+    from src.data.data_service import DataService
+    from src.data.city_data import get_shared_city_data
+    from src.data.metrics import RERUN_SECONDS, record_cache, record_fallback, start_exporters
+    from src.data.resilience import breaker_states, deadline
+    from src.components.figure_cache import cached_figure
+    from src.components.trace_panel import plotly_chart, render_trace_panel
+    from src.utils.constants import (
+        DATA_SERVICE_WARMUP_SECONDS, ESTADOS_BRASIL, RENDER_DEADLINE_SECONDS, TRACING_ENABLED
     )
+    from src.utils.tracing import log_trace, start_trace, traced
+    from src.utils.helpers import format_number as _format_number
     IMPORTS_SUCCESS = True
 except ImportError as e:
     st.error(f"❌ Erro ao importar módulos: {str(e)}")
@@ -83,29 +90,35 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
-@st.cache_data(ttl=300)  # Cache por 5 minutos
+@st.cache_resource
+def get_data_service():
+    """Serviço de dados único do processo, atualizado em segundo plano a cada UPDATE_INTERVAL"""
+    start_exporters()
+    return DataService().start()
+
 def load_brasil_data():
-    """Carrega dados do Brasil com cache e tratamento de erro robusto"""
+    """Carrega dados do Brasil do snapshot em memória (sem esperar pela API)"""
     try:
-        client = COVID19APIClient()
-        data = client.get_brasil_data()
-        if data is not None and not data.empty:
-            return data
+        snapshot = get_data_service().get('brasil', wait=DATA_SERVICE_WARMUP_SECONDS)
+        record_cache('brasil', snapshot is not None)
+        if snapshot is not None:
+            record_fallback('brasil', False)
+            return snapshot.data
         else:
-            # Retorna dados de fallback se a API falhar
-            return get_fallback_brasil_data()
+            # Retorna dados de fallback enquanto a primeira carga não termina ou se a API falhar
+            return enrich_state_metrics(get_fallback_brasil_data())
     except Exception as e:
         st.warning(f"⚠️ Erro ao carregar dados do Brasil: {str(e)}")
-        return get_fallback_brasil_data()
+        return enrich_state_metrics(get_fallback_brasil_data())
 
-@st.cache_data(ttl=300)
 def load_world_data(limit=10):
-    """Carrega dados mundiais com cache e tratamento de erro robusto"""
+    """Carrega dados mundiais do snapshot em memória (sem esperar pela API)"""
     try:
-        client = COVID19APIClient()
-        data = client.get_world_top_countries(limit)
-        if data is not None and not data.empty:
-            return data
+        snapshot = get_data_service().get('world', wait=DATA_SERVICE_WARMUP_SECONDS)
+        record_cache('world', snapshot is not None)
+        if snapshot is not None:
+            record_fallback('world', False)
+            return snapshot.data.head(limit).copy()
         else:
             # Retorna dados de fallback se a API falhar
             return get_fallback_world_data(limit)
@@ -113,13 +126,27 @@ def load_world_data(limit=10):
         st.warning(f"⚠️ Erro ao carregar dados mundiais: {str(e)}")
         return get_fallback_world_data(limit)
 
-@st.cache_data(ttl=300)
 def load_countries_data(countries):
-    """Carrega dados de países específicos com cache e tratamento de erro robusto"""
+    """Carrega dados de países específicos, do snapshot mundial quando todos estiverem nele"""
+    snapshot = get_data_service().get('world')
+    if snapshot is not None:
+        df_world = snapshot.data
+        df_selected = df_world[df_world['country'].isin(countries)]
+        if len(df_selected) == len(set(countries)):
+            record_cache('countries', True)
+            record_fallback('countries', False)
+            return df_selected.copy()
+    return fetch_countries_data(countries)
+
+@st.cache_data(ttl=300)
+def fetch_countries_data(countries):
+    """Busca países específicos na API com cache e tratamento de erro robusto"""
+    record_cache('countries', False)  # Só roda quando nem o snapshot nem o st.cache_data têm os países
     try:
         client = COVID19APIClient()
         data = client.get_world_countries_data(countries)
         if data is not None and not data.empty:
+            record_fallback('countries', False)
             return data
         else:
             # Retorna dados de fallback se a API falhar
@@ -128,8 +155,26 @@ def load_countries_data(countries):
         st.warning(f"⚠️ Erro ao carregar dados de países específicos: {str(e)}")
         return get_fallback_countries_data(countries)
 
+def load_analises_data():
+    """Dados da página de Análises Avançadas (atuais, históricos, séries e médias móveis)"""
+    snapshot = get_data_service().get('analises', wait=DATA_SERVICE_WARMUP_SECONDS)
+    record_cache('analises', snapshot is not None)
+    record_fallback('analises', snapshot is None)
+    if snapshot is not None:
+        return snapshot.data
+    return None, None, None, None
+
+def load_city_data(state):
+    """Série dos municípios de um estado, carregada só quando o estado é escolhido (cache por processo)"""
+    try:
+        return get_shared_city_data().get(state)
+    except Exception as e:
+        st.warning(f"⚠️ Erro ao carregar dados dos municípios: {str(e)}")
+        return None
+
 def get_fallback_brasil_data():
     """Retorna dados de fallback para o Brasil quando a API não está disponível"""
+    record_fallback('brasil')
     import pandas as pd
     
     # Dados simulados baseados em dados reais aproximados
@@ -144,12 +189,13 @@ def get_fallback_brasil_data():
         'date': ['2024-01-15'] * 10
     }
     
-    df = pd.DataFrame(fallback_data)
+    df = ingest_caso_full(pd.DataFrame(fallback_data))
     st.info("📊 Exibindo dados de demonstração (API indisponível)")
     return df
 
 def get_fallback_world_data(limit=10):
     """Retorna dados de fallback para países quando a API não está disponível"""
+    record_fallback('world')
     import pandas as pd
     
     # Dados simulados baseados em dados reais aproximados
@@ -168,6 +214,7 @@ def get_fallback_world_data(limit=10):
 
 def get_fallback_countries_data(countries):
     """Retorna dados de fallback para países específicos quando a API não está disponível"""
+    record_fallback('countries')
     import pandas as pd
     
     # Dados simulados para países específicos
@@ -212,8 +259,11 @@ def create_metric_card(label, value, css_class=""):
     </div>
     """
 
+@traced
 def dashboard_brasil():
     """Dashboard específico do Brasil"""
+    import plotly.express as px  # Carregado só quando a página desenha gráficos
+    
     st.header("COVID-19 - Brasil")
     st.markdown("Análise completa dos dados da COVID-19 no território brasileiro")
     
@@ -226,13 +276,14 @@ def dashboard_brasil():
         return
     
     # Calcular métricas nacionais
-    total_casos = df_estados['last_available_confirmed'].sum()
-    total_obitos = df_estados['last_available_deaths'].sum()
-    casos_novos = df_estados['new_confirmed'].sum() if 'new_confirmed' in df_estados.columns else 0
-    obitos_novos = df_estados['new_deaths'].sum() if 'new_deaths' in df_estados.columns else 0
+    totais = calculate_totals(df_estados)
+    total_casos = totais['total_cases']
+    total_obitos = totais['total_deaths']
+    casos_novos = totais['new_cases']
+    obitos_novos = totais['new_deaths']
     
     # Métricas calculadas
-    taxa_mortalidade = (total_obitos / total_casos * 100) if total_casos > 0 else 0
+    taxa_mortalidade = calculate_mortality_rate(total_casos, total_obitos)
     client = COVID19APIClient()
     populacao_afetada = (total_casos / client.brasil_populacao * 100) if total_casos > 0 else 0
     incidencia = (total_casos / client.brasil_populacao * 100000) if total_casos > 0 else 0
@@ -280,28 +331,16 @@ def dashboard_brasil():
         st.metric("Incidência (por 100k hab)", f"{incidencia:,.0f}")
     
     with col8:
-        if 'date' in df_estados.columns:
-            max_date = df_estados['date'].max()
-            # Verificar se é string ou datetime
-            if isinstance(max_date, str):
-                try:
-                    # Tentar converter string para datetime e depois formatar
-                    from datetime import datetime
-                    date_obj = pd.to_datetime(max_date)
-                    ultima_data = date_obj.strftime('%d/%m/%Y')
-                except:
-                    # Se não conseguir converter, usar a string diretamente
-                    ultima_data = max_date
-            else:
-                # Se já é datetime, usar strftime normalmente
-                ultima_data = max_date.strftime('%d/%m/%Y')
+        if 'date' in df_estados.columns and pd.notna(df_estados['date'].max()):
+            # `date` já chega como datetime pela ingestão tipada
+            ultima_data = df_estados['date'].max().strftime('%d/%m/%Y')
         else:
             ultima_data = "N/A"
         st.metric("Última Atualização", ultima_data)
     
     st.markdown("---")
     
-    # Gráficos
+    # Gráficos (figuras reaproveitadas entre reruns enquanto dados e filtros não mudam)
     st.subheader("📊 Análises por Estados")
     
     # Top 10 Estados
@@ -309,52 +348,64 @@ def dashboard_brasil():
     
     with col1:
         st.markdown("**Top 10 Estados - Casos Confirmados**")
-        top_casos = df_estados.nlargest(10, 'last_available_confirmed')
-        fig_casos = px.bar(
-            top_casos,
-            x='last_available_confirmed',
-            y='state_name' if 'state_name' in top_casos.columns else 'state',
-            orientation='h',
-            labels={'last_available_confirmed': 'Casos Confirmados', 'state_name': 'Estado'},
-            color='last_available_confirmed',
-            color_continuous_scale='Blues'
-        )
-        fig_casos.update_layout(height=400, showlegend=False)
-        st.plotly_chart(fig_casos, use_container_width=True)
+        def build_casos():
+            top_casos = df_estados.nlargest(10, 'last_available_confirmed')
+            fig_casos = px.bar(
+                top_casos,
+                x='last_available_confirmed',
+                y='state_name' if 'state_name' in top_casos.columns else 'state',
+                orientation='h',
+                labels={'last_available_confirmed': 'Casos Confirmados', 'state_name': 'Estado'},
+                color='last_available_confirmed',
+                color_continuous_scale='Blues'
+            )
+            fig_casos.update_layout(height=400, showlegend=False)
+            return fig_casos
+        fig_casos = cached_figure('brasil.top_casos', df_estados, build_casos)
+        plotly_chart(fig_casos, use_container_width=True)
     
     with col2:
         st.markdown("**Top 10 Estados - Óbitos**")
-        top_obitos = df_estados.nlargest(10, 'last_available_deaths')
-        fig_obitos = px.bar(
-            top_obitos,
-            x='last_available_deaths',
-            y='state_name' if 'state_name' in top_obitos.columns else 'state',
-            orientation='h',
-            labels={'last_available_deaths': 'Óbitos', 'state_name': 'Estado'},
-            color='last_available_deaths',
-            color_continuous_scale='Reds'
-        )
-        fig_obitos.update_layout(height=400, showlegend=False)
-        st.plotly_chart(fig_obitos, use_container_width=True)
+        def build_obitos():
+            top_obitos = df_estados.nlargest(10, 'last_available_deaths')
+            fig_obitos = px.bar(
+                top_obitos,
+                x='last_available_deaths',
+                y='state_name' if 'state_name' in top_obitos.columns else 'state',
+                orientation='h',
+                labels={'last_available_deaths': 'Óbitos', 'state_name': 'Estado'},
+                color='last_available_deaths',
+                color_continuous_scale='Reds'
+            )
+            fig_obitos.update_layout(height=400, showlegend=False)
+            return fig_obitos
+        fig_obitos = cached_figure('brasil.top_obitos', df_estados, build_obitos)
+        plotly_chart(fig_obitos, use_container_width=True)
     
     # Taxa de mortalidade por estado
     st.markdown("**Taxa de Mortalidade por Estado**")
-    df_estados['taxa_mortalidade'] = (df_estados['last_available_deaths'] / df_estados['last_available_confirmed'] * 100).fillna(0)
-    top_mortalidade = df_estados.nlargest(15, 'taxa_mortalidade')
-    
-    fig_mortalidade = px.bar(
-        top_mortalidade,
-        x='state_name' if 'state_name' in top_mortalidade.columns else 'state',
-        y='taxa_mortalidade',
-        labels={'taxa_mortalidade': 'Taxa de Mortalidade (%)', 'state_name': 'Estado'},
-        color='taxa_mortalidade',
-        color_continuous_scale='Oranges'
-    )
-    fig_mortalidade.update_layout(height=400, showlegend=False)
-    st.plotly_chart(fig_mortalidade, use_container_width=True)
+    df_estados = enrich_state_metrics(df_estados)  # Sem custo quando já veio enriquecido do loader
+    def build_mortalidade():
+        top_mortalidade = df_estados.nlargest(15, 'taxa_mortalidade')
+    
+        fig_mortalidade = px.bar(
+            top_mortalidade,
+            x='state_name' if 'state_name' in top_mortalidade.columns else 'state',
+            y='taxa_mortalidade',
+            labels={'taxa_mortalidade': 'Taxa de Mortalidade (%)', 'state_name': 'Estado'},
+            color='taxa_mortalidade',
+            color_continuous_scale='Oranges'
+        )
+        fig_mortalidade.update_layout(height=400, showlegend=False)
+        return fig_mortalidade
+    fig_mortalidade = cached_figure('brasil.taxa_mortalidade', df_estados, build_mortalidade)
+    plotly_chart(fig_mortalidade, use_container_width=True)
 
+@traced
 def dashboard_comparacao():
     """Dashboard de comparação mundial"""
+    import plotly.express as px  # Carregado só quando a página desenha gráficos
+    
     st.header("🌍 COVID-19 - Comparação Mundial")
     st.markdown("Análise comparativa entre o Brasil e outros países")
     
@@ -386,50 +437,59 @@ def dashboard_comparacao():
         st.error("❌ Não foi possível carregar os dados mundiais.")
         return
     
-    # Top países (excluindo Brasil)
+    # Top países (excluindo Brasil); figuras vêm do cache enquanto os dados não mudam
     st.subheader("🏆 Top 5 Países (excluindo Brasil)")
     
     col1, col2, col3 = st.columns(3)
     
     with col1:
         st.markdown("**Casos Confirmados**")
-        fig_casos = px.bar(
-            df_world.head(5),
-            x='country',
-            y='cases',
-            labels={'cases': 'Casos', 'country': 'País'},
-            color='cases',
-            color_continuous_scale='Blues'
-        )
-        fig_casos.update_layout(height=300, showlegend=False)
-        st.plotly_chart(fig_casos, use_container_width=True)
+        def build_casos():
+            fig_casos = px.bar(
+                df_world.head(5),
+                x='country',
+                y='cases',
+                labels={'cases': 'Casos', 'country': 'País'},
+                color='cases',
+                color_continuous_scale='Blues'
+            )
+            fig_casos.update_layout(height=300, showlegend=False)
+            return fig_casos
+        fig_casos = cached_figure('mundo.top_casos', df_world, build_casos)
+        plotly_chart(fig_casos, use_container_width=True)
     
     with col2:
         st.markdown("**Óbitos**")
-        fig_obitos = px.bar(
-            df_world.head(5),
-            x='country',
-            y='deaths',
-            labels={'deaths': 'Óbitos', 'country': 'País'},
-            color='deaths',
-            color_continuous_scale='Reds'
-        )
-        fig_obitos.update_layout(height=300, showlegend=False)
-        st.plotly_chart(fig_obitos, use_container_width=True)
+        def build_obitos():
+            fig_obitos = px.bar(
+                df_world.head(5),
+                x='country',
+                y='deaths',
+                labels={'deaths': 'Óbitos', 'country': 'País'},
+                color='deaths',
+                color_continuous_scale='Reds'
+            )
+            fig_obitos.update_layout(height=300, showlegend=False)
+            return fig_obitos
+        fig_obitos = cached_figure('mundo.top_obitos', df_world, build_obitos)
+        plotly_chart(fig_obitos, use_container_width=True)
     
     with col3:
         st.markdown("**Taxa de Mortalidade**")
         df_world['mortality_rate'] = (df_world['deaths'] / df_world['cases'] * 100).fillna(0)
-        fig_mortalidade = px.bar(
-            df_world.head(5),
-            x='country',
-            y='mortality_rate',
-            labels={'mortality_rate': 'Taxa (%)', 'country': 'País'},
-            color='mortality_rate',
-            color_continuous_scale='Oranges'
-        )
-        fig_mortalidade.update_layout(height=300, showlegend=False)
-        st.plotly_chart(fig_mortalidade, use_container_width=True)
+        def build_mortalidade():
+            fig_mortalidade = px.bar(
+                df_world.head(5),
+                x='country',
+                y='mortality_rate',
+                labels={'mortality_rate': 'Taxa (%)', 'country': 'País'},
+                color='mortality_rate',
+                color_continuous_scale='Oranges'
+            )
+            fig_mortalidade.update_layout(height=300, showlegend=False)
+            return fig_mortalidade
+        fig_mortalidade = cached_figure('mundo.taxa_mortalidade', df_world, build_mortalidade)
+        plotly_chart(fig_mortalidade, use_container_width=True)
     
     # Comparação com países selecionados
     if df_countries is not None and not df_countries.empty:
@@ -456,65 +516,71 @@ def dashboard_comparacao():
             
             with col1:
                 st.markdown("**Casos por Milhão de Habitantes**")
-                fig_per_million = px.bar(
-                    df_comparison,
-                    x='country',
-                    y='casesPerOneMillion',
-                    labels={'casesPerOneMillion': 'Casos por Milhão', 'country': 'País'},
-                    color='casesPerOneMillion',
-                    color_continuous_scale='Viridis'
-                )
-                fig_per_million.update_layout(height=400, showlegend=False)
-                st.plotly_chart(fig_per_million, use_container_width=True)
+                def build_per_million():
+                    fig_per_million = px.bar(
+                        df_comparison,
+                        x='country',
+                        y='casesPerOneMillion',
+                        labels={'casesPerOneMillion': 'Casos por Milhão', 'country': 'País'},
+                        color='casesPerOneMillion',
+                        color_continuous_scale='Viridis'
+                    )
+                    fig_per_million.update_layout(height=400, showlegend=False)
+                    return fig_per_million
+                fig_per_million = cached_figure('mundo.casos_por_milhao', (df_countries, df_brasil), build_per_million, paises=tuple(paises_selecionados))
+                plotly_chart(fig_per_million, use_container_width=True)
             
             with col2:
                 st.markdown("**Óbitos por Milhão de Habitantes**")
-                fig_deaths_per_million = px.bar(
-                    df_comparison,
-                    x='country',
-                    y='deathsPerOneMillion',
-                    labels={'deathsPerOneMillion': 'Óbitos por Milhão', 'country': 'País'},
-                    color='deathsPerOneMillion',
-                    color_continuous_scale='Reds'
-                )
-                fig_deaths_per_million.update_layout(height=400, showlegend=False)
-                st.plotly_chart(fig_deaths_per_million, use_container_width=True)
+                def build_deaths_per_million():
+                    fig_deaths_per_million = px.bar(
+                        df_comparison,
+                        x='country',
+                        y='deathsPerOneMillion',
+                        labels={'deathsPerOneMillion': 'Óbitos por Milhão', 'country': 'País'},
+                        color='deathsPerOneMillion',
+                        color_continuous_scale='Reds'
+                    )
+                    fig_deaths_per_million.update_layout(height=400, showlegend=False)
+                    return fig_deaths_per_million
+                fig_deaths_per_million = cached_figure('mundo.obitos_por_milhao', (df_countries, df_brasil), build_deaths_per_million, paises=tuple(paises_selecionados))
+                plotly_chart(fig_deaths_per_million, use_container_width=True)
 
+@traced
 def dashboard_analises_avancadas():
     """Dashboard com análises avançadas dos dados de COVID-19 do Brasil"""
     
     st.header("📈 Análises Avançadas - COVID-19 Brasil")
     st.markdown("Análises detalhadas com séries temporais, mapas interativos e indicadores avançados")
     
-    # Inicializar cliente da API
-    api_client = COVID19APIClient()
+    # Componentes (e Plotly) carregados só quando esta página é aberta
+    try:
+        from src.components.advanced_analytics import (
+            create_time_series_charts, create_moving_averages_chart, 
+            create_per_capita_analysis, create_brazil_charts, create_regional_analysis,
+            create_city_analysis
+        )
+    except ImportError as e:
+        st.error(f"❌ Erro ao importar módulos: {str(e)}")
+        return
     
     # Carregar dados
     with st.spinner("Carregando dados..."):
         try:
-            # Dados atuais do Brasil
-            brasil_data = api_client.get_brasil_data()
-            
-            # Dados históricos (últimos 90 dias)
-            historical_data = api_client.get_brasil_historical_data(limit=2000)
-            
-            # Séries temporais
-            time_series_data = api_client.get_brasil_time_series(days=90)
-            
-            # Médias móveis
-            moving_averages = api_client.calculate_moving_averages(time_series_data)
+            brasil_data, historical_data, time_series_data, moving_averages = load_analises_data()
             
         except Exception as e:
             st.error(f"Erro ao carregar dados: {str(e)}")
             return
     
     # Tabs para organizar as análises
-    tab1, tab2, tab3, tab4, tab5 = st.tabs([
+    tab1, tab2, tab3, tab4, tab5, tab6 = st.tabs([
         "📊 Séries Temporais", 
         "📊 Análise Comparativa", 
         "👥 Análise Per Capita", 
         "📈 Médias Móveis",
-        "🗺️ Análise Regional"
+        "🗺️ Análise Regional",
+        "🏙️ Municípios"
     ])
     
     with tab1:
@@ -561,6 +627,38 @@ def dashboard_analises_avancadas():
             create_regional_analysis(brasil_data)
         else:
             st.warning("Dados regionais não disponíveis")
+    
+    with tab6:
+        st.subheader("Análise por Município")
+        st.markdown("Escolha um estado para carregar apenas os municípios dele")
+        
+        # Sem estado escolhido nada é baixado (as abas são desenhadas a cada rerun)
+        estado = st.selectbox("Estado:", ESTADOS_BRASIL, index=None, placeholder="Selecione um estado")
+        if estado:
+            with st.spinner(f"Carregando municípios de {estado}..."):
+                df_cities = load_city_data(estado)
+            if df_cities is not None and not df_cities.empty:
+                create_city_analysis(df_cities, estado)
+            else:
+                st.warning(f"Dados dos municípios de {estado} não disponíveis")
+
+def render_api_health(render_seconds):
+    """Painel na sidebar com o estado dos circuit breakers e do serviço de dados"""
+    with st.sidebar.expander("🩺 Saúde das APIs"):
+        st.caption(f"Render: {render_seconds:.2f}s (orçamento de rede {RENDER_DEADLINE_SECONDS:.0f}s)")
+        
+        states = breaker_states()
+        if states:
+            st.dataframe(pd.DataFrame(states), hide_index=True, use_container_width=True)
+        else:
+            st.caption("Nenhuma chamada às APIs neste processo ainda")
+            
+        status = get_data_service().status()
+        st.dataframe(
+            pd.DataFrame.from_dict(status, orient='index').rename_axis('conjunto').reset_index(),
+            hide_index=True,
+            use_container_width=True
+        )
 
 def main():
     """Função principal da aplicação"""
@@ -591,13 +689,29 @@ def main():
     - Disease.sh (dados mundiais)
     """)
     
-    # Renderizar página selecionada
-    if page == "Brasil":
-        dashboard_brasil()
-    elif page == "Análises Avançadas":
-        dashboard_analises_avancadas()
-    elif page == "Comparação Mundial":
-        dashboard_comparacao()
+    # Rastreamento opcional: spans de rede, pandas e Plotly deste rerun
+    tracing_on = st.sidebar.checkbox(
+        "⏱️ Medir tempos do render",
+        value=TRACING_ENABLED,
+        help="Mostra onde o tempo de cada rerun é gasto e grava uma linha JSON no log"
+    )
+    
+    # Renderizar página selecionada (chamadas de rede limitadas ao orçamento do render)
+    render_started = time.monotonic()
+    with start_trace("rerun", page=page) if tracing_on else nullcontext() as trace:
+        with deadline(RENDER_DEADLINE_SECONDS):
+            if page == "Brasil":
+                dashboard_brasil()
+            elif page == "Análises Avançadas":
+                dashboard_analises_avancadas()
+            elif page == "Comparação Mundial":
+                dashboard_comparacao()
+    render_elapsed = time.monotonic() - render_started
+    RERUN_SECONDS.observe(render_elapsed, page=page)
+    render_api_health(render_elapsed)
+    if trace is not None:
+        log_trace(trace)
+        render_trace_panel(trace)
     
     # Footer
     st.markdown("---")
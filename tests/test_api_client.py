@@ -4,7 +4,7 @@ import pytest
 import pandas as pd
 from unittest.mock import MagicMock
 
-from src.data.api_client import COVID19APIClient
+from src.data.api_client import COVID19APIClient, IncompletePaginationError
 
 @pytest.fixture
 def client():
@@ -225,3 +225,209 @@ class TestGetWorldTopCountries:
 
         assert "country" in df.columns
         assert "cases" in df.columns
+
+
+# ---------------------------------------------------------------------------
+# fetch_many()
+# ---------------------------------------------------------------------------
+
+class TestFetchMany:
+
+    def test_retorna_resultados_na_ordem_das_chamadas(self, client, mocker):
+        """Os resultados devem seguir a ordem da lista de chamadas."""
+        mocker.patch.object(client, "get_brasil_data", return_value="brasil")
+        mocker.patch.object(client, "get_world_top_countries", return_value="mundo")
+
+        result = client.fetch_many([
+            ("get_world_top_countries", {"limit": 5}),
+            ("get_brasil_data", {}),
+        ])
+
+        assert result == ["mundo", "brasil"]
+        client.get_world_top_countries.assert_called_once_with(limit=5)
+
+    def test_executa_chamadas_em_paralelo(self, client, mocker):
+        """As chamadas devem rodar ao mesmo tempo (barreira só abre com 3 threads)."""
+        import threading
+
+        barrier = threading.Barrier(3, timeout=2)
+
+        def espera_todas(**kwargs):
+            barrier.wait()
+            return True
+
+        for name in ("get_brasil_data", "get_brasil_historical_data", "get_brasil_time_series"):
+            mocker.patch.object(client, name, side_effect=espera_todas)
+
+        result = client.fetch_many([
+            ("get_brasil_data", {}),
+            ("get_brasil_historical_data", {"limit": 2000}),
+            ("get_brasil_time_series", {"days": 90}),
+        ])
+
+        assert result == [True, True, True]
+
+    def test_excecao_vira_none(self, client, mocker):
+        """Uma chamada com exceção não deve derrubar as demais."""
+        mocker.patch.object(client, "get_brasil_data", side_effect=RuntimeError("falha"))
+        mocker.patch.object(client, "get_world_top_countries", return_value="mundo")
+
+        result = client.fetch_many([("get_brasil_data", {}), ("get_world_top_countries", None)])
+
+        assert result == [None, "mundo"]
+
+    def test_lista_vazia(self, client):
+        assert client.fetch_many([]) == []
+
+
+# ---------------------------------------------------------------------------
+# iter_brasil_pages()
+# ---------------------------------------------------------------------------
+
+def _paginas(total_paginas, linhas_por_pagina=2):
+    """Gera respostas paginadas encadeadas pelo campo `next`."""
+    respostas = []
+    for page in range(total_paginas):
+        results = [
+            {"state": "SP", "date": f"2021-01-{page * linhas_por_pagina + i + 1:02d}", "new_confirmed": i}
+            for i in range(linhas_por_pagina)
+        ]
+        next_url = f"https://api.brasil.io/next?page={page + 2}" if page < total_paginas - 1 else None
+        respostas.append(_mock_response({"results": results, "next": next_url}))
+    return respostas
+
+
+class TestIterBrasilPages:
+
+    @pytest.mark.parametrize("prefetch", [True, False])
+    def test_segue_o_link_next(self, client, mocker, prefetch):
+        """Deve percorrer todas as páginas, uma chunk por página."""
+        mock_req = mocker.patch.object(client, "_make_request", side_effect=_paginas(3))
+
+        chunks = list(client.iter_brasil_pages({"place_type": "state"}, prefetch=prefetch))
+
+        assert [len(c) for c in chunks] == [2, 2, 2]
+        assert mock_req.call_count == 3
+        assert mock_req.call_args_list[1].args[0] == "https://api.brasil.io/next?page=2"
+
+    def test_date_ja_convertida(self, client, mocker):
+        """As chunks devem chegar com a coluna `date` como datetime."""
+        mocker.patch.object(client, "_make_request", side_effect=_paginas(1))
+
+        chunk = next(client.iter_brasil_pages())
+
+        assert pd.api.types.is_datetime64_any_dtype(chunk["date"])
+
+    def test_respeita_max_rows_sem_baixar_paginas_extras(self, client, mocker):
+        """Não deve pedir a próxima página quando `max_rows` já foi atingido."""
+        mock_req = mocker.patch.object(client, "_make_request", side_effect=_paginas(5))
+
+        chunks = list(client.iter_brasil_pages(max_rows=3))
+
+        assert sum(len(c) for c in chunks) == 3
+        assert mock_req.call_count == 2
+
+    def test_pagina_que_falha_levanta_erro(self, client, mocker):
+        """Uma página sem resposta não encerra a iteração como se os dados tivessem acabado."""
+        mocker.patch.object(client, "_make_request", side_effect=[_paginas(2)[0], None])
+
+        chunks = []
+        with pytest.raises(IncompletePaginationError):
+            for chunk in client.iter_brasil_pages():
+                chunks.append(chunk)
+
+        assert len(chunks) == 1
+
+    def test_historico_incompleto_retorna_none(self, client, mocker):
+        """Os métodos que juntam as páginas não devolvem um resultado parcial."""
+        mocker.patch.object(client, "_make_request", side_effect=[_paginas(2)[0], None])
+
+        assert client.get_brasil_historical_data() is None
+
+    def test_historico_concatena_todas_as_paginas(self, client, mocker):
+        """get_brasil_historical_data deve juntar as páginas em um único DataFrame."""
+        mocker.patch.object(client, "_make_request", side_effect=_paginas(3))
+
+        df = client.get_brasil_historical_data()
+
+        assert len(df) == 6
+        assert df["date"].is_monotonic_increasing
+
+
+# ---------------------------------------------------------------------------
+# get_brasil_time_series()
+# ---------------------------------------------------------------------------
+
+def _pagina_por_data(datas, estados=("SP", "RJ"), next_url=None):
+    """Página de /caso_full/data com uma linha por (data, estado), da data mais nova para a mais antiga."""
+    results = [
+        {"state": uf, "date": data, "place_type": "state", "new_confirmed": 1}
+        for data in sorted(datas, reverse=True)
+        for uf in estados
+    ]
+    return _mock_response({"results": results, "next": next_url})
+
+
+class TestGetBrasilTimeSeries:
+
+    def test_pagina_dimensionada_para_o_periodo(self, client, mocker):
+        mock_req = mocker.patch.object(client, "_make_request", return_value=_pagina_por_data(["2022-03-27"]))
+
+        client.get_brasil_time_series(days=90)
+
+        params = mock_req.call_args.kwargs["params"]
+        assert params["page_size"] == 90 * 27
+        assert params["place_type"] == "state"
+
+    def test_sem_datas_envia_periodo_a_partir_da_data_mais_recente(self, client, mocker):
+        mock_req = mocker.patch.object(client, "_make_request", return_value=_pagina_por_data(["2022-03-27"]))
+
+        client.get_brasil_time_series(days=90)
+
+        consulta, serie = mock_req.call_args_list
+        assert consulta.kwargs["params"]["page_size"] == 1
+        assert serie.kwargs["params"]["date__gte"] == "2021-12-28"
+        assert serie.kwargs["params"]["date__lte"] == "2022-03-27"
+
+    def test_estado_e_periodo_enviados_como_filtros(self, client, mocker):
+        mock_req = mocker.patch.object(client, "_make_request", return_value=_pagina_por_data(["2022-03-27"]))
+
+        client.get_brasil_time_series(state="SP", days=7, date_to="2022-03-27")
+
+        params = mock_req.call_args.kwargs["params"]
+        assert params["state"] == "SP"
+        assert params["page_size"] == 7
+        assert params["date__gte"] == "2022-03-21"
+        assert params["date__lte"] == "2022-03-27"
+
+    def test_para_de_paginar_fora_do_periodo(self, client, mocker):
+        paginas = [
+            _pagina_por_data(["2022-03-27", "2022-03-26", "2022-03-25"], next_url="https://api.brasil.io/next?page=2"),
+            _pagina_por_data(["2022-03-24"]),
+        ]
+        mocker.patch.object(client, "_latest_brasil_date", return_value=None)  # Consulta da data mais recente falhou
+        mock_req = mocker.patch.object(client, "_make_request", side_effect=paginas)
+
+        df = client.get_brasil_time_series(days=2)
+
+        assert mock_req.call_count == 1
+        assert sorted(df["date"].dt.strftime("%Y-%m-%d").unique()) == ["2022-03-26", "2022-03-27"]
+        assert len(df) == 2 * 2
+
+    def test_pagina_parcial_nao_mistura_periodos(self, client, mocker):
+        """Com páginas parciais, o recorte é por data e não por quantidade de linhas."""
+        paginas = [
+            _pagina_por_data(["2022-03-27"], next_url="https://api.brasil.io/next?page=2"),
+            _pagina_por_data(["2022-03-26", "2022-03-25"]),
+        ]
+        mocker.patch.object(client, "_latest_brasil_date", return_value=None)  # Consulta da data mais recente falhou
+        mocker.patch.object(client, "_make_request", side_effect=paginas)
+
+        df = client.get_brasil_time_series(days=2)
+
+        assert df["date"].min() == pd.Timestamp("2022-03-26")
+        assert df["date"].is_monotonic_increasing
+
+    def test_sem_dados_retorna_none(self, client, mocker):
+        mocker.patch.object(client, "_make_request", return_value=None)
+        assert client.get_brasil_time_series(days=7) is None
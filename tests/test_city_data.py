@@ -0,0 +1,248 @@
+# Testes do modo municípios: cliente (place_type=city), src/data/city_data.py e latest_city_snapshot
+
+import threading
+
+import pandas as pd
+import pytest
+from unittest.mock import MagicMock
+
+from src.data.api_client import COVID19APIClient, IncompletePaginationError
+from src.data.city_data import CityData, frame_bytes
+from src.data.data_processor import data_version, latest_city_snapshot
+from src.data.resilience import deadline, remaining_budget, reset_breakers
+from src.data.stub_server import StubAPIServer
+from src.data.synthetic import generate_cities
+
+
+@pytest.fixture(scope="module")
+def server():
+    with StubAPIServer(days=60, city_states=["AC", "RR"], countries=20) as stub:
+        yield stub
+
+
+@pytest.fixture
+def client(server, monkeypatch):
+    """Cliente apontando para o servidor local, sem limite de taxa nem cache de respostas."""
+    reset_breakers()
+    monkeypatch.setattr("src.data.api_client.BRASIL_IO_API_URL", server.brasil_io_url)
+    monkeypatch.setattr("src.data.api_client.get_limiter", lambda host: None)
+    client = COVID19APIClient()
+    client.response_cache.clear()
+    yield client
+    reset_breakers()
+
+
+class FakeClock:
+    """Relógio controlado manualmente."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _serie(state, days=10):
+    return generate_cities(days=days, states=[state], start="2021-01-01")
+
+
+def _cache(series, **kwargs):
+    """CityData com cliente falso que devolve `series[estado]` (ou None) e conta as cargas."""
+    calls = []
+
+    def load(state, days, max_bytes):
+        calls.append(state)
+        value = series.get(state)
+        return value() if callable(value) else value
+
+    client = MagicMock()
+    client.get_brasil_city_time_series.side_effect = load
+    cache = CityData(client_factory=lambda: client, **kwargs)
+    return cache, calls
+
+
+# ---------------------------------------------------------------------------
+# COVID19APIClient (place_type=city)
+# ---------------------------------------------------------------------------
+
+class TestClienteMunicipios:
+
+    def test_serie_so_do_estado_pedido(self, client):
+        df = client.get_brasil_city_time_series("RR", days=30)
+
+        assert set(df["state"]) == {"RR"}
+        assert df["city"].nunique() == 15
+        assert df["date"].nunique() == 30
+        assert isinstance(df["city"].dtype, pd.CategoricalDtype)
+        assert df.attrs["truncated"] is False
+
+    def test_orcamento_descarta_os_dias_mais_antigos(self, client, monkeypatch):
+        monkeypatch.setattr("src.data.api_client.BRASIL_IO_MAX_PAGE_SIZE", 100)
+        completo = client.get_brasil_city_time_series("AC", days=60)
+
+        df = client.get_brasil_city_time_series("AC", days=60, max_bytes=frame_bytes(completo) // 3)
+
+        assert df.attrs["truncated"] is True
+        assert df["date"].max() == completo["date"].max()
+        assert df["date"].nunique() < 30
+        # Só dias completos: todo município em todas as datas mantidas
+        assert (df.groupby("date").size() == 22).all()
+
+    def test_falha_retorna_none(self, mocker):
+        client = COVID19APIClient()
+        mocker.patch.object(client, "iter_brasil_pages", side_effect=RuntimeError("x"))
+
+        assert client.get_brasil_city_time_series("AC") is None
+
+    def test_pagina_com_falha_no_meio_retorna_none(self, client, mocker):
+        primeira = next(client.iter_brasil_pages({"place_type": "city", "state": "AC"}))
+
+        def paginas(*args, **kwargs):
+            yield primeira
+            raise IncompletePaginationError("x")
+
+        mocker.patch.object(client, "iter_brasil_pages", side_effect=paginas)
+
+        assert client.get_brasil_city_time_series("AC") is None
+        cache = CityData(client_factory=lambda: client)
+        assert cache.get("AC") is None
+        assert cache.states() == []
+
+
+# ---------------------------------------------------------------------------
+# latest_city_snapshot
+# ---------------------------------------------------------------------------
+
+class TestUltimaLinhaPorMunicipio:
+
+    def test_uma_linha_por_municipio_mais_recente(self):
+        df = _serie("AC")
+
+        snapshot = latest_city_snapshot(df)
+
+        assert len(snapshot) == 22
+        assert (snapshot["date"] == df["date"].max()).all()
+        assert snapshot["last_available_confirmed"].is_monotonic_decreasing
+
+    def test_vazio_ou_none(self):
+        assert latest_city_snapshot(None) is None
+        assert latest_city_snapshot(pd.DataFrame()).empty
+
+
+# ---------------------------------------------------------------------------
+# CityData
+# ---------------------------------------------------------------------------
+
+class TestCityData:
+
+    def test_carrega_uma_vez_e_marca_versao(self):
+        cache, calls = _cache({"AC": _serie("AC")})
+
+        primeiro = cache.get("AC")
+        assert cache.get("AC") is primeiro
+        assert calls == ["AC"]
+        assert data_version(primeiro).startswith("city:AC:")
+
+    def test_descarta_o_estado_menos_usado(self):
+        series = {uf: _serie(uf) for uf in ("AC", "RR", "AP")}
+        cache, _ = _cache(series, max_bytes=sum(frame_bytes(df) for df in series.values()) - 1)
+
+        cache.get("AC")
+        cache.get("RR")
+        cache.get("AC")
+        cache.get("AP")
+
+        assert cache.states() == ["AC", "AP"]
+        assert cache.total_bytes <= cache.max_bytes
+
+    def test_estado_maior_que_o_orcamento_fica_sozinho(self):
+        cache, _ = _cache({"AC": _serie("AC"), "RR": _serie("RR")}, max_bytes=1)
+
+        cache.get("AC")
+        cache.get("RR")
+
+        assert cache.states() == ["RR"]
+
+    def test_expira_e_mantem_anterior_se_a_recarga_falhar(self):
+        clock = FakeClock()
+        series = {"AC": _serie("AC")}
+        cache, calls = _cache(series, ttl=60, clock=clock)
+        anterior = cache.get("AC")
+
+        clock.now = 61
+        series["AC"] = None
+
+        assert cache.get("AC") is anterior
+        assert calls == ["AC", "AC"]
+
+    def test_sessoes_simultaneas_compartilham_a_carga(self):
+        liberar = threading.Event()
+
+        def lento():
+            liberar.wait(5)
+            return _serie("AC")
+
+        cache, calls = _cache({"AC": lento})
+        resultados = []
+        threads = [threading.Thread(target=lambda: resultados.append(cache.get("AC"))) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        while cache._flights.in_flight() == 0:
+            pass
+        liberar.set()
+        for thread in threads:
+            thread.join()
+
+        assert calls == ["AC"]
+        assert all(df is resultados[0] for df in resultados)
+
+    def test_carga_fora_do_orcamento_do_render(self):
+        orcamentos = []
+
+        def registra():
+            orcamentos.append(remaining_budget())
+            return _serie("AC")
+
+        cache, _ = _cache({"AC": registra})
+        with deadline(0.5):
+            cache.get("AC")
+
+        assert orcamentos[0] > 1
+
+    def test_falha_recente_nao_e_repetida_a_cada_rerun(self):
+        clock = FakeClock()
+        series = {"AC": None}
+        cache, calls = _cache(series, clock=clock, failure_ttl=30)
+
+        assert cache.get("AC") is None
+        assert cache.get("AC") is None
+        assert calls == ["AC"]
+
+        clock.now = 31
+        series["AC"] = _serie("AC")
+        assert cache.get("AC") is not None
+        assert calls == ["AC", "AC"]
+
+    def test_falha_na_recarga_serve_a_anterior_sem_nova_tentativa(self):
+        clock = FakeClock()
+        series = {"AC": _serie("AC")}
+        cache, calls = _cache(series, ttl=60, clock=clock, failure_ttl=30)
+        anterior = cache.get("AC")
+
+        clock.now = 61
+        series["AC"] = None
+        assert cache.get("AC") is anterior
+        clock.now = 80
+        assert cache.get("AC") is anterior
+        assert calls == ["AC", "AC"]
+
+    def test_excecao_na_carga_tambem_conta_como_falha(self):
+        def quebra():
+            raise RuntimeError("x")
+
+        cache, calls = _cache({"AC": quebra}, failure_ttl=30)
+
+        with pytest.raises(RuntimeError):
+            cache.get("AC")
+        assert cache.get("AC") is None
+        assert calls == ["AC"]
@@ -3,7 +3,17 @@
 import pytest
 import pandas as pd
 
-from src.data.data_processor import calculate_totals, calculate_mortality_rate, get_top_states
+from src.data.data_processor import (
+    calculate_totals,
+    calculate_mortality_rate,
+    get_top_states,
+    calculate_moving_averages,
+    update_moving_averages,
+    refresh_moving_averages,
+    enrich_state_metrics,
+    data_version,
+    stamp_data_version,
+)
 
 
 @pytest.fixture
@@ -143,3 +153,208 @@ class TestGetTopStates:
     def test_n_padrao_e_5(self, df_estados):
         result = get_top_states(df_estados, "last_available_confirmed")
         assert len(result) <= 5
+
+
+# ---------------------------------------------------------------------------
+# calculate_moving_averages() / update_moving_averages()
+# ---------------------------------------------------------------------------
+
+@pytest.fixture
+def df_series():
+    """Série diária de dois estados, embaralhada, com um valor ausente."""
+    dates = pd.date_range("2021-01-01", periods=40)
+    df = pd.concat([
+        pd.DataFrame({"state": "SP", "date": dates, "new_confirmed": range(40), "new_deaths": [1] * 40}),
+        pd.DataFrame({"state": "RJ", "date": dates, "new_confirmed": range(100, 140), "new_deaths": [2] * 40}),
+    ], ignore_index=True)
+    df.loc[5, "new_confirmed"] = None
+    return df.sample(frac=1, random_state=0)
+
+
+def _referencia(df, source, window):
+    """Média móvel por estado calculada com groupby().rolling() do pandas."""
+    ordered = df.sort_values(["state", "date"]).reset_index(drop=True)
+    return (
+        ordered.groupby("state", sort=False)[source]
+        .rolling(window, min_periods=1).mean()
+        .reset_index(level=0, drop=True)
+        .sort_index()
+    )
+
+
+class TestCalculateMovingAverages:
+
+    @pytest.mark.parametrize("window", [7, 14, 28])
+    def test_igual_ao_rolling_por_estado(self, df_series, window):
+        result = calculate_moving_averages(df_series)
+        expected = _referencia(df_series, "new_confirmed", window)
+        assert result[f"ma_cases_{window}"].tolist() == pytest.approx(expected.tolist())
+
+    def test_janela_nao_mistura_estados(self, df_series):
+        result = calculate_moving_averages(df_series, windows=(7,))
+        primeiro_rj = result[result["state"] == "RJ"].iloc[0]
+        assert primeiro_rj["ma_cases_7"] == pytest.approx(100)
+
+    def test_gera_colunas_de_casos_e_obitos(self, df_series):
+        result = calculate_moving_averages(df_series, windows=(7, 14))
+        for col in ("ma_cases_7", "ma_cases_14", "ma_deaths_7", "ma_deaths_14"):
+            assert col in result.columns
+
+    def test_nao_altera_o_dataframe_original(self, df_series):
+        colunas = list(df_series.columns)
+        calculate_moving_averages(df_series)
+        assert list(df_series.columns) == colunas
+
+    def test_none_e_vazio(self):
+        assert calculate_moving_averages(None) is None
+        assert calculate_moving_averages(pd.DataFrame()).empty
+
+
+class TestUpdateMovingAverages:
+
+    def test_incremental_igual_ao_recalculo_completo(self, df_series):
+        ordered = df_series.sort_values(["state", "date"])
+        antigos = ordered[ordered["date"] < "2021-02-05"]
+        novos = ordered[ordered["date"] >= "2021-02-05"]
+
+        incremental = update_moving_averages(calculate_moving_averages(antigos), novos)
+        completo = calculate_moving_averages(df_series)
+
+        assert len(incremental) == len(completo)
+        for col in ("ma_cases_7", "ma_cases_28", "ma_deaths_14"):
+            assert incremental[col].tolist() == pytest.approx(completo[col].tolist())
+
+    def test_sem_linhas_novas_retorna_o_mesmo(self, df_series):
+        base = calculate_moving_averages(df_series)
+        assert update_moving_averages(base, pd.DataFrame()) is base
+
+
+class TestRefreshMovingAverages:
+
+    @staticmethod
+    def _janela(df, inicio, fim):
+        return df[(df["date"] >= inicio) & (df["date"] <= fim)]
+
+    def test_janela_deslizante_igual_ao_recalculo_completo(self, df_series):
+        anterior = self._janela(df_series, "2021-01-01", "2021-01-30")
+        atual = self._janela(df_series, "2021-01-08", "2021-02-09")
+
+        result = refresh_moving_averages(anterior, calculate_moving_averages(anterior), atual)
+
+        # concat_caso_full reduz os inteiros; os valores são os mesmos
+        pd.testing.assert_frame_equal(result, calculate_moving_averages(atual), check_like=True, check_dtype=False)
+
+    def test_so_os_dias_novos_sao_calculados(self, df_series, mocker):
+        anterior = self._janela(df_series, "2021-01-01", "2021-01-30")
+        atual = self._janela(df_series, "2021-01-03", "2021-02-01")
+        base = calculate_moving_averages(anterior)
+        espiao = mocker.patch(
+            "src.data.data_processor.calculate_moving_averages", side_effect=calculate_moving_averages
+        )
+
+        refresh_moving_averages(anterior, base, atual)
+
+        # Dias novos (com contexto) e os primeiros dias de cada estado; nunca a série inteira
+        assert all(len(call.args[0]) < len(atual) for call in espiao.call_args_list)
+
+    def test_correcao_retroativa_recalcula_tudo(self, df_series):
+        anterior = self._janela(df_series, "2021-01-01", "2021-01-30")
+        atual = self._janela(df_series, "2021-01-01", "2021-02-05").copy()
+        atual.loc[atual["date"] == "2021-01-20", "new_confirmed"] = 999
+
+        result = refresh_moving_averages(anterior, calculate_moving_averages(anterior), atual)
+
+        pd.testing.assert_frame_equal(result, calculate_moving_averages(atual), check_like=True)
+
+    def test_sem_calculo_anterior(self, df_series):
+        pd.testing.assert_frame_equal(
+            refresh_moving_averages(None, None, df_series), calculate_moving_averages(df_series)
+        )
+
+
+# ---------------------------------------------------------------------------
+# enrich_state_metrics() / data_version()
+# ---------------------------------------------------------------------------
+
+class TestEnrichStateMetrics:
+
+    @pytest.fixture
+    def df_pop(self, df_estados):
+        df = df_estados.copy()
+        df["estimated_population"] = [46_000_000, 17_000_000, 0]
+        return df
+
+    def test_taxa_mortalidade(self, df_pop):
+        result = enrich_state_metrics(df_pop)
+        assert result.loc[0, "taxa_mortalidade"] == pytest.approx(3.4)
+
+    def test_incidencia_e_mortalidade_100k(self, df_pop):
+        result = enrich_state_metrics(df_pop)
+        assert result.loc[0, "incidencia_100k"] == pytest.approx(5_000_000 / 46_000_000 * 100_000)
+        assert result.loc[1, "mortalidade_100k"] == pytest.approx(80_000 / 17_000_000 * 100_000)
+
+    def test_populacao_zero_vira_zero(self, df_pop):
+        result = enrich_state_metrics(df_pop)
+        assert result.loc[2, "incidencia_100k"] == 0
+        assert result.loc[2, "mortalidade_100k"] == 0
+
+    def test_usa_incidencia_da_api_quando_existe(self, df_pop):
+        df_pop["last_available_confirmed_per_100k_inhabitants"] = [1.0, 2.0, 3.0]
+        result = enrich_state_metrics(df_pop)
+        assert result["incidencia_100k"].tolist() == [1.0, 2.0, 3.0]
+
+    def test_regiao(self, df_pop):
+        result = enrich_state_metrics(df_pop)
+        assert result["regiao"].tolist() == ["Sudeste", "Sudeste", "Sudeste"]
+
+    def test_nao_altera_o_original(self, df_pop):
+        enrich_state_metrics(df_pop)
+        assert "taxa_mortalidade" not in df_pop.columns
+
+    def test_memoriza_por_versao(self, df_pop):
+        stamp_data_version(df_pop, "v1")
+        assert enrich_state_metrics(df_pop) is enrich_state_metrics(df_pop)
+
+    def test_none(self):
+        assert enrich_state_metrics(None) is None
+
+
+class TestDataVersion:
+
+    def test_mesmo_conteudo_mesma_versao(self, df_estados):
+        assert data_version(df_estados) == data_version(df_estados.copy())
+
+    def test_conteudo_diferente_muda_versao(self, df_estados):
+        outro = df_estados.copy()
+        outro.loc[0, "new_deaths"] = 999
+        assert data_version(df_estados) != data_version(outro)
+
+    def test_recorte_de_frame_marcado_muda_versao(self, df_estados):
+        stamp_data_version(df_estados, 7)
+        assert data_version(df_estados) != data_version(df_estados.head(1))
+
+    def test_recortes_do_mesmo_tamanho_tem_versoes_diferentes(self):
+        df = pd.DataFrame({
+            "state": ["SP", "RJ"] * 3,
+            "last_available_confirmed": [600, 200, 610, 210, 620, 220],
+            "last_available_deaths": [60, 10, 61, 11, 62, 12],
+        })
+        stamp_data_version(df, "v1")
+        sp, rj = df[df["state"] == "SP"], df[df["state"] == "RJ"]
+
+        assert data_version(sp) != data_version(rj)
+        assert data_version(sp.reset_index(drop=True)) != data_version(rj.reset_index(drop=True))
+        assert enrich_state_metrics(rj)["state"].tolist() == ["RJ"] * 3
+        assert enrich_state_metrics(sp)["state"].tolist() == ["SP"] * 3
+
+    def test_reordenar_muda_versao(self, df_estados):
+        stamp_data_version(df_estados, 7)
+        invertido = df_estados.iloc[::-1].reset_index(drop=True)
+        assert data_version(df_estados) != data_version(invertido)
+
+    def test_copia_rasa_mantem_versao(self, df_estados):
+        stamp_data_version(df_estados, 7)
+        assert data_version(df_estados) == data_version(df_estados.copy(deep=False))
+
+    def test_vazio(self):
+        assert data_version(pd.DataFrame()) == "empty"
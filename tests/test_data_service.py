@@ -0,0 +1,155 @@
+# Testes unitários para src/data/data_service.py
+
+import threading
+
+import pandas as pd
+from unittest.mock import MagicMock
+
+from src.data.data_processor import calculate_moving_averages, data_version
+from src.data.data_service import DEFAULT_LOADERS, DataService, load_analises
+
+
+def _service(loaders, interval=3600):
+    """Serviço com cliente falso (os loaders dos testes não usam a rede)."""
+    return DataService(loaders=loaders, interval=interval, client_factory=MagicMock)
+
+
+# ---------------------------------------------------------------------------
+# refresh() / get()
+# ---------------------------------------------------------------------------
+
+class TestRefresh:
+
+    def test_get_sem_dados_retorna_none(self):
+        service = _service({"brasil": lambda client, snapshots: pd.DataFrame({"a": [1]})})
+        assert service.get("brasil") is None
+
+    def test_refresh_cria_snapshot_versionado(self):
+        service = _service({"brasil": lambda client, snapshots: pd.DataFrame({"a": [1]})})
+
+        assert service.refresh() is True
+        snapshot = service.get("brasil")
+
+        assert snapshot.version == 1
+        assert snapshot.data["a"].tolist() == [1]
+        assert snapshot.data.attrs["data_version"] == "brasil-1"
+
+    def test_falha_mantem_snapshot_anterior(self):
+        respostas = iter([pd.DataFrame({"a": [1]}), None])
+        service = _service({"brasil": lambda client, snapshots: next(respostas)})
+        service.refresh()
+
+        assert service.refresh() is False
+
+        assert service.get("brasil").data["a"].tolist() == [1]
+        assert service.status()["brasil"]["error"] is not None
+
+    def test_excecao_no_loader_nao_propaga(self):
+        def quebra(client, snapshots):
+            raise RuntimeError("API fora do ar")
+
+        service = _service({"brasil": quebra, "world": lambda client, snapshots: pd.DataFrame({"b": [2]})})
+
+        assert service.refresh() is False
+        assert service.get("brasil") is None
+        assert service.get("world") is not None
+
+    def test_versoes_diferentes_por_atualizacao(self):
+        service = _service({"brasil": lambda client, snapshots: pd.DataFrame({"a": [1]})})
+        service.refresh()
+        primeira = data_version(service.get("brasil").data)
+        service.refresh()
+
+        assert data_version(service.get("brasil").data) != primeira
+
+    def test_tupla_de_frames_marcada(self):
+        service = _service({"analises": lambda client, snapshots: (pd.DataFrame({"a": [1]}), None)})
+        service.refresh()
+
+        frame, vazio = service.get("analises").data
+
+        assert frame.attrs["data_version"] == "analises-1"
+        assert vazio is None
+
+
+# ---------------------------------------------------------------------------
+# load_analises()
+# ---------------------------------------------------------------------------
+
+class TestLoadAnalises:
+
+    @staticmethod
+    def _serie(inicio, dias):
+        datas = pd.date_range(inicio, periods=dias)
+        return pd.concat([
+            pd.DataFrame({"state": uf, "date": datas, "new_confirmed": datas.dayofyear, "new_deaths": 1})
+            for uf in ("SP", "RJ")
+        ], ignore_index=True)
+
+    def test_medias_moveis_aproveitam_o_snapshot_anterior(self, mocker):
+        series = iter([self._serie("2021-01-01", 60), self._serie("2021-01-03", 60)])
+        client = MagicMock()
+        client.fetch_many.side_effect = lambda calls: (None, next(series))
+        service = DataService(loaders={"analises": load_analises}, interval=3600, client_factory=lambda: client)
+        service.refresh()
+        espiao = mocker.patch(
+            "src.data.data_processor.calculate_moving_averages", side_effect=calculate_moving_averages
+        )
+
+        service.refresh()
+
+        _, _, serie, medias = service.get("analises").data
+        assert all(len(call.args[0]) < len(serie) for call in espiao.call_args_list)
+        esperado = calculate_moving_averages(serie)
+        assert medias["ma_cases_7"].tolist() == esperado["ma_cases_7"].tolist()
+
+    def test_dados_por_estado_vem_do_snapshot_brasil(self):
+        client = MagicMock()
+        client.get_brasil_data.return_value = pd.DataFrame({"state": ["SP"], "last_available_confirmed": [10]})
+        client.fetch_many.return_value = (None, self._serie("2021-01-01", 10))
+        loaders = {name: DEFAULT_LOADERS[name] for name in ("brasil", "analises")}
+        service = DataService(loaders=loaders, interval=3600, client_factory=lambda: client)
+
+        service.refresh()
+
+        assert client.get_brasil_data.call_count == 1
+        chamadas = [name for name, _ in client.fetch_many.call_args.args[0]]
+        assert "get_brasil_data" not in chamadas
+        brasil = service.get("analises").data[0]
+        assert brasil["state"].tolist() == ["SP"]
+
+
+# ---------------------------------------------------------------------------
+# start() / thread em segundo plano
+# ---------------------------------------------------------------------------
+
+class TestBackground:
+
+    def test_primeira_carga_em_segundo_plano(self):
+        service = _service({"brasil": lambda client, snapshots: pd.DataFrame({"a": [1]})}).start()
+        try:
+            assert service.get("brasil", wait=2) is not None
+        finally:
+            service.stop(timeout=2)
+
+    def test_leitor_nao_espera_atualizacao_em_andamento(self):
+        liberar = threading.Event()
+        chamadas = []
+
+        def lento(client, snapshots):
+            chamadas.append(1)
+            if len(chamadas) > 1:
+                liberar.wait(2)
+            return pd.DataFrame({"a": [len(chamadas)]})
+
+        service = _service({"brasil": lento})
+        service.refresh()
+        worker = threading.Thread(target=service.refresh)
+        worker.start()
+
+        # Enquanto a segunda atualização está bloqueada, o snapshot antigo é servido
+        assert service.get("brasil").data["a"].tolist() == [1]
+
+        liberar.set()
+        worker.join(2)
+        assert service.get("brasil").data["a"].tolist() == [2]
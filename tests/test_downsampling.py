@@ -0,0 +1,112 @@
+# Testes unitários para src/utils/downsampling.py
+
+import numpy as np
+import pandas as pd
+
+from src.utils.downsampling import downsample_frame, downsample_xy, lttb_indices, points_for_width
+
+
+def _serie(n=1000, pico=500):
+    x = np.arange(n)
+    y = np.sin(x / 50.0)
+    y[pico] = 25.0  # Pico isolado
+    return x, y
+
+
+# ---------------------------------------------------------------------------
+# lttb_indices()
+# ---------------------------------------------------------------------------
+
+class TestLttbIndices:
+
+    def test_quantidade_de_pontos(self):
+        x, y = _serie()
+        assert len(lttb_indices(x, y, 100)) == 100
+
+    def test_mantem_extremos(self):
+        x, y = _serie()
+        idx = lttb_indices(x, y, 50)
+        assert idx[0] == 0
+        assert idx[-1] == len(x) - 1
+
+    def test_indices_crescentes_e_unicos(self):
+        x, y = _serie()
+        idx = lttb_indices(x, y, 77)
+        assert (np.diff(idx) > 0).all()
+
+    def test_preserva_pico(self):
+        x, y = _serie(pico=321)
+        assert 321 in lttb_indices(x, y, 40)
+
+    def test_serie_menor_que_o_limite_inalterada(self):
+        x, y = _serie(n=10, pico=5)
+        assert lttb_indices(x, y, 100).tolist() == list(range(10))
+
+    def test_aceita_datas(self):
+        datas = pd.date_range("2020-03-01", periods=1000).to_numpy()
+        _, y = _serie()
+        assert len(lttb_indices(datas, y, 200)) == 200
+
+
+# ---------------------------------------------------------------------------
+# downsample_xy() / downsample_frame()
+# ---------------------------------------------------------------------------
+
+class TestDownsampleXY:
+
+    def test_reduz_e_preserva_valores(self):
+        x, y = _serie()
+        x_ds, y_ds = downsample_xy(x, y, 100)
+
+        assert len(x_ds) == 100
+        assert y_ds.max() == 25.0
+
+    def test_descarta_nan(self):
+        x, y = _serie()
+        y[:10] = np.nan
+        _, y_ds = downsample_xy(x, y, 100)
+        assert not np.isnan(y_ds).any()
+
+    def test_limite_zero_desativa(self):
+        x, y = _serie()
+        assert len(downsample_xy(x, y, 0)[0]) == 1000
+
+
+class TestDownsampleFrame:
+
+    def _frame(self):
+        datas = pd.date_range("2020-03-01", periods=600)
+        return pd.DataFrame({
+            "state": np.repeat(["SP", "RJ"], 600),
+            "date": np.tile(datas, 2),
+            "new_confirmed": np.r_[np.arange(600), np.arange(600)[::-1]],
+        })
+
+    def test_limite_por_grupo(self):
+        df = downsample_frame(self._frame(), "date", "new_confirmed", n_out=100, group_col="state")
+
+        assert df.groupby("state").size().to_dict() == {"RJ": 100, "SP": 100}
+
+    def test_preserva_ordem_original(self):
+        df = downsample_frame(self._frame(), "date", "new_confirmed", n_out=50, group_col="state")
+        assert df.index.is_monotonic_increasing
+
+    def test_frame_pequeno_inalterado(self):
+        df = self._frame()
+        assert len(downsample_frame(df, "date", "new_confirmed", n_out=5000, group_col="state")) == len(df)
+
+
+def test_points_for_width():
+    assert points_for_width(800, 1.0) == 800
+    assert points_for_width(1, 0.5) == 3
+    assert points_for_width(800, 0) == 0
+
+
+def test_limite_padrao_vem_da_largura():
+    x, y = _serie(5000)
+    df = pd.DataFrame({"date": x, "new_confirmed": y})
+
+    assert len(downsample_xy(x, y)[0]) == points_for_width()
+    assert len(downsample_xy(x, y, width_px=200)[0]) == points_for_width(200)
+    assert len(downsample_frame(df, "date", "new_confirmed", width_px=200)) == points_for_width(200)
+    assert len(downsample_xy(x, y, n_out=0)[0]) == 5000
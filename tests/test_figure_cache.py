@@ -0,0 +1,104 @@
+# Testes unitários para src/components/figure_cache.py
+
+import pandas as pd
+import plotly.graph_objects as go
+
+from src.components.figure_cache import FigureCache, cached_figure, figure_size, get_shared_figure_cache
+from src.data.data_processor import stamp_data_version
+
+
+def _figura(n=10):
+    return go.Figure(go.Bar(x=list(range(n)), y=list(range(n))))
+
+
+def _dados(version="brasil-1"):
+    return stamp_data_version(pd.DataFrame({"state": ["SP", "RJ"], "cases": [10, 5]}), version)
+
+
+# ---------------------------------------------------------------------------
+# FigureCache
+# ---------------------------------------------------------------------------
+
+class TestFigureCache:
+
+    def test_chave_muda_com_versao_e_parametros(self):
+        base = FigureCache.make_key("top", _dados(), {"states": ("SP",)})
+
+        assert FigureCache.make_key("top", _dados(), {"states": ("SP",)}) == base
+        assert FigureCache.make_key("top", _dados("brasil-2"), {"states": ("SP",)}) != base
+        assert FigureCache.make_key("top", _dados(), {"states": ("RJ",)}) != base
+        assert FigureCache.make_key("outro", _dados(), {"states": ("SP",)}) != base
+
+    def test_get_e_store(self):
+        cache = FigureCache(max_entries=4, max_bytes=10**7)
+        fig = _figura()
+
+        cache.store("k", fig)
+
+        assert cache.get("k") is fig
+        assert cache.get("x") is None
+        assert (cache.hits, cache.misses) == (1, 1)
+
+    def test_despejo_lru_por_entradas(self):
+        cache = FigureCache(max_entries=2, max_bytes=10**7)
+        cache.store("a", _figura())
+        cache.store("b", _figura())
+        cache.get("a")
+
+        cache.store("c", _figura())
+
+        assert cache.get("b") is None
+        assert cache.get("a") is not None
+
+    def test_despejo_por_bytes(self):
+        tamanho = figure_size(_figura(1000))
+        cache = FigureCache(max_entries=10, max_bytes=int(tamanho * 1.5))
+        cache.store("a", _figura(1000))
+
+        cache.store("b", _figura(1000))
+
+        assert len(cache) == 1
+        assert cache.total_bytes <= cache.max_bytes
+
+    def test_figura_maior_que_o_limite_nao_e_guardada(self):
+        cache = FigureCache(max_entries=10, max_bytes=100)
+        cache.store("a", _figura(1000))
+        assert len(cache) == 0
+
+    def test_tamanho_cresce_com_os_dados(self):
+        assert figure_size(_figura(1000)) > figure_size(_figura(10))
+
+
+# ---------------------------------------------------------------------------
+# cached_figure()
+# ---------------------------------------------------------------------------
+
+class TestCachedFigure:
+
+    def setup_method(self):
+        get_shared_figure_cache().clear()
+
+    def test_constroi_uma_vez_por_versao(self):
+        chamadas = []
+
+        def build():
+            chamadas.append(1)
+            return _figura()
+
+        primeira = cached_figure("brasil.top", _dados(), build)
+        segunda = cached_figure("brasil.top", _dados(), build)
+
+        assert primeira is segunda
+        assert len(chamadas) == 1
+
+    def test_reconstroi_quando_filtro_muda(self):
+        chamadas = []
+
+        def build():
+            chamadas.append(1)
+            return _figura()
+
+        cached_figure("estados.top", _dados(), build, states=("SP",))
+        cached_figure("estados.top", _dados(), build, states=("SP", "RJ"))
+
+        assert len(chamadas) == 2
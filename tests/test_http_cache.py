@@ -0,0 +1,109 @@
+# Testes unitários para src/data/http_cache.py
+
+import json
+
+import pytest
+from unittest.mock import MagicMock
+
+from src.data.api_client import COVID19APIClient
+from src.data.http_cache import CachedResponse, ResponseCache
+
+
+def _resposta(payload, status_code=200, headers=None, url="https://disease.sh/v3/covid-19/countries"):
+    """Cria um mock de requests.Response com corpo JSON real."""
+    mock = MagicMock()
+    mock.status_code = status_code
+    mock.url = url
+    mock.encoding = "utf-8"
+    mock.content = json.dumps(payload).encode() if payload is not None else b""
+    mock.headers = headers or {}
+    return mock
+
+
+ETAG = {"ETag": '"abc123"', "Last-Modified": "Wed, 01 Jan 2025 00:00:00 GMT"}
+
+
+# ---------------------------------------------------------------------------
+# ResponseCache
+# ---------------------------------------------------------------------------
+
+class TestResponseCache:
+
+    def test_chave_independe_da_ordem_dos_params(self):
+        assert ResponseCache.make_key("u", {"a": 1, "b": 2}) == ResponseCache.make_key("u", {"b": 2, "a": 1})
+
+    def test_nao_guarda_resposta_sem_validadores(self):
+        cache = ResponseCache()
+        response = _resposta([1])
+
+        assert cache.store(("u", ()), response) is response
+        assert len(cache) == 0
+
+    def test_guarda_e_gera_cabecalhos_condicionais(self):
+        cache = ResponseCache()
+        key = cache.make_key("u")
+        cache.store(key, _resposta([1], headers=ETAG))
+
+        headers = cache.conditional_headers(key)
+
+        assert headers == {"If-None-Match": '"abc123"', "If-Modified-Since": ETAG["Last-Modified"]}
+
+    def test_despejo_lru_por_quantidade(self):
+        cache = ResponseCache(max_entries=2)
+        for name in ("a", "b"):
+            cache.store(cache.make_key(name), _resposta([name], headers=ETAG))
+        cache.get(cache.make_key("a"))  # "a" passa a ser a mais recente
+
+        cache.store(cache.make_key("c"), _resposta(["c"], headers=ETAG))
+
+        assert cache.get(cache.make_key("b")) is None
+        assert cache.get(cache.make_key("a")) is not None
+
+    def test_despejo_por_bytes(self):
+        cache = ResponseCache(max_bytes=20)
+        cache.store(cache.make_key("a"), _resposta(["x" * 10], headers=ETAG))
+        cache.store(cache.make_key("b"), _resposta(["y" * 10], headers=ETAG))
+
+        assert len(cache) == 1
+        assert cache.total_bytes <= 20
+
+    def test_json_decodificado_uma_vez(self):
+        entry = CachedResponse("u", b'{"a": 1}', {})
+        assert entry.json() is entry.json()
+
+
+# ---------------------------------------------------------------------------
+# GET condicional em _make_request
+# ---------------------------------------------------------------------------
+
+class TestGetCondicional:
+
+    @pytest.fixture
+    def client(self):
+        client = COVID19APIClient(session=MagicMock())
+        client.response_cache = ResponseCache()
+        return client
+
+    def test_304_servido_do_cache(self, client):
+        payload = [{"country": "USA", "cases": 1}]
+        client.session.get.side_effect = [_resposta(payload, headers=ETAG), _resposta(None, status_code=304)]
+
+        primeira = client._make_request("https://disease.sh/v3/covid-19/countries", params={"sort": "cases"})
+        segunda = client._make_request("https://disease.sh/v3/covid-19/countries", params={"sort": "cases"})
+
+        assert segunda is primeira
+        assert segunda.from_cache
+        assert segunda.json() == payload
+        enviados = client.session.get.call_args_list[1].kwargs["headers"]
+        assert enviados["If-None-Match"] == '"abc123"'
+
+    def test_304_sem_entrada_refaz_sem_validadores(self, client):
+        key = client.response_cache.make_key("u")
+        client.response_cache.store(key, _resposta([1], headers=ETAG))
+        client.session.get.side_effect = [_resposta(None, status_code=304), _resposta([2], headers=ETAG)]
+        client.response_cache.get = MagicMock(return_value=None)
+
+        response = client._make_request("u")
+
+        assert response.json() == [2]
+        assert "If-None-Match" not in client.session.get.call_args_list[1].kwargs["headers"]
@@ -0,0 +1,61 @@
+# Testes unitários para src/data/http_session.py
+
+import pytest
+from unittest.mock import MagicMock
+
+from src.data.api_client import COVID19APIClient
+from src.data.http_session import create_session, get_shared_session, reset_shared_session
+
+
+@pytest.fixture(autouse=True)
+def sessao_limpa():
+    """Garante uma sessão compartilhada nova em cada teste."""
+    reset_shared_session()
+    yield
+    reset_shared_session()
+
+
+# ---------------------------------------------------------------------------
+# create_session()
+# ---------------------------------------------------------------------------
+
+class TestCreateSession:
+
+    def test_monta_mesmo_adaptador_para_http_e_https(self):
+        session = create_session()
+        assert session.get_adapter("https://api.brasil.io") is session.get_adapter("http://localhost")
+
+    def test_respeita_tamanho_do_pool(self):
+        session = create_session(pool_connections=2, pool_maxsize=7, pool_block=True)
+        adapter = session.get_adapter("https://disease.sh")
+        assert adapter._pool_connections == 2
+        assert adapter._pool_maxsize == 7
+        assert adapter._pool_block is True
+
+
+# ---------------------------------------------------------------------------
+# get_shared_session()
+# ---------------------------------------------------------------------------
+
+class TestGetSharedSession:
+
+    def test_retorna_sempre_a_mesma_instancia(self):
+        assert get_shared_session() is get_shared_session()
+
+    def test_clientes_compartilham_a_sessao(self):
+        assert COVID19APIClient().session is COVID19APIClient().session
+
+    def test_reset_cria_nova_sessao(self):
+        primeira = get_shared_session()
+        reset_shared_session()
+        assert get_shared_session() is not primeira
+
+    def test_make_request_usa_a_sessao_do_cliente(self):
+        session = MagicMock()
+        session.get.return_value = MagicMock(status_code=200, headers={})
+        client = COVID19APIClient(session=session)
+
+        response = client._make_request("https://example.com/data", params={"a": 1})
+
+        assert response.status_code == 200
+        session.get.assert_called_once()
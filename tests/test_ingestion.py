@@ -0,0 +1,107 @@
+# Testes unitários para src/data/ingestion.py
+
+import pandas as pd
+
+from src.data.ingestion import concat_caso_full, ingest_caso_full
+
+RESULTS = [
+    {
+        "state": "SP",
+        "city": None,
+        "city_ibge_code": 35,
+        "place_type": "state",
+        "date": "2022-03-27",
+        "is_last": True,
+        "estimated_population": 46_289_333,
+        "last_available_confirmed": 5_000_000,
+        "last_available_deaths": 170_000,
+        "last_available_confirmed_per_100k_inhabitants": 10801.9,
+        "new_confirmed": 500,
+        "new_deaths": -2,
+        "order_for_place": 750,
+        "epidemiological_week": 202213,
+    },
+    {
+        "state": "RJ",
+        "city": None,
+        "city_ibge_code": 33,
+        "place_type": "state",
+        "date": "2022-03-27",
+        "is_last": True,
+        "estimated_population": 17_366_189,
+        "last_available_confirmed": 2_000_000,
+        "last_available_deaths": 80_000,
+        "last_available_confirmed_per_100k_inhabitants": 11516.6,
+        "new_confirmed": 200,
+        "new_deaths": 4,
+        "order_for_place": 740,
+        "epidemiological_week": 202213,
+    },
+]
+
+
+# ---------------------------------------------------------------------------
+# ingest_caso_full()
+# ---------------------------------------------------------------------------
+
+class TestIngestCasoFull:
+
+    def test_descarta_colunas_nao_usadas(self):
+        df = ingest_caso_full(RESULTS)
+        assert "order_for_place" not in df.columns
+        assert "epidemiological_week" not in df.columns
+
+    def test_colunas_categoricas(self):
+        df = ingest_caso_full(RESULTS)
+        for col in ("state", "city", "place_type"):
+            assert isinstance(df[col].dtype, pd.CategoricalDtype)
+
+    def test_date_convertida(self):
+        df = ingest_caso_full(RESULTS)
+        assert pd.api.types.is_datetime64_any_dtype(df["date"])
+        assert df["date"].max() == pd.Timestamp("2022-03-27")
+
+    def test_contagens_no_menor_inteiro(self):
+        df = ingest_caso_full(RESULTS)
+        assert df["new_deaths"].dtype == "int8"
+        assert df["new_confirmed"].dtype == "int16"
+        assert df["last_available_confirmed"].dtype == "int32"
+
+    def test_contagem_com_ausentes_fica_float64(self):
+        df = ingest_caso_full([{**RESULTS[0], "estimated_population": None}, RESULTS[1]])
+        assert df["estimated_population"].dtype == "float64"
+
+    def test_soma_nao_estoura_inteiro_pequeno(self):
+        df = ingest_caso_full(RESULTS)
+        assert df["last_available_confirmed"].sum() == 7_000_000
+
+    def test_aceita_dataframe(self):
+        df = ingest_caso_full(pd.DataFrame(RESULTS))
+        assert isinstance(df["state"].dtype, pd.CategoricalDtype)
+
+    def test_entrada_vazia(self):
+        assert ingest_caso_full([]).empty
+        assert ingest_caso_full(None).empty
+
+
+# ---------------------------------------------------------------------------
+# concat_caso_full()
+# ---------------------------------------------------------------------------
+
+class TestConcatCasoFull:
+
+    def test_preserva_categoricas_com_categorias_diferentes(self):
+        partes = [ingest_caso_full([row]) for row in RESULTS]
+
+        df = concat_caso_full(partes)
+
+        assert isinstance(df["state"].dtype, pd.CategoricalDtype)
+        assert set(df["state"]) == {"SP", "RJ"}
+        assert list(df.index) == [0, 1]
+
+    def test_ignora_partes_vazias(self):
+        df = concat_caso_full([pd.DataFrame(), ingest_caso_full(RESULTS), None])
+        assert len(df) == 2
+
+    def test_sem_partes(self):
+        assert concat_caso_full([]).empty
@@ -0,0 +1,232 @@
+# Testes unitários para src/data/metrics.py
+
+import os
+import stat
+import threading
+import urllib.request
+from unittest.mock import MagicMock
+
+import pandas as pd
+import pytest
+import requests
+
+from src.data.api_client import COVID19APIClient, _endpoint_label
+from src.data.data_service import DataService
+from src.data.metrics import (
+    DATA_AGE,
+    LAST_REFRESH_SUCCESS,
+    REFRESH_SECONDS,
+    REGISTRY,
+    UPSTREAM_LATENCY,
+    UPSTREAM_RATE_LIMITED,
+    UPSTREAM_RETRIES,
+    UPSTREAM_TIMEOUTS,
+    Registry,
+    start_http_server,
+    write_metrics_file,
+)
+from src.data.resilience import reset_breakers
+
+
+@pytest.fixture
+def registry():
+    return Registry()
+
+
+@pytest.fixture(autouse=True)
+def breakers_limpos():
+    reset_breakers()
+    yield
+    reset_breakers()
+
+
+def _response(status_code, headers=None):
+    response = MagicMock()
+    response.status_code = status_code
+    response.headers = headers or {}
+    return response
+
+
+def _client(*effects):
+    session = MagicMock()
+    session.get.side_effect = list(effects)
+    client = COVID19APIClient(session=session)
+    client.response_cache.clear()
+    return client, session
+
+
+# ---------------------------------------------------------------------------
+# Tipos de métrica e exposição
+# ---------------------------------------------------------------------------
+
+class TestRegistry:
+
+    def test_contador_por_rotulos(self, registry):
+        counter = registry.counter("x_total", "ajuda", ("host",))
+        counter.inc(host="a")
+        counter.inc(2, host="a")
+        counter.inc(host="b")
+
+        assert counter.value(host="a") == 3
+        assert 'x_total{host="b"} 1' in registry.expose()
+
+    def test_rotulos_errados_ou_decremento(self, registry):
+        counter = registry.counter("x_total", "ajuda", ("host",))
+        with pytest.raises(ValueError):
+            counter.inc(outro="a")
+        with pytest.raises(ValueError):
+            counter.inc(-1, host="a")
+
+    def test_mesmo_nome_reaproveita_ou_recusa(self, registry):
+        assert registry.counter("x_total", "ajuda") is registry.counter("x_total", "ajuda")
+        with pytest.raises(ValueError):
+            registry.gauge("x_total", "ajuda")
+
+    def test_histograma_cumulativo(self, registry):
+        histogram = registry.histogram("lat_seconds", "ajuda", ("host",), buckets=(0.1, 1.0))
+        for value in (0.05, 0.5, 5.0):
+            histogram.observe(value, host="a")
+
+        text = registry.expose()
+        assert "# TYPE lat_seconds histogram" in text
+        assert 'lat_seconds_bucket{host="a",le="0.1"} 1' in text
+        assert 'lat_seconds_bucket{host="a",le="1"} 2' in text
+        assert 'lat_seconds_bucket{host="a",le="+Inf"} 3' in text
+        assert 'lat_seconds_sum{host="a"} 5.55' in text
+        assert 'lat_seconds_count{host="a"} 3' in text
+
+    def test_escape_dos_valores(self, registry):
+        registry.gauge("g", "ajuda", ("nome",)).set(1, nome='a"b')
+        assert 'g{nome="a\\"b"} 1' in registry.expose()
+
+    def test_coletor_roda_a_cada_exposicao(self, registry):
+        gauge = registry.gauge("idade_seconds", "ajuda")
+        calls = []
+
+        def collect():
+            calls.append(1)
+            gauge.set(len(calls))
+
+        registry.register_collector(collect)
+        registry.expose()
+        assert "idade_seconds 2" in registry.expose()
+
+        registry.unregister_collector(collect)
+        registry.expose()
+        assert len(calls) == 2
+
+    def test_coletor_com_erro_nao_derruba_exposicao(self, registry):
+        registry.counter("x_total", "ajuda").inc()
+        registry.register_collector(lambda: 1 / 0)
+        assert "x_total 1" in registry.expose()
+
+
+# ---------------------------------------------------------------------------
+# Exportadores
+# ---------------------------------------------------------------------------
+
+class TestExportadores:
+
+    def test_endpoint_http(self, registry):
+        registry.counter("x_total", "ajuda").inc()
+        server = start_http_server(0, registry=registry)
+        try:
+            url = f"http://127.0.0.1:{server.server_address[1]}/metrics"
+            with urllib.request.urlopen(url, timeout=5) as response:
+                body = response.read().decode()
+                content_type = response.headers["Content-Type"]
+        finally:
+            server.shutdown()
+            server.server_close()
+
+        assert "x_total 1" in body
+        assert content_type.startswith("text/plain; version=0.0.4")
+
+    def test_arquivo_gravado_sem_temporarios(self, registry, tmp_path):
+        registry.counter("x_total", "ajuda").inc()
+        path = tmp_path / "sub" / "covid19.prom"
+
+        write_metrics_file(str(path), registry)
+        write_metrics_file(str(path), registry)
+
+        assert "x_total 1" in path.read_text()
+        assert os.listdir(path.parent) == ["covid19.prom"]
+
+    def test_arquivo_legivel_por_outros_usuarios(self, registry, tmp_path):
+        path = tmp_path / "covid19.prom"
+
+        write_metrics_file(str(path), registry)
+
+        assert stat.S_IMODE(os.stat(path).st_mode) == 0o644
+
+
+# ---------------------------------------------------------------------------
+# Instrumentação do cliente e do serviço de dados
+# ---------------------------------------------------------------------------
+
+class TestInstrumentacao:
+
+    def test_rotulo_do_endpoint_sem_partes_variaveis(self):
+        assert _endpoint_label("https://disease.sh/v3/covid-19/countries/Brazil,Chile") == "/countries/{list}"
+        assert _endpoint_label("https://disease.sh/v3/covid-19/countries") == "/countries"
+        assert _endpoint_label("https://api.brasil.io/v1/dataset/covid19/caso_full/data/") == "/caso_full/data"
+
+    def test_429_contado_e_medido(self):
+        rotulos = {"host": "api.exemplo", "endpoint": "dados", "status": "429"}
+        antes = UPSTREAM_RATE_LIMITED.value(host="api.exemplo"), UPSTREAM_LATENCY.count(**rotulos)
+        client, _ = _client(_response(429, {"Retry-After": "30"}))
+
+        assert client._make_request("https://api.exemplo/dados") is None
+
+        assert UPSTREAM_RATE_LIMITED.value(host="api.exemplo") == antes[0] + 1
+        assert UPSTREAM_LATENCY.count(**rotulos) == antes[1] + 1
+
+    def test_timeout_e_nova_tentativa(self, mocker):
+        mocker.patch("src.data.api_client.time.sleep")
+        retries = UPSTREAM_RETRIES.value(host="api.exemplo", endpoint="dados")
+        timeouts = UPSTREAM_TIMEOUTS.value(host="api.exemplo")
+        client, session = _client(requests.exceptions.Timeout(), requests.exceptions.Timeout())
+
+        client._make_request("https://api.exemplo/dados")
+
+        assert session.get.call_count == 2
+        assert UPSTREAM_TIMEOUTS.value(host="api.exemplo") == timeouts + 2
+        assert UPSTREAM_RETRIES.value(host="api.exemplo", endpoint="dados") == retries + 1
+
+    def test_refresh_medido_e_idade_exposta(self):
+        def falha(client, snapshots):
+            raise ValueError("x")
+
+        service = DataService(
+            loaders={"m_ok": lambda client, snapshots: pd.DataFrame({"a": [1]}), "m_falha": falha},
+            interval=3600,
+            client_factory=MagicMock,
+        )
+        service.refresh()
+
+        assert REFRESH_SECONDS.count(dataset="m_ok", result="ok") == 1
+        assert REFRESH_SECONDS.count(dataset="m_falha", result="error") == 1
+        assert LAST_REFRESH_SUCCESS.value(dataset="m_ok") == service.get("m_ok").fetched_at
+        assert LAST_REFRESH_SUCCESS.value(dataset="m_falha") is None
+
+        REGISTRY.register_collector(service._collect_metrics)
+        try:
+            assert 'covid19_data_age_seconds{dataset="m_ok"}' in REGISTRY.expose()
+        finally:
+            REGISTRY.unregister_collector(service._collect_metrics)
+        assert DATA_AGE.value(dataset="m_ok") >= 0
+
+    def test_coletor_le_os_snapshots_sob_o_lock(self):
+        service = DataService(loaders={"m_lock": lambda client, snapshots: pd.DataFrame({"a": [1]})},
+                              interval=3600, client_factory=MagicMock)
+        service.refresh()
+
+        with service._lock:
+            coletor = threading.Thread(target=service._collect_metrics)
+            coletor.start()
+            coletor.join(0.2)
+            assert coletor.is_alive()
+        coletor.join(5)
+
+        assert not coletor.is_alive()
+        assert DATA_AGE.value(dataset="m_lock") >= 0
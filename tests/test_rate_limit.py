@@ -0,0 +1,170 @@
+# Testes unitários para src/data/rate_limit.py
+
+import pytest
+from unittest.mock import MagicMock
+
+from src.data.api_client import COVID19APIClient
+from src.data.rate_limit import SQLiteTokenBucket, TokenBucket, get_limiter, reset_limiters
+from src.data.resilience import reset_breakers
+
+
+class FakeClock:
+    """Relógio que só avança quando alguém 'dorme'."""
+
+    def __init__(self):
+        self.now = 100.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+
+
+@pytest.fixture(autouse=True)
+def estado_limpo():
+    reset_limiters()
+    reset_breakers()
+    yield
+    reset_limiters()
+    reset_breakers()
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+# ---------------------------------------------------------------------------
+# TokenBucket
+# ---------------------------------------------------------------------------
+
+class TestTokenBucket:
+
+    def test_rajada_sai_sem_espera(self, clock):
+        bucket = TokenBucket(rate=2, capacity=3, clock=clock, sleep=clock.sleep)
+
+        for _ in range(3):
+            assert bucket.acquire() is True
+
+        assert clock.sleeps == []
+
+    def test_fila_em_ordem_de_chegada(self, clock):
+        bucket = TokenBucket(rate=2, capacity=1, clock=clock, sleep=clock.sleep)
+
+        for _ in range(4):
+            bucket.acquire()
+
+        # Cada chamada recebe o próximo horário livre: 0s, 0.5s, 1s, 1.5s
+        assert clock.sleeps == [0.5, 1.0, 1.5]
+
+    def test_timeout_nao_reserva_horario(self, clock):
+        bucket = TokenBucket(rate=1, capacity=1, clock=clock, sleep=clock.sleep)
+        bucket.acquire()
+
+        assert bucket.acquire(timeout=0.5) is False
+        assert bucket.acquire(timeout=1) is True
+        assert clock.sleeps == [1.0]
+
+    def test_balde_recarrega_com_o_tempo(self, clock):
+        bucket = TokenBucket(rate=1, capacity=2, clock=clock, sleep=clock.sleep)
+        bucket.acquire()
+        bucket.acquire()
+        clock.now += 2
+
+        bucket.acquire()
+        bucket.acquire()
+
+        assert clock.sleeps == []
+
+    def test_defer_adia_a_fila(self, clock):
+        bucket = TokenBucket(rate=10, capacity=5, clock=clock, sleep=clock.sleep)
+
+        bucket.defer(3)
+        bucket.acquire()
+
+        assert clock.sleeps == [pytest.approx(3 - bucket.burst)]
+
+
+class TestSQLiteTokenBucket:
+
+    def test_replicas_dividem_a_cota(self, tmp_path, clock):
+        path = tmp_path / "rate.sqlite"
+        replica_a = SQLiteTokenBucket(path, "api.brasil.io", rate=2, capacity=1, clock=clock, sleep=clock.sleep)
+        replica_b = SQLiteTokenBucket(path, "api.brasil.io", rate=2, capacity=1, clock=clock, sleep=clock.sleep)
+
+        replica_a.acquire()
+        replica_b.acquire()
+        replica_a.acquire()
+
+        assert clock.sleeps == [0.5, 1.0]
+
+    def test_hosts_independentes(self, tmp_path, clock):
+        path = tmp_path / "rate.sqlite"
+        brasil = SQLiteTokenBucket(path, "api.brasil.io", rate=1, capacity=1, clock=clock, sleep=clock.sleep)
+        mundo = SQLiteTokenBucket(path, "disease.sh", rate=1, capacity=1, clock=clock, sleep=clock.sleep)
+
+        brasil.acquire()
+        mundo.acquire()
+
+        assert clock.sleeps == []
+
+    def test_defer_vale_para_outra_replica(self, tmp_path, clock):
+        path = tmp_path / "rate.sqlite"
+        replica_a = SQLiteTokenBucket(path, "api.brasil.io", rate=1, capacity=1, clock=clock, sleep=clock.sleep)
+        replica_b = SQLiteTokenBucket(path, "api.brasil.io", rate=1, capacity=1, clock=clock, sleep=clock.sleep)
+
+        replica_a.defer(5)
+
+        assert replica_b.acquire(timeout=1) is False
+
+
+# ---------------------------------------------------------------------------
+# Integração com COVID19APIClient._make_request
+# ---------------------------------------------------------------------------
+
+class TestClienteComLimitador:
+
+    def test_host_sem_configuracao_nao_tem_limite(self):
+        assert get_limiter("api.exemplo") is None
+
+    def test_limitador_compartilhado_no_processo(self):
+        assert get_limiter("api.brasil.io") is get_limiter("api.brasil.io")
+
+    def test_adquire_antes_de_cada_requisicao(self, mocker):
+        limiter = MagicMock()
+        limiter.acquire.return_value = True
+        mocker.patch("src.data.api_client.get_limiter", return_value=limiter)
+        session = MagicMock()
+        session.get.return_value = MagicMock(status_code=200, headers={})
+
+        COVID19APIClient(session=session)._make_request("https://api.brasil.io/x")
+
+        limiter.acquire.assert_called_once()
+
+    def test_fila_alem_do_orcamento_nao_chama_rede(self, mocker):
+        limiter = MagicMock()
+        limiter.acquire.return_value = False
+        mocker.patch("src.data.api_client.get_limiter", return_value=limiter)
+        session = MagicMock()
+
+        assert COVID19APIClient(session=session)._make_request("https://api.brasil.io/x") is None
+        session.get.assert_not_called()
+
+    def test_429_adia_a_fila_em_vez_de_dormir(self, mocker):
+        limiter = MagicMock()
+        limiter.acquire.return_value = True
+        mocker.patch("src.data.api_client.get_limiter", return_value=limiter)
+        sleep = mocker.patch("src.data.api_client.time.sleep")
+        session = MagicMock()
+        session.get.side_effect = [
+            MagicMock(status_code=429, headers={}),
+            MagicMock(status_code=200, headers={}),
+        ]
+
+        response = COVID19APIClient(session=session)._make_request("https://api.brasil.io/x")
+
+        assert response.status_code == 200
+        limiter.defer.assert_called_once_with(1)
+        sleep.assert_not_called()
@@ -0,0 +1,43 @@
+# Testes unitários para src/components/render_engine.py
+
+import pandas as pd
+import plotly.graph_objects as go
+
+from src.components.render_engine import figure_points, line_render_mode, scatter_trace, use_webgl
+from src.utils.downsampling import points_for_width
+
+
+class TestUseWebgl:
+
+    def test_auto_usa_limite(self):
+        assert use_webgl(10, engine="auto", threshold=100) is False
+        assert use_webgl(101, engine="auto", threshold=100) is True
+
+    def test_motor_fixo_ignora_limite(self):
+        assert use_webgl(10**6, engine="svg") is False
+        assert use_webgl(1, engine="webgl") is True
+
+    def test_motor_desconhecido_vira_auto(self):
+        assert use_webgl(10, engine="canvas", threshold=100) is False
+
+
+class TestTraces:
+
+    def test_scatter_trace_escolhe_classe(self):
+        assert isinstance(scatter_trace(1, engine="svg", x=[1], y=[1]), go.Scatter)
+        assert isinstance(scatter_trace(1, engine="webgl", x=[1], y=[1]), go.Scattergl)
+
+    def test_line_render_mode(self):
+        assert line_render_mode(1, engine="webgl") == "webgl"
+        assert line_render_mode(1, engine="svg") == "svg"
+
+    def test_figure_points_soma_os_traces(self):
+        df = pd.DataFrame({"state": ["SP", "SP", "SP", "RJ"], "y": range(4)})
+        assert figure_points(df) == 4
+        assert figure_points(None) == 0
+
+    def test_auto_liga_webgl_com_muitos_estados_reduzidos(self):
+        # 27 estados com o limite padrão de pontos por trace passam do limite padrão do modo 'auto'
+        df = pd.DataFrame({"state": ["SP"] * points_for_width() * 27, "y": 0})
+        assert line_render_mode(figure_points(df), engine="auto") == "webgl"
+        assert line_render_mode(points_for_width(), engine="auto") == "svg"
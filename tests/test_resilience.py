@@ -0,0 +1,293 @@
+# Testes unitários para src/data/resilience.py
+
+import threading
+import time
+from email.utils import formatdate
+
+import pytest
+import requests
+from unittest.mock import MagicMock
+
+from src.data.api_client import COVID19APIClient
+from src.data.resilience import (
+    CLOSED, HALF_OPEN, OPEN, CircuitBreaker, breaker_states, deadline, get_breaker,
+    parse_retry_after, remaining_budget, reset_breakers,
+)
+
+
+class FakeClock:
+    """Relógio controlado manualmente."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture(autouse=True)
+def breakers_limpos():
+    """Os breakers são do processo: cada teste começa e termina sem nenhum."""
+    reset_breakers()
+    yield
+    reset_breakers()
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+def _response(status_code, headers=None):
+    response = MagicMock()
+    response.status_code = status_code
+    response.headers = headers or {}
+    return response
+
+
+def _client(*effects):
+    session = MagicMock()
+    session.get.side_effect = list(effects)
+    client = COVID19APIClient(session=session)
+    client.response_cache.clear()
+    return client, session
+
+
+# ---------------------------------------------------------------------------
+# CircuitBreaker
+# ---------------------------------------------------------------------------
+
+class TestCircuitBreaker:
+
+    def test_abre_apos_limite_de_falhas(self, clock):
+        breaker = CircuitBreaker("api", failure_threshold=3, recovery_timeout=10, clock=clock)
+        breaker.record_failure("timeout")
+        breaker.record_failure("timeout")
+        assert breaker.state == CLOSED
+
+        breaker.record_failure("timeout")
+
+        assert breaker.state == OPEN
+        assert breaker.allow_request() is False
+
+    def test_sucesso_zera_contagem(self, clock):
+        breaker = CircuitBreaker("api", failure_threshold=2, clock=clock)
+        breaker.record_failure()
+        breaker.record_success(0.1)
+        breaker.record_failure()
+
+        assert breaker.state == CLOSED
+
+    def test_half_open_permite_um_unico_teste(self, clock):
+        breaker = CircuitBreaker("api", failure_threshold=1, recovery_timeout=10, clock=clock)
+        breaker.record_failure()
+        clock.now = 10
+
+        assert breaker.allow_request() is True
+        assert breaker.state == HALF_OPEN
+        assert breaker.allow_request() is False
+
+    def test_teste_bem_sucedido_fecha(self, clock):
+        breaker = CircuitBreaker("api", failure_threshold=1, recovery_timeout=10, clock=clock)
+        breaker.record_failure()
+        clock.now = 10
+        breaker.allow_request()
+
+        breaker.record_success()
+
+        assert breaker.state == CLOSED
+        assert breaker.allow_request() is True
+
+    def test_teste_com_falha_reabre(self, clock):
+        breaker = CircuitBreaker("api", failure_threshold=5, recovery_timeout=10, clock=clock)
+        for _ in range(5):
+            breaker.record_failure()
+        clock.now = 10
+        breaker.allow_request()
+
+        breaker.record_failure()
+
+        assert breaker.state == OPEN
+        assert breaker.snapshot()["retry_in"] == 10
+
+    def test_teste_devolvido_libera_nova_tentativa(self, clock):
+        breaker = CircuitBreaker("api", failure_threshold=1, recovery_timeout=10, clock=clock)
+        breaker.record_failure()
+        clock.now = 10
+        breaker.allow_request()
+
+        breaker.release_probe()
+
+        assert breaker.state == HALF_OPEN
+        assert breaker.allow_request() is True
+
+    def test_teste_de_outra_thread_nao_e_devolvido(self, clock):
+        breaker = CircuitBreaker("api", failure_threshold=1, recovery_timeout=10, clock=clock)
+        breaker.record_failure()
+        clock.now = 10
+        outra = threading.Thread(target=breaker.allow_request)
+        outra.start()
+        outra.join()
+
+        breaker.release_probe()
+
+        assert breaker.allow_request() is False
+
+    def test_retry_after_abre_pelo_tempo_pedido(self, clock):
+        breaker = CircuitBreaker("api", failure_threshold=5, recovery_timeout=30, clock=clock)
+
+        breaker.record_failure("HTTP 429", retry_after=2)
+
+        assert breaker.state == OPEN
+        clock.now = 2
+        assert breaker.allow_request() is True
+
+
+# ---------------------------------------------------------------------------
+# parse_retry_after() / deadline()
+# ---------------------------------------------------------------------------
+
+class TestRetryAfter:
+
+    def test_segundos(self):
+        assert parse_retry_after("7") == 7.0
+
+    def test_data_http(self):
+        segundos = parse_retry_after(formatdate(time.time() + 60, usegmt=True))
+        assert 55 <= segundos <= 60
+
+    def test_invalido_ou_ausente(self):
+        assert parse_retry_after(None) is None
+        assert parse_retry_after("amanhã") is None
+
+
+class TestDeadline:
+
+    def test_sem_orcamento(self):
+        assert remaining_budget() is None
+
+    def test_orcamento_dentro_do_bloco(self):
+        with deadline(5):
+            assert 4 < remaining_budget() <= 5
+        assert remaining_budget() is None
+
+    def test_aninhado_so_encurta(self):
+        with deadline(1):
+            with deadline(60):
+                assert remaining_budget() <= 1
+            with deadline(0.5):
+                assert remaining_budget() <= 0.5
+
+
+# ---------------------------------------------------------------------------
+# Integração com COVID19APIClient._make_request
+# ---------------------------------------------------------------------------
+
+class TestClienteComCircuitBreaker:
+
+    def test_circuito_aberto_falha_sem_rede(self):
+        client, session = _client()
+        breaker = get_breaker("api.exemplo")
+        for _ in range(breaker.failure_threshold):
+            breaker.record_failure()
+
+        assert client._make_request("https://api.exemplo/dados") is None
+        session.get.assert_not_called()
+
+    def test_falhas_de_conexao_abrem_circuito(self, mocker):
+        mocker.patch("src.data.api_client.time.sleep")
+        erros = [requests.exceptions.ConnectionError()] * 6
+        client, session = _client(*erros)
+        client.max_retries = 5
+
+        client._make_request("https://api.exemplo/dados")
+
+        assert get_breaker("api.exemplo").state == OPEN
+        assert session.get.call_count == get_breaker("api.exemplo").failure_threshold
+
+    def test_retry_after_interrompe_tentativas(self):
+        client, session = _client(_response(429, {"Retry-After": "30"}))
+
+        assert client._make_request("https://api.exemplo/dados") is None
+
+        assert session.get.call_count == 1
+        estado = breaker_states()[0]
+        assert estado["state"] == OPEN
+        assert estado["retry_in"] > 25
+
+    def test_limitador_recusado_no_half_open_nao_prende_o_teste(self, mocker):
+        limiter = MagicMock()
+        limiter.acquire.return_value = False
+        mocker.patch("src.data.api_client.get_limiter", return_value=limiter)
+        clock = FakeClock()
+        breaker = get_breaker("api.exemplo")
+        breaker.clock = clock
+        for _ in range(breaker.failure_threshold):
+            breaker.record_failure()
+        clock.now = breaker.recovery_timeout
+        client, session = _client(_response(200))
+
+        assert client._make_request("https://api.exemplo/dados") is None
+        assert breaker.state == HALF_OPEN
+
+        limiter.acquire.return_value = True
+        assert client._make_request("https://api.exemplo/dados") is not None
+        assert session.get.call_count == 1
+        assert breaker.state == CLOSED
+
+    def test_erro_4xx_nao_conta_como_falha(self):
+        client, _ = _client(_response(404), _response(404))
+
+        client._make_request("https://api.exemplo/dados")
+
+        assert get_breaker("api.exemplo").failures == 0
+
+    def test_erros_5xx_abrem_circuito(self, mocker):
+        mocker.patch("src.data.api_client.time.sleep")
+        client, session = _client(*[_response(status) for status in (500, 502, 504, 502, 502, 502)])
+        client.max_retries = 6
+
+        client._make_request("https://api.exemplo/dados")
+
+        breaker = get_breaker("api.exemplo")
+        assert breaker.state == OPEN
+        assert session.get.call_count == breaker.failure_threshold
+
+    def test_orcamento_limita_timeout(self):
+        client, session = _client(_response(200))
+
+        with deadline(2):
+            client._make_request("https://api.exemplo/dados")
+
+        assert session.get.call_args.kwargs["timeout"] <= 2
+
+    def test_orcamento_esgotado_nao_chama_rede(self):
+        client, session = _client(_response(200))
+
+        with deadline(0):
+            assert client._make_request("https://api.exemplo/dados") is None
+        session.get.assert_not_called()
+
+    def test_sem_vaga_no_limite_global_respeita_o_orcamento(self, mocker):
+        vagas = threading.BoundedSemaphore(1)
+        vagas.acquire()  # Outra requisição ocupa a única vaga
+        mocker.patch("src.data.api_client._request_slots", vagas)
+        client, session = _client(_response(200))
+
+        inicio = time.monotonic()
+        with deadline(0.2):
+            assert client._make_request("https://api.exemplo/dados") is None
+
+        assert time.monotonic() - inicio < 1
+        session.get.assert_not_called()
+        vagas.release()
+        assert client._make_request("https://api.exemplo/dados") is not None
+
+    def test_fetch_many_propaga_orcamento(self):
+        client = COVID19APIClient(session=MagicMock())
+        client.orcamento = lambda: remaining_budget()
+
+        with deadline(5):
+            (budget,) = client.fetch_many([("orcamento", {})])
+
+        assert budget is not None and budget <= 5
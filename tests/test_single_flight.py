@@ -0,0 +1,159 @@
+# Testes unitários para src/data/single_flight.py
+
+import threading
+import time
+
+import pytest
+from unittest.mock import MagicMock
+
+from src.data.api_client import COVID19APIClient
+from src.data.resilience import reset_breakers
+from src.data.single_flight import SingleFlight
+
+
+def _lento(liberar, chamadas, valor="ok"):
+    """Função que registra a chamada e só termina quando `liberar` for sinalizado."""
+    def fn():
+        chamadas.append(1)
+        liberar.wait(2)
+        return valor
+    return fn
+
+
+def _em_threads(n, alvo):
+    resultados = [None] * n
+
+    def run(i):
+        resultados[i] = alvo()
+
+    threads = [threading.Thread(target=run, args=(i,)) for i in range(n)]
+    for thread in threads:
+        thread.start()
+    return threads, resultados
+
+
+# ---------------------------------------------------------------------------
+# SingleFlight.do()
+# ---------------------------------------------------------------------------
+
+class TestSingleFlight:
+
+    def test_chamadas_concorrentes_executam_uma_vez(self):
+        flights = SingleFlight()
+        liberar, chamadas = threading.Event(), []
+        fn = _lento(liberar, chamadas)
+
+        threads, resultados = _em_threads(5, lambda: flights.do("k", fn))
+        while flights.in_flight() == 0:
+            pass
+        time.sleep(0.05)  # Dá tempo para as demais threads chegarem
+        liberar.set()
+        for thread in threads:
+            thread.join(2)
+
+        assert len(chamadas) == 1
+        assert resultados == ["ok"] * 5
+
+    def test_chaves_diferentes_nao_compartilham(self):
+        flights = SingleFlight()
+        assert flights.do("a", lambda: 1) == 1
+        assert flights.do("b", lambda: 2) == 2
+
+    def test_nao_e_cache(self):
+        flights = SingleFlight()
+        chamadas = []
+        flights.do("k", lambda: chamadas.append(1))
+        flights.do("k", lambda: chamadas.append(1))
+
+        assert len(chamadas) == 2
+        assert flights.in_flight() == 0
+
+    def test_excecao_entregue_a_quem_espera(self):
+        flights = SingleFlight()
+        liberar = threading.Event()
+
+        def quebra():
+            liberar.wait(2)
+            raise RuntimeError("falhou")
+
+        erros = []
+
+        def chamar():
+            try:
+                flights.do("k", quebra)
+            except RuntimeError as e:
+                erros.append(e)
+
+        threads = [threading.Thread(target=chamar) for _ in range(3)]
+        for thread in threads:
+            thread.start()
+        while flights.in_flight() == 0:
+            pass
+        time.sleep(0.05)  # Dá tempo para as demais threads chegarem
+        liberar.set()
+        for thread in threads:
+            thread.join(2)
+
+        assert len(erros) == 3
+        assert flights.in_flight() == 0
+
+    def test_timeout_de_quem_espera(self):
+        flights = SingleFlight()
+        liberar, chamadas = threading.Event(), []
+        lider = threading.Thread(target=flights.do, args=("k", _lento(liberar, chamadas)))
+        lider.start()
+        while flights.in_flight() == 0:
+            pass
+
+        with pytest.raises(TimeoutError):
+            flights.do("k", lambda: "outro", timeout=0.01)
+
+        liberar.set()
+        lider.join(2)
+
+
+# ---------------------------------------------------------------------------
+# Integração com COVID19APIClient._make_request
+# ---------------------------------------------------------------------------
+
+class TestClienteSingleFlight:
+
+    @pytest.fixture(autouse=True)
+    def breakers_limpos(self):
+        reset_breakers()
+        yield
+        reset_breakers()
+
+    def test_requisicoes_identicas_usam_uma_chamada_http(self):
+        liberar = threading.Event()
+        session = MagicMock()
+
+        def get(*args, **kwargs):
+            liberar.wait(2)
+            return MagicMock(status_code=200, headers={})
+
+        session.get.side_effect = get
+        client = COVID19APIClient(session=session)
+
+        threads, resultados = _em_threads(
+            4, lambda: client._make_request("https://api.exemplo/dados", params={"is_last": "True"})
+        )
+        while session.get.call_count == 0:
+            pass
+        time.sleep(0.05)
+        liberar.set()
+        for thread in threads:
+            thread.join(2)
+
+        assert session.get.call_count == 1
+        assert all(r is resultados[0] for r in resultados)
+
+    def test_parametros_diferentes_geram_chamadas_distintas(self):
+        session = MagicMock()
+        session.get.return_value = MagicMock(status_code=200, headers={})
+        client = COVID19APIClient(session=session)
+
+        client._make_request("https://api.exemplo/dados", params={"state": "SP"})
+        client._make_request("https://api.exemplo/dados", params={"state": "RJ"})
+
+        assert session.get.call_count == 2
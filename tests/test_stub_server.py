@@ -0,0 +1,166 @@
+# Testes de integração do cliente com src/data/stub_server.py
+
+import os
+import subprocess
+import sys
+import time
+
+import pytest
+import requests
+
+from src.data.api_client import COVID19APIClient
+from src.data.resilience import reset_breakers
+from src.data.stub_server import DEFAULT_FAULTS, StubAPIServer
+
+
+@pytest.fixture(scope="module")
+def server():
+    with StubAPIServer(days=40, city_states=["AC"], countries=60, hang_seconds=2) as stub:
+        yield stub
+
+
+@pytest.fixture(autouse=True)
+def estado_limpo(server):
+    server.configure(**{**DEFAULT_FAULTS, "hang_seconds": 2})
+    server.reset_stats()
+    reset_breakers()
+    yield
+    reset_breakers()
+
+
+@pytest.fixture
+def client(server, monkeypatch):
+    """Cliente apontando para o servidor local."""
+    monkeypatch.setattr("src.data.api_client.BRASIL_IO_API_URL", server.brasil_io_url)
+    monkeypatch.setattr("src.data.api_client.WORLD_COVID_API_URL", server.world_url)
+    return COVID19APIClient()
+
+
+# ---------------------------------------------------------------------------
+# Brasil.io (/caso_full/data)
+# ---------------------------------------------------------------------------
+
+class TestCasoFull:
+
+    def test_dados_atuais_dos_estados(self, client):
+        df = client.get_brasil_data()
+
+        assert len(df) == 27
+        assert (df["place_type"] == "state").all()
+        assert df["is_last"].all()
+
+    def test_paginacao_pelo_link_next(self, client, server, monkeypatch):
+        monkeypatch.setattr("src.data.api_client.BRASIL_IO_PAGE_SIZE", 200)
+
+        chunks = list(client.iter_brasil_pages({"place_type": "state"}))
+
+        assert sum(len(chunk) for chunk in chunks) == 27 * 40
+        assert len(chunks) == server.stats()["pages"] == 6
+
+    def test_filtros_de_estado_e_periodo(self, client):
+        df = client.get_brasil_time_series(state="SP", days=10)
+
+        assert len(df) == 10
+        assert set(df["state"]) == {"SP"}
+        assert df["date"].is_monotonic_increasing
+
+    def test_linhas_de_municipios(self, server):
+        data = requests.get(f"{server.brasil_io_url}/caso_full/data",
+                            params={"place_type": "city", "is_last": "True"}, timeout=5).json()
+
+        assert data["count"] == 22
+        assert {row["state"] for row in data["results"]} == {"AC"}
+
+    def test_mais_recentes_primeiro(self, server):
+        results = requests.get(f"{server.brasil_io_url}/caso_full/data",
+                               params={"state": "RJ", "page_size": 5}, timeout=5).json()["results"]
+
+        datas = [row["date"] for row in results]
+        assert datas == sorted(datas, reverse=True)
+
+    def test_pagina_inexistente(self, server):
+        response = requests.get(f"{server.brasil_io_url}/caso_full/data", params={"page": 99}, timeout=5)
+        assert response.status_code == 404
+
+
+# ---------------------------------------------------------------------------
+# disease.sh (/countries)
+# ---------------------------------------------------------------------------
+
+class TestCountries:
+
+    def test_top_paises_sem_o_brasil(self, client):
+        df = client.get_world_top_countries(limit=5)
+
+        assert len(df) == 5
+        assert "Brazil" not in set(df["country"])
+        assert df["cases"].is_monotonic_decreasing
+
+    def test_lista_de_paises(self, client):
+        df = client.get_world_countries_data(["USA", "France", "Japan"])
+        assert sorted(df["country"]) == ["France", "Japan", "USA"]
+
+    def test_um_pais_vem_como_objeto(self, server):
+        data = requests.get(f"{server.world_url}/countries/Brazil", timeout=5).json()
+        assert data["country"] == "Brazil"
+
+    def test_pais_desconhecido(self, server):
+        assert requests.get(f"{server.world_url}/countries/Atlantida", timeout=5).status_code == 404
+
+
+# ---------------------------------------------------------------------------
+# Falhas injetadas e cache
+# ---------------------------------------------------------------------------
+
+class TestFaults:
+
+    def test_latencia(self, server):
+        server.configure(latency=0.2)
+
+        start = time.perf_counter()
+        requests.get(f"{server.world_url}/countries", timeout=5)
+        assert time.perf_counter() - start >= 0.2
+
+    def test_429_com_retry_after(self, client, server):
+        server.configure(rate_limit_rate=1.0, retry_after=7)
+
+        assert client.get_world_top_countries() is None
+        response = requests.get(f"{server.world_url}/countries", timeout=5)
+        assert response.status_code == 429
+        assert response.headers["Retry-After"] == "7"
+        assert server.stats()["rate_limited"] == 2
+
+    def test_timeout(self, client, server):
+        server.configure(timeout_rate=1.0)
+        client.timeout = 0.3
+        client.max_retries = 1
+
+        assert client.get_brasil_data() is None
+        assert server.stats()["timeouts"] == 1
+
+    def test_etag_responde_304(self, server):
+        url = f"{server.world_url}/countries"
+        etag = requests.get(url, timeout=5).headers["ETag"]
+
+        response = requests.get(url, headers={"If-None-Match": etag}, timeout=5)
+        assert response.status_code == 304
+        assert server.stats()["not_modified"] == 1
+
+    def test_falha_desconhecida(self, server):
+        with pytest.raises(TypeError):
+            server.configure(erro=1)
+
+
+# ---------------------------------------------------------------------------
+# URLs base por variável de ambiente
+# ---------------------------------------------------------------------------
+
+def test_urls_base_sobrescritas_por_ambiente(server):
+    code = "from src.utils.constants import BRASIL_IO_API_URL, RATE_LIMITS; print(BRASIL_IO_API_URL); print(list(RATE_LIMITS))"
+    env = {**os.environ, **server.env()}
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, env=env,
+                            cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+    url, hosts = result.stdout.strip().splitlines()
+    assert url == server.brasil_io_url
+    assert f"{server.host}:{server.port}" in hosts
@@ -0,0 +1,148 @@
+# Testes unitários para src/data/synthetic.py
+
+import pandas as pd
+import pytest
+
+from src.data.data_processor import calculate_moving_averages, calculate_totals, enrich_state_metrics
+from src.data.ingestion import CASO_FULL_COLUMNS
+from src.data.synthetic import (
+    ESTADOS_IBGE,
+    PAISES,
+    generate_cities,
+    generate_countries,
+    generate_states,
+    iter_cities,
+    municipalities,
+)
+from src.utils.constants import ESTADOS_BRASIL
+
+
+# ---------------------------------------------------------------------------
+# Estados
+# ---------------------------------------------------------------------------
+
+class TestGenerateStates:
+
+    def test_todas_as_colunas_do_caso_full(self):
+        df = generate_states(days=10)
+
+        assert list(df.columns) == CASO_FULL_COLUMNS
+        assert len(df) == 27 * 10
+        assert sorted(df["state"].unique()) == sorted(ESTADOS_BRASIL)
+        assert (df["place_type"] == "state").all()
+
+    def test_deterministico(self):
+        pd.testing.assert_frame_equal(generate_states(days=60, seed=7), generate_states(days=60, seed=7))
+
+    def test_semente_diferente_muda_os_dados(self):
+        a = generate_states(days=60, seed=1)["new_confirmed"]
+        b = generate_states(days=60, seed=2)["new_confirmed"]
+        assert not a.equals(b)
+
+    def test_acumulados_consistentes_com_diarios(self):
+        df = generate_states(days=200, states=["SP", "AC"])
+
+        for _, grupo in df.groupby("state", observed=True):
+            assert (grupo["new_confirmed"].cumsum() == grupo["last_available_confirmed"]).all()
+            assert (grupo["new_deaths"].cumsum() == grupo["last_available_deaths"]).all()
+            assert (grupo["last_available_confirmed"] >= 0).all()
+
+    def test_is_last_apenas_no_ultimo_dia(self):
+        df = generate_states(days=30)
+
+        assert df["is_last"].sum() == 27
+        assert (df.loc[df["is_last"], "date"] == df["date"].max()).all()
+
+    def test_incidencia_e_letalidade(self):
+        ultimo = generate_states(days=400, states=["RJ"]).iloc[-1]
+
+        incidencia = ultimo["last_available_confirmed"] / ultimo["estimated_population"] * 100_000
+        letalidade = ultimo["last_available_deaths"] / ultimo["last_available_confirmed"]
+        assert ultimo["last_available_confirmed_per_100k_inhabitants"] == pytest.approx(incidencia, rel=1e-5)
+        assert ultimo["last_available_death_rate"] == pytest.approx(letalidade, abs=1e-4)
+
+    def test_raw_no_formato_da_api(self):
+        registro = generate_states(days=3, states=["SP"], raw=True).to_dict("records")[-1]
+
+        assert registro["date"] == "2020-02-27"
+        assert registro["is_last"]
+        assert registro["city"] is None
+        assert registro["city_ibge_code"] == 35
+
+    def test_uf_desconhecida(self):
+        with pytest.raises(ValueError):
+            generate_states(days=3, states=["XX"])
+
+    def test_volume_de_producao_nos_processadores(self):
+        df = generate_states()
+        ultimo = df[df["is_last"]]
+
+        com_medias = calculate_moving_averages(df)
+        assert len(com_medias) == len(df) == 27 * 1100
+        assert calculate_totals(ultimo)["total_cases"] == ultimo["last_available_confirmed"].sum()
+        assert len(enrich_state_metrics(ultimo)) == 27
+
+
+# ---------------------------------------------------------------------------
+# Municípios
+# ---------------------------------------------------------------------------
+
+class TestCities:
+
+    def test_5570_municipios(self):
+        cidades = municipalities()
+
+        assert len(cidades) == 5570
+        assert cidades["city_ibge_code"].is_unique
+        assert cidades["city"].is_unique
+
+    def test_populacao_soma_a_do_estado(self):
+        cidades = municipalities(["MG"])
+
+        assert cidades["estimated_population"].sum() == pytest.approx(ESTADOS_IBGE["MG"][1], rel=0.01)
+
+    def test_blocos_nao_alteram_os_dados(self):
+        inteiro = generate_cities(days=20, states=["AC", "RR"], chunk_days=20)
+        em_blocos = generate_cities(days=20, states=["AC", "RR"], chunk_days=3)
+
+        pd.testing.assert_frame_equal(inteiro, em_blocos)
+
+    def test_iter_cities_produz_blocos_por_data(self):
+        blocos = list(iter_cities(days=10, states=["AP"], chunk_days=4))
+
+        assert [len(bloco) for bloco in blocos] == [16 * 4, 16 * 4, 16 * 2]
+        assert blocos[0]["date"].max() < blocos[1]["date"].min()
+        assert (blocos[-1]["place_type"] == "city").all()
+        assert blocos[-1]["is_last"].sum() == 16
+
+    def test_escala_completa_por_dia(self):
+        bloco = next(iter_cities(days=1100, chunk_days=1))
+
+        assert len(bloco) == 5570
+        assert list(bloco.columns) == CASO_FULL_COLUMNS
+
+
+# ---------------------------------------------------------------------------
+# Países (disease.sh)
+# ---------------------------------------------------------------------------
+
+class TestGenerateCountries:
+
+    def test_campos_usados_pelas_visualizacoes(self):
+        campos = {"country", "cases", "deaths", "todayCases", "todayDeaths",
+                  "casesPerOneMillion", "deathsPerOneMillion", "population"}
+
+        assert all(campos <= set(registro) for registro in generate_countries(30))
+
+    def test_inclui_brasil_e_paises_conhecidos(self):
+        nomes = {registro["country"] for registro in generate_countries(200)}
+
+        assert set(PAISES) <= nomes
+        assert len(nomes) == 200
+
+    def test_ordenado_por_casos(self):
+        casos = [registro["cases"] for registro in generate_countries(50)]
+        assert casos == sorted(casos, reverse=True)
+
+    def test_deterministico(self):
+        assert generate_countries(40, seed=3) == generate_countries(40, seed=3)
@@ -0,0 +1,85 @@
+# Testes unitários para src/data/time_series_index.py
+
+import pandas as pd
+
+from src.data.data_processor import stamp_data_version
+from src.data.ingestion import ingest_caso_full
+from src.data.time_series_index import StateTimeSeries, index_time_series
+
+
+def _serie(estados=("SP", "RJ", "MG"), dias=5):
+    """Linhas embaralhadas de vários estados (fora de ordem de propósito)."""
+    rows = [
+        {"state": uf, "date": data.strftime("%Y-%m-%d"), "new_confirmed": i * 10 + d,
+         "last_available_confirmed": (i + 1) * 1000 + d}
+        for d, data in enumerate(pd.date_range("2022-03-01", periods=dias))
+        for i, uf in enumerate(estados)
+    ]
+    return ingest_caso_full(rows[::-1])
+
+
+# ---------------------------------------------------------------------------
+# StateTimeSeries
+# ---------------------------------------------------------------------------
+
+class TestStateTimeSeries:
+
+    def test_estados_em_ordem_alfabetica(self):
+        assert StateTimeSeries(_serie()).states == ["MG", "RJ", "SP"]
+
+    def test_serie_de_um_estado_ordenada(self):
+        df_sp = StateTimeSeries(_serie()).state("SP")
+
+        assert (df_sp["state"] == "SP").all()
+        assert len(df_sp) == 5
+        assert df_sp["date"].is_monotonic_increasing
+
+    def test_igual_ao_filtro_por_mascara(self):
+        df = _serie()
+        esperado = df[df["state"] == "RJ"].sort_values("date")
+
+        obtido = StateTimeSeries(df).state("RJ")
+
+        assert obtido["new_confirmed"].tolist() == esperado["new_confirmed"].tolist()
+
+    def test_periodo_por_busca_binaria(self):
+        df_rj = StateTimeSeries(_serie()).state("RJ", date_from="2022-03-02", date_to="2022-03-04")
+
+        assert df_rj["date"].dt.day.tolist() == [2, 3, 4]
+
+    def test_estado_ausente_vazio(self):
+        assert StateTimeSeries(_serie()).state("AC").empty
+
+    def test_select_varios_estados(self):
+        df = StateTimeSeries(_serie()).select(["SP", "MG", "AC"], date_from="2022-03-05")
+
+        assert sorted(df["state"].astype(str)) == ["MG", "SP"]
+
+    def test_block_max(self):
+        maximos = StateTimeSeries(_serie()).block_max("last_available_confirmed")
+
+        assert maximos["MG"] == 3004
+        assert maximos.nlargest(1).index.tolist() == ["MG"]
+
+    def test_frame_vazio(self):
+        index = StateTimeSeries(_serie().iloc[0:0])
+
+        assert index.states == []
+        assert index.select(["SP"]).empty
+
+
+# ---------------------------------------------------------------------------
+# index_time_series()
+# ---------------------------------------------------------------------------
+
+class TestIndexTimeSeries:
+
+    def test_reaproveita_indice_da_mesma_versao(self):
+        df = stamp_data_version(_serie(), "analises-1")
+        assert index_time_series(df) is index_time_series(df)
+
+    def test_nova_versao_reconstroi(self):
+        df = stamp_data_version(_serie(), "analises-1")
+        primeiro = index_time_series(df)
+
+        assert index_time_series(stamp_data_version(df.copy(), "analises-2")) is not primeiro
@@ -0,0 +1,155 @@
+# Testes unitários para src/data/time_series_store.py
+
+import pytest
+import pandas as pd
+from unittest.mock import MagicMock
+
+from src.data.api_client import COVID19APIClient, IncompletePaginationError
+from src.data.time_series_store import TimeSeriesStore
+
+
+def _linhas(states, dates):
+    """Gera linhas de caso_full para cada combinação (estado, data)."""
+    return pd.DataFrame([
+        {"state": state, "date": pd.Timestamp(date), "new_confirmed": i, "new_deaths": 0}
+        for i, (state, date) in enumerate((s, d) for s in states for d in dates)
+    ])
+
+
+def _paginas_desc(df, page_size=2):
+    """Divide um DataFrame em páginas ordenadas da data mais nova para a mais antiga."""
+    df = df.sort_values("date", ascending=False).reset_index(drop=True)
+    return [df.iloc[i:i + page_size] for i in range(0, len(df), page_size)]
+
+
+@pytest.fixture
+def store(tmp_path):
+    return TimeSeriesStore(tmp_path / "caso_full.parquet")
+
+
+# ---------------------------------------------------------------------------
+# append() / read()
+# ---------------------------------------------------------------------------
+
+class TestAppendRead:
+
+    def test_store_vazio(self, store):
+        assert not store.exists()
+        assert store.read().empty
+        assert store.latest_date() is None
+
+    def test_append_remove_duplicatas_por_chave(self, store):
+        store.append(_linhas(["SP"], ["2021-01-01", "2021-01-02"]))
+        atualizado = _linhas(["SP"], ["2021-01-02"]).assign(new_confirmed=99)
+
+        total = store.append(atualizado)
+
+        df = store.read()
+        assert total == 2
+        assert df.loc[df["date"] == "2021-01-02", "new_confirmed"].item() == 99
+
+    def test_read_filtra_estado_e_periodo(self, store):
+        store.append(_linhas(["SP", "RJ"], ["2021-01-01", "2021-01-02", "2021-01-03"]))
+
+        df = store.read(state="RJ", date_from="2021-01-02")
+
+        assert set(df["state"]) == {"RJ"}
+        assert df["date"].min() == pd.Timestamp("2021-01-02")
+        assert len(df) == 2
+
+    def test_latest_date(self, store):
+        store.append(_linhas(["SP"], ["2021-01-01", "2021-03-01"]))
+        assert store.latest_date() == pd.Timestamp("2021-03-01")
+
+
+# ---------------------------------------------------------------------------
+# sync()
+# ---------------------------------------------------------------------------
+
+class TestSync:
+
+    def test_store_vazio_baixa_tudo(self, store):
+        client = MagicMock()
+        client.iter_brasil_pages.return_value = iter(_paginas_desc(_linhas(["SP"], ["2021-01-01", "2021-01-02"])))
+
+        assert store.sync(client) == 2
+        assert len(store.read()) == 2
+
+    def test_baixa_apenas_o_delta_e_para_a_paginacao(self, store):
+        antigas = ["2021-01-01", "2021-01-02", "2021-01-03"]
+        store.append(_linhas(["SP", "RJ"], antigas))
+        paginas = _paginas_desc(_linhas(["SP", "RJ"], antigas + ["2021-01-04"]))
+        consumidas = []
+
+        def gerador(params):
+            for page in paginas:
+                consumidas.append(page)
+                yield page
+
+        client = MagicMock()
+        client.iter_brasil_pages.side_effect = gerador
+
+        novas = store.sync(client)
+
+        assert novas == 2
+        assert store.latest_date() == pd.Timestamp("2021-01-04")
+        assert len(consumidas) == 2  # Página do delta + a que já alcança dados gravados
+
+    def test_periodo_enviado_a_api(self, store):
+        store.append(_linhas(["SP"], ["2021-01-01", "2021-01-02"]))
+        client = MagicMock()
+        client.iter_brasil_pages.return_value = iter([])
+
+        store.sync(client)
+
+        params = client.iter_brasil_pages.call_args.args[0]
+        assert params == {"place_type": "state", "date__gte": "2021-01-03"}
+
+    def test_pagina_com_falha_nao_grava_delta_parcial(self, store):
+        store.append(_linhas(["SP"], ["2021-01-01"]))
+        paginas = _paginas_desc(_linhas(["SP"], ["2021-01-02", "2021-01-03", "2021-01-04"]))
+
+        def falha_no_meio(params):
+            yield paginas[0]
+            raise IncompletePaginationError("página 2")
+
+        client = MagicMock()
+        client.iter_brasil_pages.side_effect = falha_no_meio
+
+        with pytest.raises(IncompletePaginationError):
+            store.sync(client)
+
+        assert store.latest_date() == pd.Timestamp("2021-01-01")
+        assert store.needs_sync()
+
+        client.iter_brasil_pages.side_effect = lambda params: iter(paginas)
+        assert store.sync(client, force=True) == 3
+        assert len(store.read()) == 4
+
+    def test_respeita_intervalo_minimo(self, store):
+        client = MagicMock()
+        client.iter_brasil_pages.return_value = iter([])
+        store.sync(client)
+
+        store.sync(client)
+
+        assert client.iter_brasil_pages.call_count == 1
+
+
+# ---------------------------------------------------------------------------
+# Integração com COVID19APIClient
+# ---------------------------------------------------------------------------
+
+class TestClienteComStore:
+
+    def test_time_series_le_do_store(self, store, mocker):
+        store.append(_linhas(["SP", "RJ"], pd.date_range("2021-01-01", periods=10).strftime("%Y-%m-%d")))
+        mocker.patch.object(store, "needs_sync", return_value=False)
+        client = COVID19APIClient(store=store)
+        mock_req = mocker.patch.object(client, "_make_request")
+
+        df = client.get_brasil_time_series(state="SP", days=3)
+
+        assert len(df) == 3
+        assert df["date"].min() == pd.Timestamp("2021-01-08")
+        mock_req.assert_not_called()
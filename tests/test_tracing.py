@@ -0,0 +1,127 @@
+# Testes unitários para src/utils/tracing.py
+
+import contextvars
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from src.data.data_processor import calculate_totals
+from src.utils.tracing import (
+    flatten,
+    span,
+    start_trace,
+    time_by_kind,
+    trace_record,
+    traced,
+    tracing_active,
+)
+
+
+@traced(kind="pandas")
+def _transformar(x):
+    time.sleep(0.01)
+    return x * 2
+
+
+@traced("figura", kind="figure")
+def _montar():
+    return _transformar(3) + 1
+
+
+# ---------------------------------------------------------------------------
+# Rastreamento desligado
+# ---------------------------------------------------------------------------
+
+class TestSemRastreamento:
+
+    def test_funcao_decorada_so_executa(self):
+        assert not tracing_active()
+        assert _montar() == 7
+
+    def test_span_e_noop(self):
+        with span("qualquer") as aberto:
+            assert aberto is None
+
+    def test_custo_baixo(self):
+        @traced
+        def f():
+            return None
+
+        start = time.perf_counter()
+        for _ in range(100_000):
+            f()
+        assert time.perf_counter() - start < 1.0
+
+
+# ---------------------------------------------------------------------------
+# Rastreamento ligado
+# ---------------------------------------------------------------------------
+
+class TestComRastreamento:
+
+    def test_spans_aninhados(self):
+        with start_trace("rerun", page="Brasil") as root:
+            assert _montar() == 7
+
+        assert not tracing_active()
+        figura = root.children[0]
+        assert figura.name == "figura"
+        assert figura.children[0].name.endswith("_transformar")
+        assert figura.children[0].duration >= 0.01
+        assert root.duration >= figura.duration
+
+    def test_nome_padrao_modulo_funcao(self):
+        with start_trace("rerun") as root:
+            calculate_totals(None)
+        assert root.children[0].name == "data_processor.calculate_totals"
+        assert root.children[0].kind == "pandas"
+
+    def test_excecao_registrada(self):
+        @traced
+        def falha():
+            raise ValueError("x")
+
+        with start_trace("rerun") as root:
+            with pytest.raises(ValueError):
+                falha()
+        assert root.children[0].attrs["error"] == "ValueError"
+
+    def test_threads_com_contexto_copiado(self):
+        with start_trace("rerun") as root:
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                futures = [executor.submit(contextvars.copy_context().run, _transformar, i) for i in range(2)]
+                assert [future.result() for future in futures] == [0, 2]
+
+        assert len(root.children) == 2
+        assert all(child.thread != root.thread for child in root.children)
+
+    def test_tempo_por_categoria_herda_do_pai(self):
+        with start_trace("rerun") as root:
+            with span("bloco", kind="network"):
+                with span("interno"):
+                    time.sleep(0.01)
+
+        totals = time_by_kind(root)
+        assert totals["network"] >= 0.01
+        assert set(totals) == {None, "network"}
+
+    def test_flatten_em_pre_ordem(self):
+        with start_trace("rerun") as root:
+            _montar()
+
+        rows = flatten(root)
+        assert [row["depth"] for row in rows] == [0, 1, 2]
+        assert rows[0]["pct"] == pytest.approx(100)
+        assert rows[2]["self_ms"] == pytest.approx(rows[2]["ms"])
+
+    def test_registro_serializavel(self):
+        with start_trace("rerun", page="Brasil") as root:
+            with span("http.get", kind="network", url="http://x"):
+                pass
+
+        record = json.loads(json.dumps(trace_record(root)))
+        assert record["attrs"] == {"page": "Brasil"}
+        assert record["spans"][0]["attrs"] == {"url": "http://x"}
+        assert set(record["by_kind_ms"]) == {"other", "network"}